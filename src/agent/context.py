@@ -1,36 +1,101 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services import audit_service, framework_service, policy_service, risk_service
+from src.config import get_settings
+from src.models.audit import Audit
+from src.models.framework import ComplianceFrameworkModel
+from src.models.policy import Policy
+from src.models.risk import Risk
+from src.services.changes import table_versions
 
+CONTEXT_TABLES = ("compliance_frameworks", "audits", "risks", "policies")
+TOP_N = 5
 
-async def build_context(db: AsyncSession) -> str:
-    """Build context string with current state for the agent."""
+
+@dataclass(frozen=True)
+class _CachedContext:
+    bind: object
+    versions: tuple[int, ...]
+    built_at: float
+    text: str
+
+
+_cache: _CachedContext | None = None
+
+
+async def _count(db: AsyncSession, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def _render_context(db: AsyncSession) -> str:
     parts = []
 
-    frameworks = await framework_service.list_frameworks(db)
+    frameworks = (await db.execute(
+        select(ComplianceFrameworkModel.name, ComplianceFrameworkModel.version, ComplianceFrameworkModel.id)
+        .order_by(ComplianceFrameworkModel.name)
+    )).all()
     if frameworks:
         parts.append("Available Compliance Frameworks:")
-        for fw in frameworks:
-            parts.append(f"  - {fw.name} (v{fw.version}, id={fw.id})")
-
-    audits = await audit_service.list_audits(db)
-    if audits:
-        parts.append(f"\nRecent Audits ({len(audits)}):")
-        for a in audits[:5]:
-            parts.append(f"  - [{a.status}] {a.title} (id={a.id})")
-
-    risks = await risk_service.list_risks(db)
-    if risks:
-        parts.append(f"\nCurrent Risks ({len(risks)}):")
-        for r in risks[:5]:
-            parts.append(f"  - [Score: {r.score}] {r.title} (id={r.id})")
-
-    policies = await policy_service.list_policies(db)
-    if policies:
-        parts.append(f"\nPolicies ({len(policies)}):")
-        for p in policies[:5]:
-            parts.append(f"  - [{p.status}] {p.title} (id={p.id})")
+        for name, version, id in frameworks:
+            parts.append(f"  - {name} (v{version}, id={id})")
+
+    audit_count = await _count(db, Audit)
+    if audit_count:
+        audits = await db.execute(
+            select(Audit.status, Audit.title, Audit.id).order_by(Audit.created_at.desc()).limit(TOP_N)
+        )
+        parts.append(f"\nRecent Audits ({audit_count}):")
+        for status, title, id in audits:
+            parts.append(f"  - [{status}] {title} (id={id})")
+
+    risk_count = await _count(db, Risk)
+    if risk_count:
+        risks = await db.execute(
+            select(Risk.score, Risk.title, Risk.id).order_by(Risk.score.desc()).limit(TOP_N)
+        )
+        parts.append(f"\nCurrent Risks ({risk_count}):")
+        for score, title, id in risks:
+            parts.append(f"  - [Score: {score}] {title} (id={id})")
+
+    policy_count = await _count(db, Policy)
+    if policy_count:
+        policies = await db.execute(
+            select(Policy.status, Policy.title, Policy.id).order_by(Policy.updated_at.desc()).limit(TOP_N)
+        )
+        parts.append(f"\nPolicies ({policy_count}):")
+        for status, title, id in policies:
+            parts.append(f"  - [{status}] {title} (id={id})")
 
     return "\n".join(parts) if parts else "No existing data."
+
+
+async def build_context(db: AsyncSession) -> str:
+    """Build context string with current state for the agent.
+
+    Uses ``COUNT(*)`` and top-N column projections rather than loading whole
+    tables. The result is cached until the service layer writes to one of the
+    tables it reads, or until ``agent_context_ttl`` seconds have passed (which
+    bounds staleness from writes made by other processes).
+    """
+    global _cache
+    settings = get_settings()
+    versions = table_versions(*CONTEXT_TABLES)
+    now = time.monotonic()
+
+    cached = _cache
+    if (
+        cached is not None
+        and cached.bind is db.bind
+        and cached.versions == versions
+        and now - cached.built_at < settings.agent_context_ttl
+    ):
+        return cached.text
+
+    text = await _render_context(db)
+    _cache = _CachedContext(bind=db.bind, versions=versions, built_at=now, text=text)
+    return text
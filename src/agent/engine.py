@@ -1,33 +1,115 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import json
 import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import anthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.agent.context import build_context
 from src.agent.prompts import SYSTEM_PROMPT
-from src.agent.tools import TOOL_DEFINITIONS, execute_tool
+from src.agent.tools import TOOL_DEFINITIONS, execute_tool, is_read_only
 from src.config import get_settings
 from src.models.agent_task import AgentTask
 
 logger = logging.getLogger(__name__)
 
+EventCallback = Callable[[dict[str, Any]], Awaitable[None]]
 
-async def run_agent(db: AsyncSession, instruction: str) -> dict:
-    """Run the AI agent loop with tool use."""
+# Marks the end of a prompt prefix that the API may cache and reuse. The
+# request prefix is ordered tools -> system -> messages, so a breakpoint on
+# the last tool caches the tool list and one on the context block caches the
+# whole stable prefix for iterations 2..N of a task.
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def build_tools() -> list[dict]:
+    """Tool definitions with a cache breakpoint after the last tool."""
+    *tools, last = TOOL_DEFINITIONS
+    return [*tools, {**last, "cache_control": CACHE_CONTROL}]
+
+
+def build_system(context: str) -> list[dict]:
+    """System prompt blocks with a cache breakpoint after the context snapshot."""
+    return [
+        {"type": "text", "text": SYSTEM_PROMPT},
+        {"type": "text", "text": f"Current System State:\n{context}", "cache_control": CACHE_CONTROL},
+    ]
+
+
+async def _execute_read_only(db: AsyncSession, semaphore: asyncio.Semaphore, name: str, args: dict) -> str:
+    """Run a read-only tool on its own session so it can overlap with others."""
+    async with semaphore:
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            return await execute_tool(session, name, args)
+
+
+async def execute_tool_uses(db: AsyncSession, tool_uses: list) -> list[dict]:
+    """Execute the tool_use blocks of one model response.
+
+    Consecutive read-only tools run concurrently, each on its own session.
+    Mutating tools run one at a time on ``db`` in the order the model asked
+    for them, so a read that follows a write always sees it. Results are
+    returned in the original ``tool_use`` order.
+    """
     settings = get_settings()
+    semaphore = asyncio.Semaphore(max(1, settings.agent_tool_concurrency))
+    results: list[str | None] = [None] * len(tool_uses)
+    pending: list[int] = []
+
+    async def flush_reads() -> None:
+        if not pending:
+            return
+        outputs = await asyncio.gather(*(
+            _execute_read_only(db, semaphore, tool_uses[i].name, tool_uses[i].input) for i in pending
+        ))
+        for i, output in zip(pending, outputs):
+            results[i] = output
+        pending.clear()
+
+    for i, tool_use in enumerate(tool_uses):
+        logger.info(f"Executing tool: {tool_use.name}")
+        if is_read_only(tool_use.name):
+            pending.append(i)
+            continue
+        await flush_reads()
+        results[i] = await execute_tool(db, tool_use.name, tool_use.input)
+    await flush_reads()
+
+    return [
+        {"type": "tool_result", "tool_use_id": tool_use.id, "content": result}
+        for tool_use, result in zip(tool_uses, results)
+    ]
+
+
+async def run_agent(db: AsyncSession, instruction: str, on_event: EventCallback | None = None) -> dict:
+    """Run the AI agent loop with tool use.
+
+    The model is called through the async client with streaming enabled so the
+    event loop is never blocked on a round-trip. When ``on_event`` is given it
+    is awaited with ``text``, ``tool_use`` and ``tool_result`` events as they
+    happen, followed by a final ``done`` event carrying the task result.
+    """
+    settings = get_settings()
+
+    async def emit(event: dict[str, Any]) -> None:
+        if on_event is not None:
+            await on_event(event)
 
     if not settings.anthropic_api_key:
-        return {
+        result = {
             "task_id": "",
             "status": "failed",
             "result": "Error: ANTHROPIC_API_KEY not configured. Run 'scm config init' and set your API key.",
             "iterations": 0,
             "tokens_used": 0,
         }
+        await emit({"type": "done", **result})
+        return result
 
     # Create task record
     task = AgentTask(instruction=instruction, status="running")
@@ -35,30 +117,55 @@ async def run_agent(db: AsyncSession, instruction: str) -> dict:
     await db.commit()
     await db.refresh(task)
 
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
-    context = await build_context(db)
-    system = f"{SYSTEM_PROMPT}\n\nCurrent System State:\n{context}"
+    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
 
     messages = [{"role": "user", "content": instruction}]
     total_tokens = 0
+    cache_read_tokens = 0
+    cache_write_tokens = 0
     iterations = 0
     final_text = ""
 
+    async def close_task(status: str, error: str) -> None:
+        # The session may be mid-transaction after an error or cancellation.
+        await db.rollback()
+        task.status = status
+        task.error = error
+        task.iterations = iterations
+        task.tokens_used = total_tokens
+        task.cache_read_tokens = cache_read_tokens
+        task.cache_write_tokens = cache_write_tokens
+        task.completed_at = datetime.datetime.now(datetime.UTC)
+        await db.commit()
+
     try:
+        context = await build_context(db)
+        system = build_system(context)
+        tools = build_tools()
+
         while iterations < settings.agent_max_iterations:
             iterations += 1
             logger.info(f"Agent iteration {iterations}")
 
-            response = client.messages.create(
+            async with client.messages.stream(
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=settings.agent_max_tokens,
                 system=system,
-                tools=TOOL_DEFINITIONS,
+                tools=tools,
                 messages=messages,
-            )
-
-            total_tokens += response.usage.input_tokens + response.usage.output_tokens
+            ) as stream:
+                async for event in stream:
+                    if event.type == "text":
+                        await emit({"type": "text", "text": event.text})
+                    elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                        block = event.content_block
+                        await emit({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input})
+                response = await stream.get_final_message()
+
+            usage = response.usage
+            total_tokens += usage.input_tokens + usage.output_tokens
+            cache_read_tokens += getattr(usage, "cache_read_input_tokens", None) or 0
+            cache_write_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
 
             # Collect text and tool use blocks
             tool_uses = []
@@ -80,16 +187,14 @@ async def run_agent(db: AsyncSession, instruction: str) -> dict:
             # Execute tools and build response
             messages.append({"role": "assistant", "content": response.content})
 
-            tool_results = []
-            for tool_use in tool_uses:
-                logger.info(f"Executing tool: {tool_use.name}")
-                result = await execute_tool(db, tool_use.name, tool_use.input)
-                tool_results.append({
+            tool_results = await execute_tool_uses(db, tool_uses)
+            for tool_use, tool_result in zip(tool_uses, tool_results):
+                await emit({
                     "type": "tool_result",
-                    "tool_use_id": tool_use.id,
-                    "content": result,
+                    "id": tool_use.id,
+                    "name": tool_use.name,
+                    "content": tool_result["content"],
                 })
-
             messages.append({"role": "user", "content": tool_results})
 
         # Update task
@@ -97,30 +202,43 @@ async def run_agent(db: AsyncSession, instruction: str) -> dict:
         task.result = final_text
         task.iterations = iterations
         task.tokens_used = total_tokens
+        task.cache_read_tokens = cache_read_tokens
+        task.cache_write_tokens = cache_write_tokens
         task.completed_at = datetime.datetime.now(datetime.UTC)
         await db.commit()
 
-        return {
+        result = {
             "task_id": task.id,
             "status": "completed",
             "result": final_text,
             "iterations": iterations,
             "tokens_used": total_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
         }
 
+    except asyncio.CancelledError:
+        # The caller went away (e.g. a streaming client disconnected).
+        logger.info(f"Agent task {task.id} cancelled")
+        await asyncio.shield(close_task("cancelled", "Cancelled before completion"))
+        raise
+
     except Exception as e:
         logger.error(f"Agent error: {e}")
-        task.status = "failed"
-        task.error = str(e)
-        task.iterations = iterations
-        task.tokens_used = total_tokens
-        task.completed_at = datetime.datetime.now(datetime.UTC)
-        await db.commit()
+        await close_task("failed", str(e))
 
-        return {
+        result = {
             "task_id": task.id,
             "status": "failed",
             "result": f"Error: {e}",
             "iterations": iterations,
             "tokens_used": total_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
         }
+
+    finally:
+        await client.close()
+
+    await emit({"type": "done", **result})
+    return result
@@ -5,11 +5,16 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.audit import AuditCreate
+from src.frameworks.index import get_index
+from src.schemas.audit import AuditCreate, AuditFindingCreate
 from src.schemas.policy import PolicyCreate
 from src.schemas.risk import RiskCreate
-from src.services import audit_service, framework_service, policy_service, risk_service
+from src.services import audit_service, policy_service, risk_service, search_service
+from src.services.pagination import Page
 
+# Rows per page returned by the query_* tools unless the model asks for fewer or more.
+QUERY_LIMIT = 50
+MAX_QUERY_LIMIT = 200
 
 TOOL_DEFINITIONS = [
     {
@@ -40,6 +45,41 @@ TOOL_DEFINITIONS = [
             "required": ["framework_name"]
         }
     },
+    {
+        "name": "search_controls",
+        "description": "Search framework controls by keywords in their ID, title, description and category",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords; every keyword must match"},
+                "framework": {"type": "string", "description": "Optional framework name or ID to search within"},
+                "category": {"type": "string", "description": "Optional control category"},
+                "limit": {"type": "integer", "description": "Maximum results (default 20)"}
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "search_compliance_data",
+        "description": (
+            "Full-text search over policy text, audit findings and risks. Returns the best-ranked "
+            "matches of each kind, grouped by kind, with a short snippet instead of whole records"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords; every keyword must match, term* matches a prefix"},
+                "kinds": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["policy", "finding", "risk"]},
+                    "description": "Optional kinds of record to search (default all)"
+                },
+                "all_versions": {"type": "boolean", "description": "Search every policy version, not just the current one"},
+                "limit": {"type": "integer", "description": "Maximum results per kind (default 10)"}
+            },
+            "required": ["query"]
+        }
+    },
     {
         "name": "create_audit",
         "description": "Create a new compliance audit",
@@ -69,6 +109,31 @@ TOOL_DEFINITIONS = [
             "required": ["audit_id", "title", "severity"]
         }
     },
+    {
+        "name": "create_audit_findings",
+        "description": "Record several findings for one audit in a single call. Prefer this over repeated create_audit_finding calls.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "audit_id": {"type": "string"},
+                "findings": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "control_id": {"type": "string", "description": "Framework control ID"},
+                            "title": {"type": "string"},
+                            "description": {"type": "string"},
+                            "severity": {"type": "string", "enum": ["critical", "high", "medium", "low", "info"]},
+                            "recommendation": {"type": "string"}
+                        },
+                        "required": ["title", "severity"]
+                    }
+                }
+            },
+            "required": ["audit_id", "findings"]
+        }
+    },
     {
         "name": "complete_audit",
         "description": "Mark an audit as completed with a summary",
@@ -83,10 +148,13 @@ TOOL_DEFINITIONS = [
     },
     {
         "name": "query_audits",
-        "description": "List existing audits",
+        "description": "List existing audits, newest first, one page at a time",
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "limit": {"type": "integer", "description": "Maximum results (default 50)"},
+                "cursor": {"type": "string", "description": "next_cursor from the previous page, to continue the list"}
+            },
             "required": []
         }
     },
@@ -108,10 +176,13 @@ TOOL_DEFINITIONS = [
     },
     {
         "name": "query_risks",
-        "description": "List existing risks",
+        "description": "List existing risks, highest score first, one page at a time",
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "limit": {"type": "integer", "description": "Maximum results (default 50)"},
+                "cursor": {"type": "string", "description": "next_cursor from the previous page, to continue the list"}
+            },
             "required": []
         }
     },
@@ -131,10 +202,13 @@ TOOL_DEFINITIONS = [
     },
     {
         "name": "query_policies",
-        "description": "List existing policies",
+        "description": "List existing policies, most recently updated first, one page at a time",
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "limit": {"type": "integer", "description": "Maximum results (default 50)"},
+                "cursor": {"type": "string", "description": "next_cursor from the previous page, to continue the list"}
+            },
             "required": []
         }
     },
@@ -154,26 +228,71 @@ TOOL_DEFINITIONS = [
     },
 ]
 
+# Tools that only read state. These are safe to run concurrently on separate
+# sessions; every other tool mutates data and runs in request order.
+READ_ONLY_TOOLS = frozenset({
+    "query_frameworks",
+    "query_framework_controls",
+    "search_controls",
+    "search_compliance_data",
+    "query_audits",
+    "query_risks",
+    "query_policies",
+})
+
+
+def is_read_only(name: str) -> bool:
+    return name in READ_ONLY_TOOLS
+
+
+def _query_limit(args: dict[str, Any], default: int = QUERY_LIMIT) -> int:
+    return max(1, min(int(args.get("limit") or default), MAX_QUERY_LIMIT))
+
+
+def _page_json(page: Page, items: list[dict]) -> str:
+    # The total and cursor tell the model whether the list is partial and how to go on.
+    return json.dumps({"items": items, "total": page.total, "next_cursor": page.next_cursor})
+
 
 async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str:
     """Execute a tool and return a JSON result string."""
     try:
         if name == "query_frameworks":
+            index = await get_index(db)
             if args.get("name"):
-                fw = await framework_service.get_framework_by_name(db, args["name"])
+                fw = index.framework(args["name"])
                 if fw:
-                    controls = [{"id": c.control_id, "title": c.title, "category": c.category} for c in fw.controls]
-                    return json.dumps({"name": fw.name, "version": fw.version, "id": fw.id, "controls": controls})
+                    return fw.summary_json
                 return json.dumps({"error": f"Framework '{args['name']}' not found"})
-            frameworks = await framework_service.list_frameworks(db)
-            return json.dumps([{"name": f.name, "version": f.version, "id": f.id} for f in frameworks])
+            return index.list_json
 
         elif name == "query_framework_controls":
-            fw = await framework_service.get_framework_by_name(db, args["framework_name"])
+            fw = (await get_index(db)).framework(args["framework_name"])
             if not fw:
                 return json.dumps({"error": f"Framework '{args['framework_name']}' not found"})
-            controls = [{"id": c.control_id, "title": c.title, "description": c.description, "category": c.category} for c in fw.controls]
-            return json.dumps({"framework": fw.name, "controls": controls})
+            return fw.controls_json
+
+        elif name == "search_controls":
+            matches = (await get_index(db)).search(
+                args["query"],
+                framework=args.get("framework"),
+                category=args.get("category"),
+                limit=_query_limit(args, default=20),
+            )
+            return json.dumps([c.to_dict() for c in matches])
+
+        elif name == "search_compliance_data":
+            results = await search_service.search(
+                db,
+                args["query"],
+                kinds=args.get("kinds"),
+                limit=_query_limit(args, default=10),
+                all_versions=args.get("all_versions", False),
+            )
+            return json.dumps([
+                {"kind": r["kind"], "id": r["id"], "parent_id": r["parent_id"], "title": r["title"], "snippet": r["snippet"]}
+                for r in results
+            ])
 
         elif name == "create_audit":
             audit = await audit_service.create_audit(db, AuditCreate(
@@ -195,6 +314,11 @@ async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str
             )
             return json.dumps({"id": finding.id, "title": finding.title, "severity": finding.severity})
 
+        elif name == "create_audit_findings":
+            findings = [AuditFindingCreate.model_validate(f) for f in args["findings"]]
+            inserted = await audit_service.add_findings_bulk(db, args["audit_id"], findings)
+            return json.dumps({"audit_id": args["audit_id"], "inserted": inserted})
+
         elif name == "complete_audit":
             audit = await audit_service.complete_audit(db, args["audit_id"], args["summary"])
             if not audit:
@@ -202,8 +326,11 @@ async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str
             return json.dumps({"id": audit.id, "status": audit.status})
 
         elif name == "query_audits":
-            audits = await audit_service.list_audits(db)
-            return json.dumps([{"id": a.id, "title": a.title, "status": a.status} for a in audits])
+            page = await audit_service.list_audits_page(
+                db, limit=_query_limit(args), cursor=args.get("cursor"), columns=["id", "title", "status"],
+                with_total=True,
+            )
+            return _page_json(page, [{"id": a.id, "title": a.title, "status": a.status} for a in page.items])
 
         elif name == "assess_risk":
             risk = await risk_service.create_risk(db, RiskCreate(
@@ -217,8 +344,13 @@ async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str
             return json.dumps({"id": risk.id, "title": risk.title, "score": risk.score})
 
         elif name == "query_risks":
-            risks = await risk_service.list_risks(db)
-            return json.dumps([{"id": r.id, "title": r.title, "score": r.score, "status": r.status} for r in risks])
+            page = await risk_service.list_risks_page(
+                db, limit=_query_limit(args), cursor=args.get("cursor"), columns=["id", "title", "score", "status"],
+                with_total=True,
+            )
+            return _page_json(page, [
+                {"id": r.id, "title": r.title, "score": r.score, "status": r.status} for r in page.items
+            ])
 
         elif name == "create_policy_draft":
             policy = await policy_service.create_policy(
@@ -233,13 +365,14 @@ async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str
             return json.dumps({"id": policy.id, "title": policy.title, "status": policy.status})
 
         elif name == "query_policies":
-            policies = await policy_service.list_policies(db)
-            return json.dumps([{"id": p.id, "title": p.title, "status": p.status} for p in policies])
+            page = await policy_service.list_policies_page(
+                db, limit=_query_limit(args), cursor=args.get("cursor"), columns=["id", "title", "status"],
+                with_total=True,
+            )
+            return _page_json(page, [{"id": p.id, "title": p.title, "status": p.status} for p in page.items])
 
         elif name == "generate_document":
-            from src.office365.word import generate_audit_report, generate_policy_document
-            from src.office365.excel import generate_risk_register, generate_audit_excel
-            from src.office365.powerpoint import generate_executive_summary
+            from src.services.render_service import render_document
             from src.services.report_service import create_report
             from src.schemas.report import ReportCreate
 
@@ -248,27 +381,7 @@ async def execute_tool(db: AsyncSession, name: str, args: dict[str, Any]) -> str
             source_id = args.get("source_id", "")
             title = args.get("title", f"{doc_type} document")
 
-            path = None
-            if doc_type == "audit_report" and fmt == "docx" and source_id:
-                audit = await audit_service.get_audit(db, source_id)
-                if audit:
-                    path = generate_audit_report(audit)
-            elif doc_type == "audit_report" and fmt == "xlsx" and source_id:
-                audit = await audit_service.get_audit(db, source_id)
-                if audit:
-                    path = generate_audit_excel(audit)
-            elif doc_type == "risk_register" and fmt == "xlsx":
-                risks = await risk_service.list_risks(db)
-                path = generate_risk_register(risks)
-            elif doc_type == "policy_document" and fmt == "docx" and source_id:
-                policy = await policy_service.get_policy(db, source_id)
-                if policy:
-                    path = generate_policy_document(policy)
-            elif doc_type == "executive_summary" and fmt == "pptx":
-                audits = await audit_service.list_audits(db)
-                risks = await risk_service.list_risks(db)
-                path = generate_executive_summary(audits, risks)
-
+            path = await render_document(db, doc_type, fmt, source_id)
             if path:
                 report = await create_report(db, ReportCreate(
                     title=title, report_type=doc_type, format=fmt, source_id=source_id
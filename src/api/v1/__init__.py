@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.v1 import audits, frameworks, risks, policies, reports, agent
+from src.api.v1 import audits, frameworks, risks, policies, reports, agent, search
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(frameworks.router)
@@ -9,3 +9,4 @@ router.include_router(risks.router)
 router.include_router(policies.router)
 router.include_router(reports.router)
 router.include_router(agent.router)
+router.include_router(search.router)
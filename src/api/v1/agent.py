@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import async_session, get_db
 from src.schemas.agent import AgentExecuteRequest, AgentExecuteResponse
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/agent", tags=["agent"])
 
 
@@ -14,3 +21,45 @@ async def execute_agent(data: AgentExecuteRequest, db: AsyncSession = Depends(ge
     from src.agent.engine import run_agent
     result = await run_agent(db, data.instruction)
     return result
+
+
+@router.post("/stream")
+async def stream_agent(data: AgentExecuteRequest):
+    """Run an agent task and stream its events as Server-Sent Events.
+
+    Emits ``text`` deltas, ``tool_use`` and ``tool_result`` events while the
+    task runs and a final ``done`` event with the same payload as ``/execute``,
+    or an ``error`` event if the task could not be run.
+    """
+    from src.agent.engine import run_agent
+
+    queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+    async def run() -> None:
+        # The request-scoped session is closed once the response starts, so
+        # the task gets a session of its own for its whole lifetime.
+        try:
+            async with async_session() as db:
+                await run_agent(db, data.instruction, on_event=queue.put)
+        except Exception as e:
+            # Failures before run_agent's own error handling (opening the
+            # session, creating the task, building context) end the stream too.
+            logger.error(f"Agent stream error: {e}")
+            await queue.put({"type": "error", "error": str(e)})
+        finally:
+            await queue.put(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (event := await queue.get()) is not None:
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,18 +1,39 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.v1.listing import page_response, parse_fields
 from src.database import get_db
-from src.schemas.audit import AuditCreate, AuditFindingResponse, AuditResponse
+from src.schemas.audit import AuditCreate, AuditFindingCreate, AuditFindingResponse, AuditResponse, AuditSummary
 from src.services import audit_service
+from src.services.pagination import DEFAULT_PAGE_SIZE
 
 router = APIRouter(prefix="/audits", tags=["audits"])
 
 
-@router.get("", response_model=list[AuditResponse])
-async def list_audits(db: AsyncSession = Depends(get_db)):
-    return await audit_service.list_audits(db)
+@router.get("")
+async def list_audits(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated audit fields to return"),
+    include_findings: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """List audits newest first. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page."""
+    columns = parse_fields(fields, AuditSummary)
+    try:
+        page = await audit_service.list_audits_page(
+            db, limit=limit, cursor=cursor, columns=columns, include_findings=include_findings
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    schema = AuditResponse if include_findings else AuditSummary
+    return page_response(response, page, schema, columns, "findings" if include_findings else None)
 
 
 @router.post("", response_model=AuditResponse, status_code=201)
@@ -34,3 +55,62 @@ async def get_audit_findings(audit_id: str, db: AsyncSession = Depends(get_db)):
     if not audit:
         raise HTTPException(404, "Audit not found")
     return audit.findings
+
+
+def _parse_finding(raw, position: str) -> AuditFindingCreate:
+    try:
+        return AuditFindingCreate.model_validate(raw)
+    except ValidationError as e:
+        raise HTTPException(422, f"{position}: {e.errors(include_url=False)}")
+
+
+async def _ndjson_findings(request: Request):
+    """Parse an NDJSON request body as it streams in, one finding per line."""
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield _parse_ndjson_line(line, line_no)
+    if buffer.strip():
+        yield _parse_ndjson_line(buffer, line_no + 1)
+
+
+def _parse_ndjson_line(line: bytes, line_no: int) -> AuditFindingCreate:
+    try:
+        raw = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise HTTPException(422, f"Line {line_no}: invalid JSON: {e}")
+    return _parse_finding(raw, f"Line {line_no}")
+
+
+@router.post("/{audit_id}/findings:bulk", status_code=201)
+async def add_findings_bulk(audit_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """Import many findings at once.
+
+    Accepts a JSON array, or NDJSON (``application/x-ndjson``) which is
+    parsed and inserted while the body is still streaming.
+    """
+    # Checked before reading the body, so errors while ingesting are payload errors.
+    if not await audit_service.get_audit(db, audit_id, with_findings=False):
+        raise HTTPException(404, "Audit not found")
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        findings = _ndjson_findings(request)
+    else:
+        try:
+            body = await request.json()
+        except json.JSONDecodeError as e:
+            raise HTTPException(422, f"Invalid JSON: {e}")
+        if not isinstance(body, list):
+            raise HTTPException(422, "Expected a JSON array of findings")
+        findings = [_parse_finding(raw, f"Item {i}") for i, raw in enumerate(body)]
+
+    try:
+        inserted = await audit_service.add_findings_bulk(db, audit_id, findings)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    return {"audit_id": audit_id, "inserted": inserted}
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
-from src.schemas.framework import FrameworkResponse
-from src.services import framework_service
+from src.frameworks.index import get_index
+from src.schemas.framework import ControlSearchResult, FrameworkPosture, FrameworkResponse
+from src.services import framework_service, posture_service
 
 router = APIRouter(prefix="/frameworks", tags=["frameworks"])
 
@@ -15,9 +16,37 @@ async def list_frameworks(db: AsyncSession = Depends(get_db)):
     return await framework_service.list_frameworks(db)
 
 
+@router.get("/controls/search", response_model=list[ControlSearchResult])
+async def search_controls(
+    q: str = Query(..., min_length=1, description="Keywords; every keyword must match"),
+    framework: str | None = Query(None, description="Framework name or ID"),
+    category: str | None = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    index = await get_index(db)
+    if framework and not index.framework(framework):
+        raise HTTPException(404, "Framework not found")
+    return index.search(q, framework=framework, category=category, limit=limit)
+
+
 @router.get("/{framework_id}", response_model=FrameworkResponse)
 async def get_framework(framework_id: str, db: AsyncSession = Depends(get_db)):
     fw = await framework_service.get_framework(db, framework_id)
     if not fw:
         raise HTTPException(404, "Framework not found")
     return fw
+
+
+@router.get("/{framework_id}/posture", response_model=FrameworkPosture)
+async def get_posture(
+    framework_id: str,
+    include_controls: bool = Query(True, description="Include the per-control rows"),
+    db: AsyncSession = Depends(get_db),
+):
+    posture = await posture_service.get_posture(db, framework_id)
+    if posture is None:
+        raise HTTPException(404, "Framework not found")
+    if not include_controls:
+        posture["controls"] = []
+    return posture
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.services.pagination import Page
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> list[str] | None:
+    """Parse a ``fields=a,b,c`` projection, validated against ``schema``."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return names or None
+
+
+def page_response(
+    response: Response,
+    page: Page,
+    schema: type[BaseModel],
+    fields: list[str] | None = None,
+    children: str | None = None,
+) -> list[dict[str, Any]]:
+    """Serialize a page of ORM rows, setting the next-page cursor header.
+
+    With ``fields`` only those attributes are read, so rows loaded with
+    ``load_only`` serialize without touching unloaded columns. ``children``
+    names a loaded child collection of ``schema`` to include alongside them.
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if fields is None:
+        return [schema.model_validate(item).model_dump(mode="json") for item in page.items]
+
+    child_adapter = TypeAdapter(schema.model_fields[children].annotation) if children else None
+    rows = []
+    for item in page.items:
+        row = {name: getattr(item, name) for name in fields}
+        if child_adapter is not None:
+            loaded = child_adapter.validate_python(getattr(item, children), from_attributes=True)
+            row[children] = child_adapter.dump_python(loaded, mode="json")
+        rows.append(row)
+    return rows
@@ -1,18 +1,39 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.v1.listing import page_response, parse_fields
 from src.database import get_db
-from src.schemas.policy import PolicyCreate, PolicyDistributeRequest, PolicyResponse
-from src.services import policy_service
+from src.models.policy import Policy
+from src.schemas.policy import (
+    DistributionProgress, PolicyCreate, PolicyDistributeRequest, PolicyResponse, PolicySummary, PolicyVersionResponse,
+)
+from src.services import distribution_service, distribution_worker, policy_service
+from src.services.pagination import DEFAULT_PAGE_SIZE
 
 router = APIRouter(prefix="/policies", tags=["policies"])
 
 
-@router.get("", response_model=list[PolicyResponse])
-async def list_policies(db: AsyncSession = Depends(get_db)):
-    return await policy_service.list_policies(db)
+@router.get("")
+async def list_policies(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated policy fields to return"),
+    include_versions: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """List policies most recently updated first. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page."""
+    columns = parse_fields(fields, PolicySummary)
+    try:
+        page = await policy_service.list_policies_page(
+            db, limit=limit, cursor=cursor, columns=columns, include_versions=include_versions
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    schema = PolicyResponse if include_versions else PolicySummary
+    return page_response(response, page, schema, columns, "versions" if include_versions else None)
 
 
 @router.post("", response_model=PolicyResponse, status_code=201)
@@ -28,6 +49,14 @@ async def get_policy(policy_id: str, db: AsyncSession = Depends(get_db)):
     return policy
 
 
+@router.get("/{policy_id}/versions/{version_number}", response_model=PolicyVersionResponse)
+async def get_policy_version(policy_id: str, version_number: int, db: AsyncSession = Depends(get_db)):
+    version = await policy_service.get_version(db, policy_id, version_number)
+    if not version:
+        raise HTTPException(404, "Policy version not found")
+    return version
+
+
 @router.post("/{policy_id}/approve", response_model=PolicyResponse)
 async def approve_policy(policy_id: str, db: AsyncSession = Depends(get_db)):
     policy = await policy_service.approve_policy(db, policy_id)
@@ -42,7 +71,16 @@ async def distribute_policy(
     data: PolicyDistributeRequest,
     db: AsyncSession = Depends(get_db),
 ):
+    """Queue the policy for distribution; background workers deliver it."""
     distributions = await policy_service.distribute_policy(
         db, policy_id, data.channel, data.recipients
     )
+    distribution_worker.wake()
     return {"distributed": len(distributions), "channel": data.channel}
+
+
+@router.get("/{policy_id}/distribution", response_model=DistributionProgress)
+async def distribution_progress(policy_id: str, db: AsyncSession = Depends(get_db)):
+    if not await db.get(Policy, policy_id):
+        raise HTTPException(404, "Policy not found")
+    return await distribution_service.get_progress(db, policy_id)
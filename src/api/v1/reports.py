@@ -7,8 +7,8 @@ from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
-from src.schemas.report import ReportResponse
-from src.services import report_service
+from src.schemas.report import ReportCreate, ReportResponse
+from src.services import render_service, report_service
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
@@ -18,6 +18,19 @@ async def list_reports(db: AsyncSession = Depends(get_db)):
     return await report_service.list_reports(db)
 
 
+@router.post("", response_model=ReportResponse, status_code=202)
+async def create_report(data: ReportCreate, db: AsyncSession = Depends(get_db)):
+    """Queue a report for rendering.
+
+    Returns at once with ``status="pending"``; poll ``GET /reports/{id}``
+    until it is ``generated`` (or ``failed``), then download it.
+    """
+    try:
+        return await render_service.start_report_job(db, data)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+
 @router.get("/{report_id}", response_model=ReportResponse)
 async def get_report(report_id: str, db: AsyncSession = Depends(get_db)):
     report = await report_service.get_report(db, report_id)
@@ -31,6 +44,8 @@ async def download_report(report_id: str, db: AsyncSession = Depends(get_db)):
     report = await report_service.get_report(db, report_id)
     if not report:
         raise HTTPException(404, "Report not found")
+    if report.status != "generated":
+        raise HTTPException(409, f"Report is {report.status}")
     path = Path(report.file_path)
     if not path.exists():
         raise HTTPException(404, "Report file not found on disk")
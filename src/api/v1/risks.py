@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.v1.listing import page_response, parse_fields
 from src.database import get_db
-from src.schemas.risk import RiskCreate, RiskResponse, RiskUpdateScore
+from src.schemas.risk import RiskCreate, RiskMatrixSummary, RiskResponse, RiskSummary, RiskUpdateScore
 from src.services import risk_service
+from src.services.pagination import DEFAULT_PAGE_SIZE
 
 router = APIRouter(prefix="/risks", tags=["risks"])
 
 
-@router.get("", response_model=list[RiskResponse])
-async def list_risks(db: AsyncSession = Depends(get_db)):
-    return await risk_service.list_risks(db)
+@router.get("")
+async def list_risks(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated risk fields to return"),
+    include_mitigations: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """List risks by score. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page."""
+    columns = parse_fields(fields, RiskSummary)
+    try:
+        page = await risk_service.list_risks_page(
+            db, limit=limit, cursor=cursor, columns=columns, include_mitigations=include_mitigations
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    schema = RiskResponse if include_mitigations else RiskSummary
+    return page_response(response, page, schema, columns, "mitigations" if include_mitigations else None)
 
 
 @router.post("", response_model=RiskResponse, status_code=201)
@@ -21,7 +41,24 @@ async def create_risk(data: RiskCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/matrix")
-async def get_risk_matrix(db: AsyncSession = Depends(get_db)):
+async def get_risk_matrix(
+    mode: Literal["full", "summary"] = Query(
+        "full", description="full: every risk in every cell; summary: counts and score sums per cell"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """5x5 matrix indexed ``[impact - 1][likelihood - 1]``.
+
+    By default each cell is a list of ``{id, title, score}``. With
+    ``mode=summary`` each cell is ``{likelihood, impact, count, score_sum}``
+    and the response adds ``total``; list a cell's risks through
+    ``/risks/matrix/{likelihood}/{impact}``.
+    """
+    if mode == "summary":
+        matrix = await risk_service.get_risk_matrix_summary(db)
+        total = sum(cell["count"] for row in matrix for cell in row)
+        return RiskMatrixSummary(matrix=matrix, total=total)
+
     matrix = await risk_service.get_risk_matrix(db)
     result = []
     for impact_row in matrix:
@@ -32,6 +69,23 @@ async def get_risk_matrix(db: AsyncSession = Depends(get_db)):
     return {"matrix": result}
 
 
+@router.get("/matrix/{likelihood}/{impact}")
+async def list_matrix_cell(
+    response: Response,
+    likelihood: int = Path(ge=1, le=5),
+    impact: int = Path(ge=1, le=5),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Risks in one matrix cell. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page."""
+    try:
+        page = await risk_service.list_risks_in_cell(db, likelihood, impact, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return page_response(response, page, RiskSummary)
+
+
 @router.get("/{risk_id}", response_model=RiskResponse)
 async def get_risk(risk_id: str, db: AsyncSession = Depends(get_db)):
     risk = await risk_service.get_risk(db, risk_id)
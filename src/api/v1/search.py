@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db
+from src.schemas.search import SearchResult
+from src.services import search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, description="Keywords; every keyword must match, `term*` matches a prefix"),
+    kind: list[Literal["policy", "finding", "risk"]] | None = Query(None, description="Restrict to these kinds"),
+    all_versions: bool = Query(False, description="Search every policy version, not just the current one"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum results per kind"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Search results grouped by kind, each group ranked best first."""
+    return await search_service.search(db, q, kinds=kind, limit=limit, all_versions=all_versions)
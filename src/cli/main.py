@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import re
 from pathlib import Path
 
 import typer
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 from src.config import get_settings
 
@@ -29,7 +31,27 @@ app.add_typer(config_app, name="config")
 
 
 def _run(coro):
-    return asyncio.run(coro)
+    async def _main():
+        from src.office365.graph_client import close_client
+        try:
+            return await coro
+        finally:
+            await close_client()
+
+    return asyncio.run(_main())
+
+
+# Control characters around matched terms: unlike brackets, they cannot occur
+# in indexed text, and the snippet is never parsed as Rich markup.
+SEARCH_MARKERS = ("\x02", "\x03")
+
+
+def _highlight_matches(snippet: str) -> Text:
+    open_, close = SEARCH_MARKERS
+    text = Text()
+    for i, part in enumerate(re.split(f"[{open_}{close}]", snippet)):
+        text.append(part, style="bold yellow" if i % 2 else None)
+    return text
 
 
 async def _get_db():
@@ -137,6 +159,77 @@ def framework_show(name: str = typer.Argument(..., help="Framework name")):
     console.print(table)
 
 
+@framework_app.command("posture")
+def framework_posture(
+    name: str = typer.Argument(None, help="Framework name (omit with --rebuild to rebuild all)"),
+    controls: bool = typer.Option(False, "--controls", "-c", help="List every control"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Recompute posture from all findings first"),
+):
+    """Show open findings by category and control for a framework."""
+    async def _run_it():
+        from src.database import init_db, async_session
+        from src.services.framework_service import import_all_frameworks, get_framework_by_name
+        from src.services import posture_service
+        settings = get_settings()
+        await init_db()
+        async with async_session() as db:
+            await import_all_frameworks(db, settings.frameworks_dir)
+            fw = await get_framework_by_name(db, name) if name else None
+            if name and not fw:
+                return None, None
+            written = await posture_service.rebuild(db, fw.id if fw else None) if rebuild else None
+            return (await posture_service.get_posture(db, fw.id) if fw else None), written
+
+    if not name and not rebuild:
+        console.print("[red]Give a framework name, or --rebuild to rebuild every framework[/red]")
+        raise typer.Exit(1)
+    posture, written = _run(_run_it())
+    if written is not None:
+        console.print(f"[green]✓ Rebuilt posture for {written} controls[/green]")
+    if not name:
+        return
+    if posture is None:
+        console.print(f"[red]Framework '{name}' not found[/red]")
+        raise typer.Exit(1)
+
+    last = posture["last_audit_at"].strftime("%Y-%m-%d") if posture["last_audit_at"] else "never"
+    console.print(f"\n[bold cyan]{posture['framework']}[/bold cyan] — "
+                  f"{posture['controls_with_findings']}/{posture['total_controls']} controls with open findings, "
+                  f"last audit {last}\n")
+    if posture["stale"]:
+        console.print("[yellow]Posture does not cover every control; run with --rebuild to refresh it[/yellow]\n")
+
+    def _add_counts(table: Table) -> None:
+        table.add_column("Critical", justify="right", style="red")
+        table.add_column("High", justify="right", style="red")
+        table.add_column("Medium", justify="right", style="yellow")
+        table.add_column("Low", justify="right", style="green")
+        table.add_column("Info", justify="right", style="dim")
+
+    severities = ("critical", "high", "medium", "low", "info")
+
+    table = Table(title="Posture by Category")
+    table.add_column("Category", style="cyan")
+    table.add_column("Controls", justify="right")
+    table.add_column("With Findings", justify="right")
+    _add_counts(table)
+    for cat in posture["categories"]:
+        table.add_row(cat["category"] or "—", str(cat["total_controls"]), str(cat["controls_with_findings"]),
+                      *(str(cat[s]) for s in severities))
+    console.print(table)
+
+    if controls:
+        table = Table(title="Posture by Control")
+        table.add_column("Control ID", style="cyan")
+        table.add_column("Category", style="dim")
+        _add_counts(table)
+        table.add_column("Last Audit")
+        for ctrl in posture["controls"]:
+            audited = ctrl.last_audit_at.strftime("%Y-%m-%d") if ctrl.last_audit_at else "—"
+            table.add_row(ctrl.control_id, ctrl.category, *(str(getattr(ctrl, s)) for s in severities), audited)
+        console.print(table)
+
+
 @framework_app.command("import")
 def framework_import(path: str = typer.Argument(..., help="Path to YAML file")):
     """Import a framework from a YAML file."""
@@ -185,7 +278,10 @@ def audit_run(
         raise typer.Exit(1)
 
     console.print(f"\n[green]✓ Audit completed[/green]")
-    console.print(f"Iterations: {result['iterations']}, Tokens: {result['tokens_used']}")
+    console.print(
+        f"Iterations: {result['iterations']}, Tokens: {result['tokens_used']} "
+        f"(cache read: {result.get('cache_read_tokens', 0)}, cache write: {result.get('cache_write_tokens', 0)})"
+    )
     console.print(f"\n{result['result']}")
 
 
@@ -256,18 +352,18 @@ def audit_export(
     """Export audit to a document."""
     async def _run_it():
         from src.database import init_db, async_session
-        from src.services.audit_service import get_audit
+        from src.services.audit_service import get_audit, stream_findings
         from src.office365.word import generate_audit_report
-        from src.office365.excel import generate_audit_excel
+        from src.office365.excel import stream_audit_excel
         from src.services.report_service import create_report
         from src.schemas.report import ReportCreate
         await init_db()
         async with async_session() as db:
-            audit = await get_audit(db, audit_id)
+            audit = await get_audit(db, audit_id, with_findings=format != "xlsx")
             if not audit:
                 return None
             if format == "xlsx":
-                path = generate_audit_excel(audit)
+                path = await stream_audit_excel(audit.id, stream_findings(db, audit.id))
             else:
                 path = generate_audit_report(audit)
             report = await create_report(db, ReportCreate(
@@ -285,6 +381,40 @@ def audit_export(
     console.print(f"[green]✓ Exported to {report.file_path}[/green]")
 
 
+@audit_app.command("link-controls")
+def audit_link_controls(
+    framework: str = typer.Option(None, "--framework", help="Only findings of audits against this framework"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Findings per committed batch"),
+):
+    """Link findings to framework controls and report unmatched control IDs."""
+    async def _run_it():
+        from src.database import init_db, async_session
+        from src.services.audit_service import link_findings
+        from src.services.framework_service import import_all_frameworks, get_framework_by_name
+        settings = get_settings()
+        await init_db()
+        async with async_session() as db:
+            await import_all_frameworks(db, settings.frameworks_dir)
+            fw = await get_framework_by_name(db, framework) if framework else None
+            if framework and not fw:
+                return None
+            return await link_findings(db, fw.id if fw else None, batch_size=batch_size)
+
+    result = _run(_run_it())
+    if result is None:
+        console.print(f"[red]Framework '{framework}' not found[/red]")
+        raise typer.Exit(1)
+    console.print(f"[green]✓ Linked {result['linked']} findings[/green]")
+    if result["unmatched"]:
+        table = Table(title="Unmatched Control IDs")
+        table.add_column("Framework", style="cyan")
+        table.add_column("Control ID")
+        table.add_column("Findings", justify="right")
+        for row in result["unmatched"]:
+            table.add_row(row["framework"], row["control_id"], str(row["findings"]))
+        console.print(table)
+
+
 # ── Risk ────────────────────────────────────────────────────────────
 
 @risk_app.command("assess")
@@ -376,10 +506,10 @@ def risk_matrix():
     """Display risk matrix."""
     async def _run_it():
         from src.database import init_db, async_session
-        from src.services.risk_service import get_risk_matrix
+        from src.services.risk_service import get_risk_matrix_summary
         await init_db()
         async with async_session() as db:
-            return await get_risk_matrix(db)
+            return await get_risk_matrix_summary(db)
 
     matrix = _run(_run_it())
 
@@ -391,11 +521,11 @@ def risk_matrix():
     for impact in range(4, -1, -1):
         row = [str(impact + 1)]
         for likelihood in range(5):
-            risks = matrix[impact][likelihood]
+            count = matrix[impact][likelihood]["count"]
             score = (impact + 1) * (likelihood + 1)
-            if risks:
+            if count:
                 color = "green" if score <= 5 else "yellow" if score <= 15 else "red"
-                cell = f"[{color}]{len(risks)} risk(s)[/{color}]"
+                cell = f"[{color}]{count} risk(s)[/{color}]"
             else:
                 cell = "·"
             row.append(cell)
@@ -492,29 +622,54 @@ def policy_list():
 
 
 @policy_app.command("show")
-def policy_show(policy_id: str = typer.Argument(..., help="Policy ID")):
+def policy_show(
+    policy_id: str = typer.Argument(..., help="Policy ID"),
+    version: int = typer.Option(None, "--version", "-v", help="Show this version instead of the current one"),
+):
     """Show policy details."""
     async def _run_it():
         from src.database import init_db, async_session
-        from src.services.policy_service import get_policy
+        from src.services.policy_service import get_policy, get_version
         await init_db()
         async with async_session() as db:
-            return await get_policy(db, policy_id)
+            policy = await get_policy(db, policy_id)
+            if not policy:
+                return None, None
+            shown = await get_version(db, policy_id, version) if version else policy.latest_version
+            return policy, shown
 
-    policy = _run(_run_it())
+    policy, shown = _run(_run_it())
     if not policy:
         console.print(f"[red]Policy '{policy_id}' not found[/red]")
         raise typer.Exit(1)
+    if version and not shown:
+        console.print(f"[red]Policy '{policy_id}' has no version {version}[/red]")
+        raise typer.Exit(1)
 
     console.print(f"\n[bold cyan]{policy.title}[/bold cyan]")
     console.print(f"Status: {policy.status} | Version: v{policy.current_version}")
-    if policy.versions:
-        latest = max(policy.versions, key=lambda v: v.version_number)
-        console.print(f"\n{latest.content[:500]}")
-        if len(latest.content) > 500:
+    if shown:
+        if shown.version_number != policy.current_version:
+            console.print(f"[dim]Showing v{shown.version_number}: {shown.change_summary}[/dim]")
+        console.print(f"\n{shown.content[:500]}")
+        if len(shown.content) > 500:
             console.print("[dim]... (truncated)[/dim]")
 
 
+@policy_app.command("compact")
+def policy_compact(policy_id: str = typer.Argument(None, help="Only this policy")):
+    """Store superseded policy versions as compressed diffs."""
+    async def _run_it():
+        from src.database import init_db, async_session
+        from src.services.policy_service import compact_versions
+        await init_db()
+        async with async_session() as db:
+            return await compact_versions(db, policy_id)
+
+    converted = _run(_run_it())
+    console.print(f"[green]✓ Compacted {converted} policy versions[/green]")
+
+
 @policy_app.command("approve")
 def policy_approve(policy_id: str = typer.Argument(..., help="Policy ID")):
     """Approve a policy."""
@@ -537,6 +692,7 @@ def policy_distribute(
     policy_id: str = typer.Argument(..., help="Policy ID"),
     channel: str = typer.Option("email", "--channel", "-c", help="Distribution channel"),
     recipients: list[str] = typer.Option([], "--to", "-t", help="Recipients"),
+    send: bool = typer.Option(False, "--send", help="Deliver now in this process and show progress"),
 ):
     """Distribute a policy via email/teams/sharepoint."""
     if not recipients:
@@ -551,7 +707,63 @@ def policy_distribute(
             return await distribute_policy(db, policy_id, channel, recipients)
 
     dists = _run(_run_it())
-    console.print(f"[green]✓ Distributed to {len(dists)} recipient(s) via {channel}[/green]")
+    console.print(f"[green]✓ Queued {len(dists)} recipient(s) via {channel}[/green]")
+    if send:
+        progress = _run(_drain_distributions(policy_id))
+        console.print(f"  Sent: {progress['sent']}  Failed: {progress['failed']}")
+
+
+async def _drain_distributions(policy_id: str) -> dict:
+    """Run distribution workers for one policy until its queue is empty.
+
+    At least one worker runs here even when ``DISTRIBUTION_WORKERS=0``
+    disables the background workers, or the queue would never drain.
+    """
+    from rich.progress import Progress
+
+    from src.database import async_session
+    from src.services.distribution_service import get_progress
+    from src.services.distribution_worker import DistributionWorkers
+
+    count = max(1, get_settings().distribution_workers)
+    workers = DistributionWorkers(async_session, workers=count, policy_id=policy_id)
+    workers.start()
+    try:
+        with Progress(console=console) as bar:
+            task = bar.add_task("Sending", total=None)
+            while True:
+                async with async_session() as db:
+                    progress = await get_progress(db, policy_id)
+                bar.update(task, total=progress["total"], completed=progress["sent"] + progress["failed"])
+                if progress["complete"]:
+                    return progress
+                await asyncio.sleep(0.5)
+    finally:
+        await workers.stop()
+
+
+@policy_app.command("progress")
+def policy_progress(policy_id: str = typer.Argument(..., help="Policy ID")):
+    """Show delivery status of a policy's distributions."""
+    async def _run_it():
+        from src.database import init_db, async_session
+        from src.services.distribution_service import get_progress
+        await init_db()
+        async with async_session() as db:
+            return await get_progress(db, policy_id)
+
+    progress = _run(_run_it())
+    if not progress["total"]:
+        console.print("[yellow]No distributions for this policy[/yellow]")
+        return
+
+    table = Table(title="Policy Distribution")
+    table.add_column("Channel", style="bold")
+    for status in ("Pending", "Sending", "Sent", "Failed"):
+        table.add_column(status, justify="right")
+    for channel, counts in sorted(progress["by_channel"].items()):
+        table.add_row(channel, *(str(counts[s]) for s in ("pending", "sending", "sent", "failed")))
+    console.print(table)
 
 
 # ── Report ──────────────────────────────────────────────────────────
@@ -611,7 +823,13 @@ def report_upload(
     report_id: str = typer.Argument(..., help="Report ID"),
     site: str = typer.Option("", "--site", help="SharePoint site"),
 ):
-    """Upload report to SharePoint."""
+    """Upload report to SharePoint.
+
+    Large files are sent in chunks; rerunning after an interruption resumes
+    the upload where it stopped.
+    """
+    from rich.progress import BarColumn, DownloadColumn, Progress, TransferSpeedColumn
+
     async def _run_it():
         from src.database import init_db, async_session
         from src.services.report_service import get_report
@@ -621,8 +839,16 @@ def report_upload(
             report = await get_report(db, report_id)
             if not report:
                 return None
-            url = await upload_file(report.file_path, site)
-            return url
+        with Progress(
+            "[progress.description]{task.description}", BarColumn(), DownloadColumn(), TransferSpeedColumn(),
+            console=console,
+        ) as bar:
+            task = bar.add_task(f"Uploading {Path(report.file_path).name}", total=None)
+            return await upload_file(
+                report.file_path,
+                site,
+                on_progress=lambda done, total: bar.update(task, completed=done, total=total),
+            )
 
     url = _run(_run_it())
     if url is None:
@@ -631,6 +857,58 @@ def report_upload(
     console.print(f"[green]✓ Uploaded: {url}[/green]")
 
 
+# ── Search ──────────────────────────────────────────────────────────
+
+@app.command("search")
+def search(
+    query: str = typer.Argument(None, help="Keywords; every keyword must match, term* matches a prefix"),
+    kind: list[str] = typer.Option(None, "--kind", "-k", help="policy, finding or risk (repeatable)"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum results per kind"),
+    all_versions: bool = typer.Option(False, "--all-versions", help="Search every policy version"),
+    reindex: bool = typer.Option(False, "--reindex", help="Rebuild the search indexes from their source tables first"),
+):
+    """Full-text search across policies, audit findings and risks."""
+    if not query and not reindex:
+        console.print("[red]Give a query, or --reindex to rebuild the search indexes[/red]")
+        raise typer.Exit(1)
+
+    async def _reindex():
+        from src.database import init_db, async_session
+        from src.services.search_service import rebuild
+        await init_db()
+        async with async_session() as db:
+            return await rebuild(db)
+
+    if reindex:
+        rebuilt = _run(_reindex())
+        console.print(f"[green]✓ Rebuilt {rebuilt} search indexes[/green]")
+        if not query:
+            return
+
+    async def _run_it():
+        from src.database import init_db, async_session
+        from src.services.search_service import search as search_all
+        await init_db()
+        async with async_session() as db:
+            return await search_all(
+                db, query, kinds=kind or None, limit=limit, markers=SEARCH_MARKERS, all_versions=all_versions
+            )
+
+    results = _run(_run_it())
+    if not results:
+        console.print("[yellow]No matches[/yellow]")
+        return
+
+    table = Table(title=f"Search: {query}")
+    table.add_column("Kind", style="cyan")
+    table.add_column("ID", style="dim", max_width=8)
+    table.add_column("Title")
+    table.add_column("Match")
+    for r in results:
+        table.add_row(r["kind"], r["id"][:8], Text(r["title"]), _highlight_matches(r["snippet"]))
+    console.print(table)
+
+
 # ── AI Commands ─────────────────────────────────────────────────────
 
 @app.command("ask")
@@ -22,15 +22,60 @@ class Settings(BaseSettings):
     azure_tenant_id: str = ""
     azure_client_id: str = ""
     azure_client_secret: str = ""
+    azure_token_refresh_margin: int = 300  # seconds before expiry to refresh in the background (max 300)
+    azure_token_cache_path: str = ""  # persist MSAL's token cache here, e.g. for CLI runs
+    graph_base_url: str = "https://graph.microsoft.com/v1.0"
+    graph_timeout: float = 30.0
+    graph_max_connections: int = 100
+    graph_max_concurrency: int = 16  # in-flight requests per tenant
+    graph_max_retries: int = 5
+    graph_backoff_base: float = 0.5
+    graph_backoff_max: float = 60.0
+    graph_upload_chunk_size: int = 10 * 1024 * 1024  # rounded down to a multiple of 320 KiB
 
     # Database
     database_url: str = f"sqlite+aiosqlite:///{BASE_DIR / 'data' / 'scm.db'}"
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
 
     # Application
     app_env: str = "development"
     log_level: str = "INFO"
     agent_max_iterations: int = 20
     agent_max_tokens: int = 4096
+    agent_tool_concurrency: int = 8
+    agent_context_ttl: int = 300
+    framework_index_ttl: int = 300
+    framework_cache: bool = True  # keep parsed framework YAML in a pickle cache
+    framework_cache_dir: Path = BASE_DIR / "data" / "cache" / "frameworks"
+
+    # Policy version storage: older versions are kept as compressed diffs
+    # against the next version, with a full snapshot every N versions.
+    policy_snapshot_interval: int = 20
+    policy_version_cache_size: int = 256  # rebuilt version texts kept in memory
+
+    # Document rendering
+    render_executor: str = "process"  # process, thread
+    render_workers: int = 2
+
+    # Policy distribution queue
+    distribution_workers: int = 4  # 0 disables the background workers
+    distribution_batch_size: int = 20
+    distribution_lease_seconds: int = 300
+    distribution_max_attempts: int = 5
+    distribution_poll_interval: float = 2.0
+    # Sustained sends per second for each channel. Exchange Online allows
+    # about 30 messages a minute from one mailbox.
+    distribution_rate_email: float = 0.5
+    distribution_rate_teams: float = 4.0
+    distribution_rate_sharepoint: float = 2.0
 
     @property
     def data_dir(self) -> Path:
@@ -1,13 +1,62 @@
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
-from src.config import get_settings
+from src.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=(settings.app_env == "development"))
+
+def _sqlite_pragmas(settings: Settings) -> list[str]:
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+    ]
+
+
+def create_engine_from_settings(settings: Settings) -> AsyncEngine:
+    """Create the async engine with the connection profile from ``settings``.
+
+    SQLite connections get WAL journaling and the configured pragmas on
+    connect, which lets readers proceed alongside a writer and makes writers
+    wait for the lock instead of failing with "database is locked". Server
+    databases get a sized connection pool.
+    """
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            echo=settings.database_echo,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_pre_ping=True,
+        )
+
+    engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000},
+    )
+    pragmas = _sqlite_pragmas(settings)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+engine = create_engine_from_settings(settings)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.models.framework import ComplianceFrameworkModel, FrameworkControl
+from src.services.changes import table_versions
+
+INDEX_TABLES = ("compliance_frameworks", "framework_controls")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "shall", "that", "the", "to", "with",
+})
+# A query term found in a control's title counts for more than one in its description.
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedControl:
+    id: str
+    framework_id: str
+    framework: str
+    control_id: str
+    title: str
+    description: str
+    category: str
+
+    def to_dict(self) -> dict:
+        return {
+            "framework": self.framework,
+            "id": self.control_id,
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedFramework:
+    id: str
+    name: str
+    version: str
+    description: str
+    controls: tuple[IndexedControl, ...]
+    # Tool payloads, serialized once when the index is built.
+    summary_json: str
+    controls_json: str
+
+
+class FrameworkIndex:
+    """Read-only snapshot of every framework and control, with lookup tables.
+
+    Built in one pass from two column projections; after that, lookups by
+    framework name or id, by ``(framework, control_id)`` and by category are
+    dictionary hits, and keyword search intersects posting sets from an
+    inverted index over control ids, titles and descriptions.
+    """
+
+    def __init__(self, frameworks: list[IndexedFramework]):
+        self.frameworks = tuple(frameworks)
+        by_key: dict[str, IndexedFramework] = {}
+        controls: dict[tuple[str, str], IndexedControl] = {}
+        categories: dict[tuple[str, str], list[IndexedControl]] = defaultdict(list)
+        postings: dict[str, set[int]] = defaultdict(set)
+        all_controls: list[IndexedControl] = []
+
+        for fw in self.frameworks:
+            by_key[fw.id] = by_key[fw.name] = by_key[fw.name.lower()] = fw
+            for control in fw.controls:
+                controls[(fw.id, control.control_id)] = control
+                categories[(fw.id, control.category)].append(control)
+                n = len(all_controls)
+                all_controls.append(control)
+                for token in tokenize(f"{control.control_id} {control.title} {control.description} {control.category}"):
+                    postings[token].add(n)
+
+        self._by_key = MappingProxyType(by_key)
+        self._controls = MappingProxyType(controls)
+        self._categories = MappingProxyType({k: tuple(v) for k, v in categories.items()})
+        self._postings = MappingProxyType({k: frozenset(v) for k, v in postings.items()})
+        self._all = tuple(all_controls)
+        self.list_json = json.dumps([{"name": f.name, "version": f.version, "id": f.id} for f in self.frameworks])
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def framework(self, name_or_id: str) -> IndexedFramework | None:
+        """Find a framework by id, exact name or case-insensitive name."""
+        return self._by_key.get(name_or_id) or self._by_key.get(name_or_id.lower())
+
+    def control(self, framework: str, control_id: str) -> IndexedControl | None:
+        fw = self.framework(framework)
+        return self._controls.get((fw.id, control_id)) if fw else None
+
+    def categories(self, framework: str) -> list[str]:
+        fw = self.framework(framework)
+        return sorted({c.category for c in fw.controls if c.category}) if fw else []
+
+    def by_category(self, framework: str, category: str) -> tuple[IndexedControl, ...]:
+        fw = self.framework(framework)
+        return self._categories.get((fw.id, category), ()) if fw else ()
+
+    def search(
+        self,
+        query: str,
+        framework: str | None = None,
+        category: str | None = None,
+        limit: int = 20,
+    ) -> list[IndexedControl]:
+        """Controls matching every term of ``query``, best title matches first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        postings = sorted((self._postings.get(t, frozenset()) for t in terms), key=len)
+        hits = set(postings[0]).intersection(*postings[1:])
+
+        fw = self.framework(framework) if framework else None
+        if framework and fw is None:
+            return []
+        matches = [
+            self._all[i] for i in hits
+            if (fw is None or self._all[i].framework_id == fw.id)
+            and (category is None or self._all[i].category == category)
+        ]
+
+        def score(control: IndexedControl) -> tuple[int, str, str]:
+            title = set(tokenize(f"{control.control_id} {control.title}"))
+            return (-sum(TITLE_WEIGHT if t in title else 1 for t in terms), control.framework, control.control_id)
+
+        return sorted(matches, key=score)[:limit]
+
+
+async def build_index(db: AsyncSession) -> FrameworkIndex:
+    frameworks = (await db.execute(
+        select(
+            ComplianceFrameworkModel.id,
+            ComplianceFrameworkModel.name,
+            ComplianceFrameworkModel.version,
+            ComplianceFrameworkModel.description,
+        ).order_by(ComplianceFrameworkModel.name)
+    )).all()
+    rows = await db.execute(
+        select(
+            FrameworkControl.id,
+            FrameworkControl.framework_id,
+            FrameworkControl.control_id,
+            FrameworkControl.title,
+            FrameworkControl.description,
+            FrameworkControl.category,
+        )
+    )
+    names = {fw.id: fw.name for fw in frameworks}
+    controls: dict[str, list[IndexedControl]] = defaultdict(list)
+    for id, framework_id, control_id, title, description, category in rows:
+        controls[framework_id].append(IndexedControl(
+            id=id,
+            framework_id=framework_id,
+            framework=names.get(framework_id, ""),
+            control_id=control_id,
+            title=title,
+            description=description or "",
+            category=category or "",
+        ))
+
+    indexed = []
+    for fw in frameworks:
+        fw_controls = tuple(controls[fw.id])
+        summary = [{"id": c.control_id, "title": c.title, "category": c.category} for c in fw_controls]
+        detail = [
+            {"id": c.control_id, "title": c.title, "description": c.description, "category": c.category}
+            for c in fw_controls
+        ]
+        indexed.append(IndexedFramework(
+            id=fw.id,
+            name=fw.name,
+            version=fw.version,
+            description=fw.description or "",
+            controls=fw_controls,
+            summary_json=json.dumps({"name": fw.name, "version": fw.version, "id": fw.id, "controls": summary}),
+            controls_json=json.dumps({"framework": fw.name, "controls": detail}),
+        ))
+    return FrameworkIndex(indexed)
+
+
+@dataclass(frozen=True)
+class _CachedIndex:
+    bind: object
+    versions: tuple[int, ...]
+    built_at: float
+    index: FrameworkIndex
+
+
+_cache: _CachedIndex | None = None
+
+
+async def get_index(db: AsyncSession) -> FrameworkIndex:
+    """Return the framework index, rebuilding it only after frameworks change.
+
+    Like the agent context, the index is invalidated by service-layer writes
+    to the framework tables and otherwise expires after
+    ``framework_index_ttl`` seconds to pick up changes from other processes.
+    """
+    global _cache
+    versions = table_versions(*INDEX_TABLES)
+    now = time.monotonic()
+    cached = _cache
+    if (
+        cached is not None
+        and cached.bind is db.bind
+        and cached.versions == versions
+        and now - cached.built_at < get_settings().framework_index_ttl
+    ):
+        return cached.index
+
+    index = await build_index(db)
+    _cache = _CachedIndex(bind=db.bind, versions=versions, built_at=now, index=index)
+    return index
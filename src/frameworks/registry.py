@@ -1,11 +1,83 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import pickle
 from pathlib import Path
+from typing import Any
 
 import yaml
 
+from src.config import get_settings
 from src.frameworks.base import ComplianceFramework, Control
 
+logger = logging.getLogger(__name__)
+
+# libyaml's loader is several times faster; fall back to pure Python without it.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when the cached structure changes to invalidate existing cache files.
+CACHE_VERSION = 1
+
+
+def _cache_file(path: Path) -> Path:
+    name = hashlib.sha1(str(path).encode()).hexdigest()
+    return get_settings().framework_cache_dir / f"{name}.pickle"
+
+
+def _read_cache(cache_file: Path) -> dict | None:
+    try:
+        with open(cache_file, "rb") as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and entry.get("version") == CACHE_VERSION else None
+
+
+def _write_cache(cache_file: Path, entry: dict) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        logger.debug(f"Could not write framework cache {cache_file}: {e}")
+
+
+def load_yaml(path: Path, raw: bytes | None = None, digest: str | None = None) -> dict[str, Any]:
+    """Parse a framework YAML file, reusing the compiled cache when it is current.
+
+    The cache holds the parsed data with the file's mtime, size and
+    sha256. A matching mtime and size returns the cached data without
+    reading the file; otherwise a matching hash avoids re-parsing it.
+    Callers that already read or hashed the file pass ``raw`` and ``digest``.
+    """
+    path = Path(path).resolve()
+    settings = get_settings()
+    if not settings.framework_cache:
+        return yaml.load(raw if raw is not None else path.read_bytes(), Loader=SafeLoader)
+
+    stat = path.stat()
+    cache_file = _cache_file(path)
+    entry = _read_cache(cache_file)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry["data"]
+
+    if raw is None:
+        raw = path.read_bytes()
+    digest = digest or hashlib.sha256(raw).hexdigest()
+    data = entry["data"] if entry and entry["sha256"] == digest else yaml.load(raw, Loader=SafeLoader)
+    _write_cache(cache_file, {
+        "version": CACHE_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest,
+        "data": data,
+    })
+    return data
+
 
 class YAMLFramework(ComplianceFramework):
     def get_controls(self) -> list[Control]:
@@ -13,8 +85,7 @@ class YAMLFramework(ComplianceFramework):
 
 
 def load_framework_from_yaml(path: Path) -> ComplianceFramework:
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    data = load_yaml(path)
     controls = [
         Control(
             id=c["id"],
@@ -33,8 +104,11 @@ def load_framework_from_yaml(path: Path) -> ComplianceFramework:
 
 
 def discover_frameworks(frameworks_dir: Path) -> dict[str, ComplianceFramework]:
-    registry = {}
-    for yaml_file in sorted(frameworks_dir.glob("*.yaml")):
-        fw = load_framework_from_yaml(yaml_file)
-        registry[fw.name] = fw
-    return registry
+    """Load every framework in ``frameworks_dir``.
+
+    Files are loaded one after another: parsing holds the GIL, so threads
+    would not overlap it, and a handful of small files parses faster than a
+    process pool starts. Repeat loads are served from the compiled cache.
+    """
+    frameworks = [load_framework_from_yaml(path) for path in sorted(frameworks_dir.glob("*.yaml"))]
+    return {fw.name: fw for fw in frameworks}
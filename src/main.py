@@ -7,8 +7,12 @@ from fastapi import FastAPI
 from src.api.v1 import router as v1_router
 from src.config import get_settings
 from src.database import init_db
+from src.frameworks.index import get_index
 from src.services.framework_service import import_all_frameworks
 from src.database import async_session
+from src.office365.graph_client import close_client
+from src.services.distribution_worker import start_workers, stop_workers
+from src.services.render_service import resume_pending_jobs, shutdown_executor
 
 
 @asynccontextmanager
@@ -17,7 +21,13 @@ async def lifespan(app: FastAPI):
     await init_db()
     async with async_session() as db:
         await import_all_frameworks(db, settings.frameworks_dir)
+        await get_index(db)
+        await resume_pending_jobs(db)
+    start_workers(async_session)
     yield
+    await stop_workers()
+    shutdown_executor()
+    await close_client()
 
 
 app = FastAPI(
@@ -0,0 +1,41 @@
+"""add indexes for foreign keys and list sort columns
+
+Revision ID: 3b8e41c9d2a7
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3b8e41c9d2a7'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_audits_framework_id", "audits", ["framework_id"]),
+    ("ix_audits_created_at_id", "audits", ["created_at", "id"]),
+    ("ix_audit_findings_audit_id", "audit_findings", ["audit_id"]),
+    ("ix_framework_controls_framework_id_control_id", "framework_controls", ["framework_id", "control_id"]),
+    ("ix_policies_framework_id", "policies", ["framework_id"]),
+    ("ix_policies_updated_at_id", "policies", ["updated_at", "id"]),
+    ("ix_policy_versions_policy_id_version_number", "policy_versions", ["policy_id", "version_number"]),
+    ("ix_policy_distributions_policy_id", "policy_distributions", ["policy_id"]),
+    ("ix_reports_created_at", "reports", ["created_at"]),
+    ("ix_risks_score_id", "risks", ["score", "id"]),
+    ("ix_risk_mitigations_risk_id", "risk_mitigations", ["risk_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
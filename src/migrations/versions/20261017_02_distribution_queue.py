@@ -0,0 +1,38 @@
+"""add work-queue columns to policy_distributions
+
+Revision ID: 7c2d5e18a4f0
+Revises: 3b8e41c9d2a7
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7c2d5e18a4f0'
+down_revision: Union[str, None] = '3b8e41c9d2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("policy_distributions") as batch:
+        batch.add_column(sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("lease_owner", sa.String(36), nullable=True))
+        batch.add_column(sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("error", sa.Text(), nullable=False, server_default=""))
+    op.create_index(
+        "ix_policy_distributions_status_channel", "policy_distributions", ["status", "channel"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_policy_distributions_status_channel", table_name="policy_distributions", if_exists=True)
+    with op.batch_alter_table("policy_distributions") as batch:
+        batch.drop_column("error")
+        batch.drop_column("next_attempt_at")
+        batch.drop_column("lease_expires_at")
+        batch.drop_column("lease_owner")
+        batch.drop_column("attempts")
@@ -0,0 +1,34 @@
+"""track the YAML source of each framework
+
+Revision ID: a91f6b3c5d28
+Revises: 7c2d5e18a4f0
+Create Date: 2026-10-17 15:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a91f6b3c5d28'
+down_revision: Union[str, None] = '7c2d5e18a4f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("compliance_frameworks") as batch:
+        batch.add_column(sa.Column("source_path", sa.String(500), nullable=True))
+        batch.add_column(sa.Column("source_hash", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("source_mtime", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("source_size", sa.Integer(), nullable=True))
+        batch.create_unique_constraint("uq_compliance_frameworks_source_path", ["source_path"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("compliance_frameworks") as batch:
+        batch.drop_constraint("uq_compliance_frameworks_source_path", type_="unique")
+        batch.drop_column("source_size")
+        batch.drop_column("source_mtime")
+        batch.drop_column("source_hash")
+        batch.drop_column("source_path")
@@ -0,0 +1,26 @@
+"""add covering index for the risk matrix
+
+Revision ID: d4e7a2b91c63
+Revises: a91f6b3c5d28
+Create Date: 2026-10-17 17:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd4e7a2b91c63'
+down_revision: Union[str, None] = 'a91f6b3c5d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_risks_likelihood_impact_score_id", "risks", ["likelihood", "impact", "score", "id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_risks_likelihood_impact_score_id", table_name="risks", if_exists=True)
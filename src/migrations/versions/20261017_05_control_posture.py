@@ -0,0 +1,56 @@
+"""add materialized control_posture table
+
+Revision ID: 5e0c8b7f2d14
+Revises: d4e7a2b91c63
+Create Date: 2026-10-17 18:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5e0c8b7f2d14'
+down_revision: Union[str, None] = 'd4e7a2b91c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "control_posture",
+        sa.Column("framework_id", sa.String(36), sa.ForeignKey("compliance_frameworks.id"), primary_key=True),
+        sa.Column("control_id", sa.String(50), primary_key=True),
+        sa.Column("category", sa.String(100), nullable=False, server_default=""),
+        *(sa.Column(s, sa.Integer(), nullable=False, server_default="0") for s in SEVERITIES),
+        sa.Column("open_findings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_audit_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_control_posture_framework_id_category", "control_posture", ["framework_id", "category"]
+    )
+    # Populate from existing findings so posture views are correct right after upgrading.
+    counts = ", ".join(
+        f"SUM(CASE WHEN x.status = 'open' AND lower(x.severity) = '{s}' THEN 1 ELSE 0 END)" for s in SEVERITIES
+    )
+    op.execute(f"""
+        INSERT INTO control_posture
+            (framework_id, control_id, category, {", ".join(SEVERITIES)}, open_findings, last_audit_at, updated_at)
+        SELECT c.framework_id, c.control_id, MAX(c.category), {counts},
+               SUM(CASE WHEN x.status = 'open' THEN 1 ELSE 0 END), MAX(x.audited_at), CURRENT_TIMESTAMP
+        FROM framework_controls c
+        LEFT JOIN (
+            SELECT f.control_id, f.severity, f.status, a.framework_id,
+                   COALESCE(a.completed_at, a.created_at) AS audited_at
+            FROM audit_findings f JOIN audits a ON a.id = f.audit_id
+        ) x ON x.framework_id = c.framework_id AND x.control_id = c.control_id
+        GROUP BY c.framework_id, c.control_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_posture_framework_id_category", table_name="control_posture")
+    op.drop_table("control_posture")
@@ -0,0 +1,42 @@
+"""link audit findings to framework controls
+
+Revision ID: 8a3f61d0c7b5
+Revises: 5e0c8b7f2d14
+Create Date: 2026-10-17 19:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8a3f61d0c7b5'
+down_revision: Union[str, None] = '5e0c8b7f2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("audit_findings") as batch:
+        batch.add_column(sa.Column("framework_control_pk", sa.String(36), nullable=True))
+        batch.create_foreign_key(
+            "fk_audit_findings_framework_control_pk", "framework_controls",
+            ["framework_control_pk"], ["id"], ondelete="SET NULL",
+        )
+        batch.create_index("ix_audit_findings_framework_control_pk", ["framework_control_pk"])
+    # Exact matches are linked here; `scm audit link-controls` reports what is left.
+    op.execute("""
+        UPDATE audit_findings SET framework_control_pk = (
+            SELECT c.id FROM framework_controls c JOIN audits a ON a.framework_id = c.framework_id
+            WHERE a.id = audit_findings.audit_id AND c.control_id = audit_findings.control_id
+            LIMIT 1
+        )
+        WHERE control_id != ''
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("audit_findings") as batch:
+        batch.drop_index("ix_audit_findings_framework_control_pk")
+        batch.drop_constraint("fk_audit_findings_framework_control_pk", type_="foreignkey")
+        batch.drop_column("framework_control_pk")
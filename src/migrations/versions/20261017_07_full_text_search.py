@@ -0,0 +1,119 @@
+"""add FTS5 search indexes over policies, findings and risks
+
+Revision ID: c6d92e4a1b80
+Revises: 8a3f61d0c7b5
+Create Date: 2026-10-17 20:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'c6d92e4a1b80'
+down_revision: Union[str, None] = '8a3f61d0c7b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPGRADE = [
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_policy_versions "
+        "USING fts5(id UNINDEXED, policy_id UNINDEXED, version_number UNINDEXED, content, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "VALUES (new.id, new.policy_id, new.version_number, new.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "VALUES (new.id, new.policy_id, new.version_number, new.content); END"
+    ),
+    (
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "SELECT id, policy_id, version_number, content FROM policy_versions "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_policy_versions LIMIT 1)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_findings "
+        "USING fts5(id UNINDEXED, audit_id UNINDEXED, title, description, recommendation, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ai AFTER INSERT ON audit_findings BEGIN "
+        "INSERT INTO search_findings (id, audit_id, title, description, recommendation) "
+        "VALUES (new.id, new.audit_id, new.title, new.description, new.recommendation); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ad AFTER DELETE ON audit_findings BEGIN "
+        "DELETE FROM search_findings WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_au AFTER UPDATE OF title, description, recommendation "
+        "ON audit_findings BEGIN DELETE FROM search_findings WHERE id = old.id; "
+        "INSERT INTO search_findings (id, audit_id, title, description, recommendation) "
+        "VALUES (new.id, new.audit_id, new.title, new.description, new.recommendation); END"
+    ),
+    (
+        "INSERT INTO search_findings (id, audit_id, title, description, recommendation) "
+        "SELECT id, audit_id, title, description, recommendation FROM audit_findings "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_findings LIMIT 1)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_risks USING fts5(id UNINDEXED, title, description, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ai AFTER INSERT ON risks BEGIN "
+        "INSERT INTO search_risks (id, title, description) VALUES (new.id, new.title, new.description); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ad AFTER DELETE ON risks BEGIN DELETE FROM search_risks "
+        "WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_au AFTER UPDATE OF title, description ON risks BEGIN "
+        "DELETE FROM search_risks WHERE id = old.id; INSERT INTO search_risks (id, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    ),
+    (
+        "INSERT INTO search_risks (id, title, description) SELECT id, title, description FROM risks "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_risks LIMIT 1)"
+    ),
+]
+
+DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+    "DROP TABLE IF EXISTS search_policy_versions",
+    "DROP TRIGGER IF EXISTS search_findings_ai",
+    "DROP TRIGGER IF EXISTS search_findings_ad",
+    "DROP TRIGGER IF EXISTS search_findings_au",
+    "DROP TABLE IF EXISTS search_findings",
+    "DROP TRIGGER IF EXISTS search_risks_ai",
+    "DROP TRIGGER IF EXISTS search_risks_ad",
+    "DROP TRIGGER IF EXISTS search_risks_au",
+    "DROP TABLE IF EXISTS search_risks",
+]
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite-only; other databases fall back to unranked LIKE search.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,89 @@
+"""store superseded policy versions as compressed snapshots or diffs
+
+Revision ID: 2f7b9c4e61d3
+Revises: c6d92e4a1b80
+Create Date: 2026-10-17 21:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = '2f7b9c4e61d3'
+down_revision: Union[str, None] = 'c6d92e4a1b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+]
+
+# Index only rows that still hold their text in ``content``.
+TRIGGERS = [
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "SELECT new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "SELECT new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+]
+
+# The revision-07 triggers, which index every version.
+PREVIOUS_TRIGGERS = [
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "VALUES (new.id, new.policy_id, new.version_number, new.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "VALUES (new.id, new.policy_id, new.version_number, new.content); END"
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("policy_versions") as batch_op:
+        batch_op.add_column(sa.Column("encoding", sa.String(10), nullable=False, server_default="full"))
+        batch_op.add_column(sa.Column("data", sa.LargeBinary(), nullable=True))
+    # Existing rows stay "full"; `scm policy compact` converts them.
+    if op.get_bind().dialect.name == "sqlite":
+        # The FTS table itself is kept; only its triggers change.
+        for statement in [*DROP_TRIGGERS, *TRIGGERS]:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    # Rows must be full text again before the columns go; refuse rather than lose history.
+    remaining = op.get_bind().execute(
+        sa.text("SELECT COUNT(*) FROM policy_versions WHERE encoding != 'full'")
+    ).scalar()
+    if remaining:
+        raise RuntimeError(f"{remaining} policy versions are stored as diffs; cannot downgrade")
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in DROP_TRIGGERS:
+            op.execute(statement)
+    with op.batch_alter_table("policy_versions") as batch_op:
+        batch_op.drop_column("data")
+        batch_op.drop_column("encoding")
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in PREVIOUS_TRIGGERS:
+            op.execute(statement)
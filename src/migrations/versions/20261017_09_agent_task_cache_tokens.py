@@ -0,0 +1,28 @@
+"""add prompt-cache token counts to agent tasks
+
+Revision ID: 9d41e7a3c5b2
+Revises: 2f7b9c4e61d3
+Create Date: 2026-10-17 22:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9d41e7a3c5b2'
+down_revision: Union[str, None] = '2f7b9c4e61d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("agent_tasks") as batch:
+        batch.add_column(sa.Column("cache_read_tokens", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("cache_write_tokens", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("agent_tasks") as batch:
+        batch.drop_column("cache_write_tokens")
+        batch.drop_column("cache_read_tokens")
@@ -0,0 +1,26 @@
+"""add error message to reports
+
+Revision ID: e3a8c1f64b97
+Revises: 9d41e7a3c5b2
+Create Date: 2026-10-17 23:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e3a8c1f64b97'
+down_revision: Union[str, None] = '9d41e7a3c5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("reports") as batch:
+        batch.add_column(sa.Column("error", sa.Text(), nullable=False, server_default=""))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("reports") as batch:
+        batch.drop_column("error")
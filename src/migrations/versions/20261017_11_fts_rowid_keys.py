@@ -0,0 +1,174 @@
+"""key full-text search rows on the source table's rowid
+
+Revision ID: 5b0e92d7a4c6
+Revises: e3a8c1f64b97
+Create Date: 2026-10-17 23:30:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '5b0e92d7a4c6'
+down_revision: Union[str, None] = 'e3a8c1f64b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing index rows have FTS-assigned rowids; rebuild so they match the source rows.
+UPGRADE = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+    "DROP TABLE IF EXISTS search_policy_versions",
+    "DROP TRIGGER IF EXISTS search_findings_ai",
+    "DROP TRIGGER IF EXISTS search_findings_ad",
+    "DROP TRIGGER IF EXISTS search_findings_au",
+    "DROP TABLE IF EXISTS search_findings",
+    "DROP TRIGGER IF EXISTS search_risks_ai",
+    "DROP TRIGGER IF EXISTS search_risks_ad",
+    "DROP TRIGGER IF EXISTS search_risks_au",
+    "DROP TABLE IF EXISTS search_risks",
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_policy_versions "
+        "USING fts5(id UNINDEXED, policy_id UNINDEXED, version_number UNINDEXED, content, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT new.rowid, new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = old.rowid; "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT new.rowid, new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT rowid, id, policy_id, version_number, content FROM policy_versions "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_policy_versions LIMIT 1) AND content != ''"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_findings "
+        "USING fts5(id UNINDEXED, audit_id UNINDEXED, title, description, recommendation, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ai AFTER INSERT ON audit_findings BEGIN "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT new.rowid, new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ad AFTER DELETE ON audit_findings BEGIN "
+        "DELETE FROM search_findings WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_au AFTER UPDATE OF title, description, recommendation "
+        "ON audit_findings BEGIN DELETE FROM search_findings WHERE rowid = old.rowid; "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT new.rowid, new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT rowid, id, audit_id, title, description, recommendation FROM audit_findings "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_findings LIMIT 1)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_risks USING fts5(id UNINDEXED, title, description, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ai AFTER INSERT ON risks BEGIN "
+        "INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT new.rowid, new.id, new.title, new.description; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ad AFTER DELETE ON risks BEGIN DELETE FROM search_risks "
+        "WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_au AFTER UPDATE OF title, description ON risks BEGIN "
+        "DELETE FROM search_risks WHERE rowid = old.rowid; "
+        "INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT new.rowid, new.id, new.title, new.description; END"
+    ),
+    (
+        "INSERT INTO search_risks (rowid, id, title, description) SELECT rowid, id, title, description FROM risks "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_risks LIMIT 1)"
+    ),
+]
+
+# Back to the revision-08 triggers, which delete by id.
+DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+    "DROP TRIGGER IF EXISTS search_findings_ai",
+    "DROP TRIGGER IF EXISTS search_findings_ad",
+    "DROP TRIGGER IF EXISTS search_findings_au",
+    "DROP TRIGGER IF EXISTS search_risks_ai",
+    "DROP TRIGGER IF EXISTS search_risks_ad",
+    "DROP TRIGGER IF EXISTS search_risks_au",
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "SELECT new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE id = old.id; "
+        "INSERT INTO search_policy_versions (id, policy_id, version_number, content) "
+        "SELECT new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ai AFTER INSERT ON audit_findings BEGIN "
+        "INSERT INTO search_findings (id, audit_id, title, description, recommendation) "
+        "VALUES (new.id, new.audit_id, new.title, new.description, new.recommendation); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ad AFTER DELETE ON audit_findings BEGIN "
+        "DELETE FROM search_findings WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_au AFTER UPDATE OF title, description, recommendation "
+        "ON audit_findings BEGIN DELETE FROM search_findings WHERE id = old.id; "
+        "INSERT INTO search_findings (id, audit_id, title, description, recommendation) "
+        "VALUES (new.id, new.audit_id, new.title, new.description, new.recommendation); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ai AFTER INSERT ON risks BEGIN "
+        "INSERT INTO search_risks (id, title, description) VALUES (new.id, new.title, new.description); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ad AFTER DELETE ON risks BEGIN DELETE FROM search_risks "
+        "WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_au AFTER UPDATE OF title, description ON risks BEGIN "
+        "DELETE FROM search_risks WHERE id = old.id; INSERT INTO search_risks (id, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DOWNGRADE:
+        op.execute(statement)
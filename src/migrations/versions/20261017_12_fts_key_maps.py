@@ -0,0 +1,253 @@
+"""key full-text search rows through a stable id map
+
+Revision ID: 7c2d5e8f1a36
+Revises: 5b0e92d7a4c6
+Create Date: 2026-10-17 23:45:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '7c2d5e8f1a36'
+down_revision: Union[str, None] = '5b0e92d7a4c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuild every index with a key map, so index rows no longer depend on source rowids.
+UPGRADE = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+    "DROP TABLE IF EXISTS search_policy_versions",
+    "DROP TRIGGER IF EXISTS search_findings_ai",
+    "DROP TRIGGER IF EXISTS search_findings_ad",
+    "DROP TRIGGER IF EXISTS search_findings_au",
+    "DROP TABLE IF EXISTS search_findings",
+    "DROP TRIGGER IF EXISTS search_risks_ai",
+    "DROP TRIGGER IF EXISTS search_risks_ad",
+    "DROP TRIGGER IF EXISTS search_risks_au",
+    "DROP TABLE IF EXISTS search_risks",
+    (
+        "CREATE TABLE IF NOT EXISTS search_policy_versions_keys "
+        "(fts_rowid INTEGER PRIMARY KEY, source_id VARCHAR(36) NOT NULL UNIQUE)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_policy_versions "
+        "USING fts5(id UNINDEXED, policy_id UNINDEXED, version_number UNINDEXED, content, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions_keys (source_id) VALUES (new.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = old.id); DELETE FROM search_policy_versions_keys WHERE source_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = old.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.content != ''; END"
+    ),
+    (
+        "INSERT INTO search_policy_versions_keys (source_id) SELECT id FROM policy_versions "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_policy_versions_keys LIMIT 1)"
+    ),
+    (
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT k.fts_rowid, s.id, s.policy_id, s.version_number, s.content "
+        "FROM policy_versions s JOIN search_policy_versions_keys k ON k.source_id = s.id "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_policy_versions LIMIT 1) AND s.content != ''"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS search_findings_keys "
+        "(fts_rowid INTEGER PRIMARY KEY, source_id VARCHAR(36) NOT NULL UNIQUE)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_findings "
+        "USING fts5(id UNINDEXED, audit_id UNINDEXED, title, description, recommendation, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ai AFTER INSERT ON audit_findings BEGIN "
+        "INSERT INTO search_findings_keys (source_id) VALUES (new.id); "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT (SELECT fts_rowid FROM search_findings_keys "
+        "WHERE source_id = new.id), new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ad AFTER DELETE ON audit_findings BEGIN "
+        "DELETE FROM search_findings WHERE rowid = (SELECT fts_rowid FROM search_findings_keys "
+        "WHERE source_id = old.id); DELETE FROM search_findings_keys WHERE source_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_au AFTER UPDATE OF title, description, recommendation "
+        "ON audit_findings BEGIN DELETE FROM search_findings "
+        "WHERE rowid = (SELECT fts_rowid FROM search_findings_keys WHERE source_id = old.id); "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT (SELECT fts_rowid FROM search_findings_keys "
+        "WHERE source_id = new.id), new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "INSERT INTO search_findings_keys (source_id) SELECT id FROM audit_findings "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_findings_keys LIMIT 1)"
+    ),
+    (
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT k.fts_rowid, s.id, s.audit_id, s.title, s.description, s.recommendation "
+        "FROM audit_findings s JOIN search_findings_keys k ON k.source_id = s.id "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_findings LIMIT 1)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS search_risks_keys "
+        "(fts_rowid INTEGER PRIMARY KEY, source_id VARCHAR(36) NOT NULL UNIQUE)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_risks USING fts5(id UNINDEXED, title, description, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ai AFTER INSERT ON risks BEGIN "
+        "INSERT INTO search_risks_keys (source_id) VALUES (new.id); "
+        "INSERT INTO search_risks (rowid, id, title, description) SELECT (SELECT fts_rowid FROM search_risks_keys "
+        "WHERE source_id = new.id), new.id, new.title, new.description; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ad AFTER DELETE ON risks BEGIN DELETE FROM search_risks "
+        "WHERE rowid = (SELECT fts_rowid FROM search_risks_keys WHERE source_id = old.id); "
+        "DELETE FROM search_risks_keys WHERE source_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_au AFTER UPDATE OF title, description ON risks BEGIN "
+        "DELETE FROM search_risks WHERE rowid = (SELECT fts_rowid FROM search_risks_keys "
+        "WHERE source_id = old.id); INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT (SELECT fts_rowid FROM search_risks_keys "
+        "WHERE source_id = new.id), new.id, new.title, new.description; END"
+    ),
+    (
+        "INSERT INTO search_risks_keys (source_id) SELECT id FROM risks "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_risks_keys LIMIT 1)"
+    ),
+    (
+        "INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT k.fts_rowid, s.id, s.title, s.description "
+        "FROM risks s JOIN search_risks_keys k ON k.source_id = s.id "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_risks LIMIT 1)"
+    ),
+]
+
+# Back to the revision-11 indexes, keyed on the source rowid.
+DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+    "DROP TABLE IF EXISTS search_policy_versions",
+    "DROP TABLE IF EXISTS search_policy_versions_keys",
+    "DROP TRIGGER IF EXISTS search_findings_ai",
+    "DROP TRIGGER IF EXISTS search_findings_ad",
+    "DROP TRIGGER IF EXISTS search_findings_au",
+    "DROP TABLE IF EXISTS search_findings",
+    "DROP TABLE IF EXISTS search_findings_keys",
+    "DROP TRIGGER IF EXISTS search_risks_ai",
+    "DROP TRIGGER IF EXISTS search_risks_ad",
+    "DROP TRIGGER IF EXISTS search_risks_au",
+    "DROP TABLE IF EXISTS search_risks",
+    "DROP TABLE IF EXISTS search_risks_keys",
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_policy_versions "
+        "USING fts5(id UNINDEXED, policy_id UNINDEXED, version_number UNINDEXED, content, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT new.rowid, new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = old.rowid; "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT new.rowid, new.id, new.policy_id, new.version_number, new.content WHERE new.content != ''; END"
+    ),
+    (
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT rowid, id, policy_id, version_number, content FROM policy_versions "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_policy_versions LIMIT 1) AND content != ''"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_findings "
+        "USING fts5(id UNINDEXED, audit_id UNINDEXED, title, description, recommendation, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ai AFTER INSERT ON audit_findings BEGIN "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT new.rowid, new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_ad AFTER DELETE ON audit_findings BEGIN "
+        "DELETE FROM search_findings WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_findings_au AFTER UPDATE OF title, description, recommendation "
+        "ON audit_findings BEGIN DELETE FROM search_findings WHERE rowid = old.rowid; "
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT new.rowid, new.id, new.audit_id, new.title, new.description, new.recommendation; END"
+    ),
+    (
+        "INSERT INTO search_findings (rowid, id, audit_id, title, description, recommendation) "
+        "SELECT rowid, id, audit_id, title, description, recommendation FROM audit_findings "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_findings LIMIT 1)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_risks USING fts5(id UNINDEXED, title, description, "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ai AFTER INSERT ON risks BEGIN "
+        "INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT new.rowid, new.id, new.title, new.description; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_ad AFTER DELETE ON risks BEGIN DELETE FROM search_risks "
+        "WHERE rowid = old.rowid; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_risks_au AFTER UPDATE OF title, description ON risks BEGIN "
+        "DELETE FROM search_risks WHERE rowid = old.rowid; "
+        "INSERT INTO search_risks (rowid, id, title, description) "
+        "SELECT new.rowid, new.id, new.title, new.description; END"
+    ),
+    (
+        "INSERT INTO search_risks (rowid, id, title, description) SELECT rowid, id, title, description FROM risks "
+        "WHERE NOT EXISTS (SELECT 1 FROM search_risks LIMIT 1)"
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DOWNGRADE:
+        op.execute(statement)
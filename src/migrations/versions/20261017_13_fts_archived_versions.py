@@ -0,0 +1,90 @@
+"""keep superseded policy versions in the full-text index
+
+Revision ID: 1e9a4c7b3d58
+Revises: 7c2d5e8f1a36
+Create Date: 2026-10-17 23:55:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '1e9a4c7b3d58'
+down_revision: Union[str, None] = '7c2d5e8f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS search_policy_versions_ai",
+    "DROP TRIGGER IF EXISTS search_policy_versions_ad",
+    "DROP TRIGGER IF EXISTS search_policy_versions_au",
+]
+
+# Index versions while their text is in ``content``; archiving one keeps its index row.
+TRIGGERS = [
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions_keys (source_id) VALUES (new.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.encoding = 'full'; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = old.id); DELETE FROM search_policy_versions_keys WHERE source_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions "
+        "WHEN new.encoding = 'full' BEGIN DELETE FROM search_policy_versions "
+        "WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys WHERE source_id = old.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.encoding = 'full'; END"
+    ),
+]
+
+# The revision-12 triggers, which drop a version's index row when it is archived.
+PREVIOUS_TRIGGERS = [
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ai AFTER INSERT ON policy_versions BEGIN "
+        "INSERT INTO search_policy_versions_keys (source_id) VALUES (new.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.content != ''; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_ad AFTER DELETE ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = old.id); DELETE FROM search_policy_versions_keys WHERE source_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS search_policy_versions_au AFTER UPDATE OF content ON policy_versions BEGIN "
+        "DELETE FROM search_policy_versions WHERE rowid = (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = old.id); "
+        "INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content) "
+        "SELECT (SELECT fts_rowid FROM search_policy_versions_keys "
+        "WHERE source_id = new.id), new.id, new.policy_id, new.version_number, new.content "
+        "WHERE new.content != ''; END"
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    # Versions archived under the old triggers are already out of the index
+    # and their text is only in compressed diffs; `scm search --reindex`
+    # rebuilds them.
+    for statement in [*DROP_TRIGGERS, *TRIGGERS]:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in [*DROP_TRIGGERS, *PREVIOUS_TRIGGERS]:
+        op.execute(statement)
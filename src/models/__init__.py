@@ -1,14 +1,17 @@
 from src.models.audit import Audit, AuditFinding
 from src.models.framework import ComplianceFrameworkModel, FrameworkControl
 from src.models.policy import Policy, PolicyDistribution, PolicyVersion
+from src.models.posture import ControlPosture
 from src.models.report import Report
 from src.models.risk import Risk, RiskMitigation
 from src.models.agent_task import AgentTask
+from src.models import search  # noqa: F401 - registers the FTS5 tables with the metadata
 
 __all__ = [
     "Audit",
     "AuditFinding",
     "ComplianceFrameworkModel",
+    "ControlPosture",
     "FrameworkControl",
     "Policy",
     "PolicyDistribution",
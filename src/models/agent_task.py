@@ -14,10 +14,12 @@ class AgentTask(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     instruction: Mapped[str] = mapped_column(Text)
-    status: Mapped[str] = mapped_column(String(20), default="running")  # running, completed, failed
+    status: Mapped[str] = mapped_column(String(20), default="running")  # running, completed, failed, cancelled
     result: Mapped[str] = mapped_column(Text, default="")
     iterations: Mapped[int] = mapped_column(Integer, default=0)
     tokens_used: Mapped[int] = mapped_column(Integer, default=0)
+    cache_read_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    cache_write_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     error: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
     completed_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
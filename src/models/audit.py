@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -11,10 +11,11 @@ from src.database import Base
 
 class Audit(Base):
     __tablename__ = "audits"
+    __table_args__ = (Index("ix_audits_created_at_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title: Mapped[str] = mapped_column(String(200))
-    framework_id: Mapped[str] = mapped_column(ForeignKey("compliance_frameworks.id"))
+    framework_id: Mapped[str] = mapped_column(ForeignKey("compliance_frameworks.id"), index=True)
     scope: Mapped[str] = mapped_column(Text, default="")
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, in_progress, completed
     summary: Mapped[str] = mapped_column(Text, default="")
@@ -28,8 +29,12 @@ class AuditFinding(Base):
     __tablename__ = "audit_findings"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    audit_id: Mapped[str] = mapped_column(ForeignKey("audits.id"))
+    audit_id: Mapped[str] = mapped_column(ForeignKey("audits.id"), index=True)
     control_id: Mapped[str] = mapped_column(String(50), default="")
+    # The framework control ``control_id`` names, resolved on write; NULL if it matches none.
+    framework_control_pk: Mapped[str | None] = mapped_column(
+        ForeignKey("framework_controls.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     title: Mapped[str] = mapped_column(String(200))
     description: Mapped[str] = mapped_column(Text, default="")
     severity: Mapped[str] = mapped_column(String(20), default="medium")  # critical, high, medium, low, info
@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -17,12 +17,19 @@ class ComplianceFrameworkModel(Base):
     version: Mapped[str] = mapped_column(String(20), default="1.0")
     description: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
+    # The YAML file this framework was imported from, as last seen. A file
+    # whose size and mtime match is skipped without being read.
+    source_path: Mapped[str | None] = mapped_column(String(500), nullable=True, unique=True)
+    source_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    source_mtime: Mapped[float | None] = mapped_column(Float, nullable=True)
+    source_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     controls: Mapped[list[FrameworkControl]] = relationship(back_populates="framework", cascade="all, delete-orphan")
 
 
 class FrameworkControl(Base):
     __tablename__ = "framework_controls"
+    __table_args__ = (Index("ix_framework_controls_framework_id_control_id", "framework_id", "control_id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     framework_id: Mapped[str] = mapped_column(ForeignKey("compliance_frameworks.id"))
@@ -3,18 +3,19 @@ from __future__ import annotations
 import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, and_, func
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 
 from src.database import Base
 
 
 class Policy(Base):
     __tablename__ = "policies"
+    __table_args__ = (Index("ix_policies_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title: Mapped[str] = mapped_column(String(200))
-    framework_id: Mapped[str | None] = mapped_column(ForeignKey("compliance_frameworks.id"), nullable=True)
+    framework_id: Mapped[str | None] = mapped_column(ForeignKey("compliance_frameworks.id"), nullable=True, index=True)
     category: Mapped[str] = mapped_column(String(100), default="")
     status: Mapped[str] = mapped_column(String(20), default="draft")  # draft, review, approved, published
     current_version: Mapped[int] = mapped_column(Integer, default=1)
@@ -22,16 +23,30 @@ class Policy(Base):
     updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     versions: Mapped[list[PolicyVersion]] = relationship(back_populates="policy", cascade="all, delete-orphan")
+    # Just the current version, for callers that need the policy text but not its history.
+    latest_version: Mapped[PolicyVersion | None] = relationship(
+        primaryjoin=lambda: and_(
+            Policy.id == foreign(PolicyVersion.policy_id),
+            Policy.current_version == foreign(PolicyVersion.version_number),
+        ),
+        viewonly=True,
+        uselist=False,
+    )
     distributions: Mapped[list[PolicyDistribution]] = relationship(back_populates="policy", cascade="all, delete-orphan")
 
 
 class PolicyVersion(Base):
     __tablename__ = "policy_versions"
+    __table_args__ = (Index("ix_policy_versions_policy_id_version_number", "policy_id", "version_number"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     policy_id: Mapped[str] = mapped_column(ForeignKey("policies.id"))
     version_number: Mapped[int] = mapped_column(Integer)
+    # Only the current version keeps its text here; older ones are moved into
+    # ``data`` as a snapshot or a diff against the next version (see ``encoding``).
     content: Mapped[str] = mapped_column(Text, default="")
+    encoding: Mapped[str] = mapped_column(String(10), default="full", server_default="full")  # full, snapshot, delta
+    data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
     change_summary: Mapped[str] = mapped_column(Text, default="")
     created_by: Mapped[str] = mapped_column(String(100), default="system")
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
@@ -41,13 +56,21 @@ class PolicyVersion(Base):
 
 class PolicyDistribution(Base):
     __tablename__ = "policy_distributions"
+    __table_args__ = (Index("ix_policy_distributions_status_channel", "status", "channel"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    policy_id: Mapped[str] = mapped_column(ForeignKey("policies.id"))
+    policy_id: Mapped[str] = mapped_column(ForeignKey("policies.id"), index=True)
     channel: Mapped[str] = mapped_column(String(20))  # email, teams, sharepoint
     recipient: Mapped[str] = mapped_column(String(200))
-    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, sent, failed
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, sending, sent, failed
     sent_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
+    # Work-queue state: a worker leases a row while sending it; failed attempts
+    # are rescheduled via next_attempt_at until the attempt limit is reached.
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    lease_owner: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    lease_expires_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
+    next_attempt_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
+    error: Mapped[str] = mapped_column(Text, default="", server_default="")
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
 
     policy: Mapped[Policy] = relationship(back_populates="distributions")
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class ControlPosture(Base):
+    """Open findings for one framework control, kept current by the service layer.
+
+    A materialized rollup of the ``audit_findings`` linked to each control
+    through ``framework_control_pk``, so posture views read one row per
+    control instead of scanning findings.
+    """
+
+    __tablename__ = "control_posture"
+    __table_args__ = (Index("ix_control_posture_framework_id_category", "framework_id", "category"),)
+
+    framework_id: Mapped[str] = mapped_column(ForeignKey("compliance_frameworks.id"), primary_key=True)
+    control_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    category: Mapped[str] = mapped_column(String(100), default="")
+    critical: Mapped[int] = mapped_column(Integer, default=0)
+    high: Mapped[int] = mapped_column(Integer, default=0)
+    medium: Mapped[int] = mapped_column(Integer, default=0)
+    low: Mapped[int] = mapped_column(Integer, default=0)
+    info: Mapped[int] = mapped_column(Integer, default=0)
+    # All open findings, including any with a severity outside the five above.
+    open_findings: Mapped[int] = mapped_column(Integer, default=0)
+    # Most recent audit of the framework that recorded a finding on this control.
+    last_audit_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
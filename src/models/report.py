@@ -18,5 +18,6 @@ class Report(Base):
     format: Mapped[str] = mapped_column(String(10))  # docx, xlsx, pptx
     file_path: Mapped[str] = mapped_column(String(500), default="")
     source_id: Mapped[str] = mapped_column(String(36), default="")  # audit_id, etc.
-    status: Mapped[str] = mapped_column(String(20), default="generated")
-    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
+    status: Mapped[str] = mapped_column(String(20), default="generated")  # pending, rendering, generated, failed
+    error: Mapped[str] = mapped_column(Text, default="", server_default="")
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
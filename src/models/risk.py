@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -11,6 +11,11 @@ from src.database import Base
 
 class Risk(Base):
     __tablename__ = "risks"
+    __table_args__ = (
+        Index("ix_risks_score_id", "score", "id"),
+        # Covers the matrix GROUP BY and per-cell drill-down in score order.
+        Index("ix_risks_likelihood_impact_score_id", "likelihood", "impact", "score", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title: Mapped[str] = mapped_column(String(200))
@@ -31,7 +36,7 @@ class RiskMitigation(Base):
     __tablename__ = "risk_mitigations"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    risk_id: Mapped[str] = mapped_column(ForeignKey("risks.id"))
+    risk_id: Mapped[str] = mapped_column(ForeignKey("risks.id"), index=True)
     action: Mapped[str] = mapped_column(Text)
     status: Mapped[str] = mapped_column(String(20), default="planned")  # planned, in_progress, completed
     assigned_to: Mapped[str] = mapped_column(String(100), default="")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from sqlalchemy import DDL, event
+
+from src.database import Base
+
+# SQLite FTS5 indexes over the free text of policies, findings and risks.
+# Each index keeps its own copy of the text (rather than reading it back from
+# the source table) and is kept in sync by triggers, so Core bulk inserts are
+# indexed as well as ORM writes. The source tables have string primary keys,
+# so their implicit rowids can be renumbered by VACUUM or a table rebuild;
+# instead each index has a ``<table>_keys`` map from source id to index rowid,
+# whose INTEGER PRIMARY KEY is stable. The delete and update triggers are
+# lookups through that map rather than scans of the unindexed ``id`` column.
+FTS_TABLES = {
+    "search_policy_versions": {
+        "source": "policy_versions",
+        "keys": ("id", "policy_id", "version_number"),
+        "columns": ("content",),
+        # Rows whose text is in the indexed columns. A superseded version
+        # moves its text out of ``content`` into a compressed diff; the
+        # update that does so leaves its index row alone, so every version
+        # stays searchable.
+        "when": "encoding = 'full'",
+    },
+    "search_findings": {
+        "source": "audit_findings",
+        "keys": ("id", "audit_id"),
+        "columns": ("title", "description", "recommendation"),
+    },
+    "search_risks": {
+        "source": "risks",
+        "keys": ("id",),
+        "columns": ("title", "description"),
+    },
+}
+
+
+def fts_ddl(table: str) -> list[str]:
+    """Statements creating ``table``, its key map, sync triggers and initial contents."""
+    spec = FTS_TABLES[table]
+    source, keys, columns = spec["source"], spec["keys"], spec["columns"]
+    key_map = f"{table}_keys"
+    fields = [*keys, *columns]
+    defs = ", ".join([*(f"{k} UNINDEXED" for k in keys), *columns])
+    names = ", ".join(["rowid", *fields])
+    when = spec.get("when")
+
+    def fts_rowid(row: str) -> str:
+        return f"(SELECT fts_rowid FROM {key_map} WHERE source_id = {row}.id)"
+
+    new = ", ".join([fts_rowid("new"), *(f"new.{f}" for f in fields)])
+    insert_new = f"INSERT INTO {table} ({names}) SELECT {new}" + (f" WHERE new.{when}" if when else "")
+    delete_old = f"DELETE FROM {table} WHERE rowid = {fts_rowid('old')}"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {key_map} "
+        f"(fts_rowid INTEGER PRIMARY KEY, source_id VARCHAR(36) NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({defs}, tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {key_map} (source_id) VALUES (new.id); {insert_new}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source} BEGIN "
+        f"{delete_old}; DELETE FROM {key_map} WHERE source_id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {', '.join(columns)} ON {source} "
+        + (f"WHEN new.{when} " if when else "")
+        + f"BEGIN {delete_old}; {insert_new}; END",
+        # Index rows written before the tables existed (no-ops once populated).
+        f"INSERT INTO {key_map} (source_id) SELECT id FROM {source} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {key_map} LIMIT 1)",
+        f"INSERT INTO {table} ({names}) SELECT k.fts_rowid, {', '.join(f's.{f}' for f in fields)} "
+        f"FROM {source} s JOIN {key_map} k ON k.source_id = s.id "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} LIMIT 1)" + (f" AND s.{when}" if when else ""),
+    ]
+
+
+def drop_fts_ddl(table: str) -> list[str]:
+    return [
+        *(f"DROP TRIGGER IF EXISTS {table}_{suffix}" for suffix in ("ai", "ad", "au")),
+        f"DROP TABLE IF EXISTS {table}",
+        f"DROP TABLE IF EXISTS {table}_keys",
+    ]
+
+
+def rebuild_fts_ddl(table: str) -> list[str]:
+    """Statements dropping ``table`` and re-creating it from its source table."""
+    return [*drop_fts_ddl(table), *fts_ddl(table)]
+
+
+for _table in FTS_TABLES:
+    for _statement in fts_ddl(_table):
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    for _statement in drop_fts_ddl(_table):
+        event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import threading
+import time
+from pathlib import Path
 
 import msal
 
@@ -8,29 +13,177 @@ from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+GRAPH_SCOPES = ("https://graph.microsoft.com/.default",)
+
+# acquire_token_for_client keeps returning its cached token until this many
+# seconds before expiry, so refreshing any earlier gets the same token back.
+MSAL_REFRESH_WINDOW = 300
+
 _token_cache = msal.SerializableTokenCache()
+_app: msal.ConfidentialClientApplication | None = None
+_app_key: tuple[str, str, str] | None = None
+_cache_lock = threading.Lock()
+_cache_loaded_from: str | None = None
+
+
+def _load_token_cache(path: str) -> None:
+    global _cache_loaded_from
+    if _cache_loaded_from == path:
+        return
+    _cache_loaded_from = path
+    try:
+        _token_cache.deserialize(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable token cache {path}: {e}")
+
+
+def _save_token_cache(path: str) -> None:
+    if not _token_cache.has_state_changed:
+        return
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    # The cache holds bearer tokens: keep it readable by the owner only.
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(_token_cache.serialize())
+    os.replace(tmp, target)
+    _token_cache.has_state_changed = False
 
 
 def get_confidential_client() -> msal.ConfidentialClientApplication:
+    """Return the MSAL client, built once per set of Azure credentials."""
+    global _app, _app_key
     settings = get_settings()
-    return msal.ConfidentialClientApplication(
-        client_id=settings.azure_client_id,
-        client_credential=settings.azure_client_secret,
-        authority=f"https://login.microsoftonline.com/{settings.azure_tenant_id}",
-        token_cache=_token_cache,
-    )
+    key = (settings.azure_tenant_id, settings.azure_client_id, settings.azure_client_secret)
+    with _cache_lock:
+        if _app is None or _app_key != key:
+            _app = msal.ConfidentialClientApplication(
+                client_id=settings.azure_client_id,
+                client_credential=settings.azure_client_secret,
+                authority=f"https://login.microsoftonline.com/{settings.azure_tenant_id}",
+                token_cache=_token_cache,
+            )
+            _app_key = key
+        return _app
 
 
-def get_access_token(scopes: list[str] | None = None) -> str:
-    """Acquire token for Microsoft Graph API."""
-    if scopes is None:
-        scopes = ["https://graph.microsoft.com/.default"]
+def _refresh_margin() -> float:
+    return min(get_settings().azure_token_refresh_margin, MSAL_REFRESH_WINDOW)
+
 
+def _acquire(scopes: list[str]) -> tuple[str, float]:
+    """Fetch a token from MSAL (its cache or the token endpoint). Blocking."""
+    settings = get_settings()
     client = get_confidential_client()
+    with _cache_lock:
+        if settings.azure_token_cache_path:
+            _load_token_cache(settings.azure_token_cache_path)
     result = client.acquire_token_for_client(scopes=scopes)
 
-    if "access_token" in result:
-        return result["access_token"]
+    if "access_token" not in result:
+        error = result.get("error_description", result.get("error", "Unknown error"))
+        raise RuntimeError(f"Failed to acquire token: {error}")
+
+    if settings.azure_token_cache_path:
+        with _cache_lock:
+            _save_token_cache(settings.azure_token_cache_path)
+    return result["access_token"], time.time() + int(result.get("expires_in", 0))
+
+
+class TokenProvider:
+    """In-memory access token for one set of scopes.
+
+    The token is reused until ``azure_token_refresh_margin`` seconds (at most
+    ``MSAL_REFRESH_WINDOW``) before it expires; from then on callers still get the current token while a single
+    background task fetches the next one. Once it has expired, concurrent
+    callers wait on one shared refresh. MSAL's blocking network call runs in
+    a worker thread so the event loop is never stalled.
+    """
+
+    def __init__(self, scopes: tuple[str, ...] = GRAPH_SCOPES):
+        self.scopes = list(scopes)
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    def _store(self, token: str, expires_at: float) -> str:
+        self._token, self._expires_at = token, expires_at
+        return token
+
+    def _remaining(self) -> float:
+        return self._expires_at - time.time() if self._token else 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+            self._refresh_task = None
+        return self._lock
+
+    async def _refresh(self, min_remaining: float) -> str:
+        async with self._get_lock():
+            # Another caller may have refreshed while this one waited.
+            if self._remaining() > min_remaining:
+                return self._token
+            return self._store(*await asyncio.to_thread(_acquire, self.scopes))
+
+    async def _background_refresh(self, margin: float) -> None:
+        try:
+            await self._refresh(margin)
+        except Exception as e:
+            logger.warning(f"Background token refresh failed: {e}")
+
+    async def get_token(self) -> str:
+        margin = _refresh_margin()
+        remaining = self._remaining()
+        if remaining > margin:
+            return self._token
+        if remaining > 0:
+            self._get_lock()
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._background_refresh(margin))
+            return self._token
+        return await self._refresh(0)
+
+    def get_token_sync(self) -> str:
+        if self._remaining() > _refresh_margin():
+            return self._token
+        return self._store(*_acquire(self.scopes))
+
+    def invalidate(self) -> None:
+        self._token, self._expires_at = None, 0.0
+
+
+_providers: dict[tuple[str, ...], TokenProvider] = {}
+
+
+def get_token_provider(scopes: list[str] | None = None) -> TokenProvider:
+    key = tuple(scopes) if scopes else GRAPH_SCOPES
+    if key not in _providers:
+        _providers[key] = TokenProvider(key)
+    return _providers[key]
+
+
+async def acquire_token(scopes: list[str] | None = None) -> str:
+    """Acquire a token for Microsoft Graph API without blocking the event loop."""
+    return await get_token_provider(scopes).get_token()
+
+
+def get_access_token(scopes: list[str] | None = None) -> str:
+    """Acquire token for Microsoft Graph API."""
+    return get_token_provider(scopes).get_token_sync()
+
 
-    error = result.get("error_description", result.get("error", "Unknown error"))
-    raise RuntimeError(f"Failed to acquire token: {error}")
+def reset_tokens() -> None:
+    """Forget the MSAL client and every cached token (e.g. after changing credentials)."""
+    global _app, _app_key, _cache_loaded_from, _token_cache
+    _providers.clear()
+    with _cache_lock:
+        _app = _app_key = _cache_loaded_from = None
+        _token_cache = msal.SerializableTokenCache()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from src.config import get_settings
+from src.office365.graph_client import (
+    GATEWAY_STATUSES,
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    backoff_delay,
+    graph_request,
+)
+
+logger = logging.getLogger(__name__)
+
+# Graph accepts at most 20 sub-requests per $batch call.
+MAX_BATCH_SIZE = 20
+
+
+def sub_request(
+    id: str,
+    method: str,
+    url: str,
+    body: dict | None = None,
+    headers: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Build one ``$batch`` sub-request; ``url`` is relative to the Graph version root."""
+    request: dict[str, Any] = {"id": id, "method": method.upper(), "url": url}
+    if body is not None:
+        request["body"] = body
+        request["headers"] = {"Content-Type": "application/json", **(headers or {})}
+    elif headers:
+        request["headers"] = headers
+    return request
+
+
+def _retry_delay(responses: list[dict], attempt: int) -> float:
+    settings = get_settings()
+    delays = []
+    for resp in responses:
+        value = (resp.get("headers") or {}).get("Retry-After")
+        try:
+            delays.append(float(value))
+        except (TypeError, ValueError):
+            pass
+    if delays:
+        return min(max(delays), settings.graph_backoff_max)
+    return backoff_delay(attempt)
+
+
+async def _send_chunk(requests: list[dict]) -> dict[str, dict]:
+    settings = get_settings()
+    results: dict[str, dict] = {}
+    pending = requests
+    attempt = 0
+    while pending:
+        body = await graph_request("POST", "/$batch", json_data={"requests": pending})
+        by_id = {r["id"]: r for r in body.get("responses", [])}
+
+        retry, throttled = [], []
+        for request in pending:
+            resp = by_id.get(request["id"], {"id": request["id"], "status": 500, "body": {}})
+            results[request["id"]] = resp
+            status = resp.get("status")
+            gateway_retry = status in GATEWAY_STATUSES and request["method"] in IDEMPOTENT_METHODS
+            if status in RETRY_STATUSES or gateway_retry:
+                retry.append(request)
+                throttled.append(resp)
+
+        if not retry or attempt >= settings.graph_max_retries:
+            break
+        delay = _retry_delay(throttled, attempt)
+        attempt += 1
+        logger.warning(f"{len(retry)} of {len(pending)} batched requests failed; retry {attempt} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        pending = retry
+    return results
+
+
+async def send_batch(requests: list[dict]) -> dict[str, dict]:
+    """Send sub-requests through Graph JSON batching.
+
+    Requests are grouped into ``$batch`` calls of up to ``MAX_BATCH_SIZE``.
+    Sub-requests that come back throttled, or with a gateway error when
+    their method is idempotent, are resent on their own, honouring ``Retry-After``; the rest are not
+    repeated. Returns each sub-request's final response (``status``,
+    ``headers`` and ``body``) keyed by its id.
+    """
+    ids = [r["id"] for r in requests]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Batch sub-request ids must be unique")
+
+    chunks = [requests[i:i + MAX_BATCH_SIZE] for i in range(0, len(requests), MAX_BATCH_SIZE)]
+    results: dict[str, dict] = {}
+    for chunk_results in await asyncio.gather(*(_send_chunk(c) for c in chunks)):
+        results.update(chunk_results)
+    return results
+
+
+def succeeded(response: dict) -> bool:
+    return 200 <= response.get("status", 0) < 300
+
+
+def error_message(response: dict) -> str:
+    body = response.get("body") or {}
+    error = body.get("error") if isinstance(body, dict) else None
+    if isinstance(error, dict) and error.get("message"):
+        return f"{response.get('status')}: {error['message']}"
+    return f"HTTP {response.get('status')}"
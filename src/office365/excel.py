@@ -1,97 +1,215 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterable, Callable, Iterable
 from pathlib import Path
+from typing import Any
 
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
 
 from src.config import get_settings
 
-
-def generate_audit_excel(audit) -> Path:
-    """Generate an Excel spreadsheet for audit findings."""
-    settings = get_settings()
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Audit Findings"
-
-    # Header styling
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-
-    headers = ["Severity", "Control ID", "Finding Title", "Description", "Recommendation", "Status"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-
-    severity_fills = {
-        "critical": PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid"),
-        "high": PatternFill(start_color="FF6600", end_color="FF6600", fill_type="solid"),
-        "medium": PatternFill(start_color="FFCC00", end_color="FFCC00", fill_type="solid"),
-        "low": PatternFill(start_color="92D050", end_color="92D050", fill_type="solid"),
-        "info": PatternFill(start_color="00B0F0", end_color="00B0F0", fill_type="solid"),
-    }
-
-    if audit.findings:
-        for row, finding in enumerate(audit.findings, 2):
-            ws.cell(row=row, column=1, value=finding.severity.upper()).fill = severity_fills.get(finding.severity, PatternFill())
-            ws.cell(row=row, column=2, value=finding.control_id)
-            ws.cell(row=row, column=3, value=finding.title)
-            ws.cell(row=row, column=4, value=finding.description)
-            ws.cell(row=row, column=5, value=finding.recommendation)
-            ws.cell(row=row, column=6, value=finding.status)
-
-    # Auto-width columns
-    for col in ws.columns:
-        max_length = max(len(str(cell.value or "")) for cell in col)
-        ws.column_dimensions[col[0].column_letter].width = min(max_length + 2, 50)
-
-    output_path = settings.output_dir / f"audit_{audit.id[:8]}.xlsx"
+# Styles are created once and shared by every cell that uses them.
+HEADER_FILL = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+
+RED_FILL = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+ORANGE_FILL = PatternFill(start_color="FF6600", end_color="FF6600", fill_type="solid")
+YELLOW_FILL = PatternFill(start_color="FFCC00", end_color="FFCC00", fill_type="solid")
+GREEN_FILL = PatternFill(start_color="92D050", end_color="92D050", fill_type="solid")
+BLUE_FILL = PatternFill(start_color="00B0F0", end_color="00B0F0", fill_type="solid")
+
+SEVERITY_FILLS = {
+    "critical": RED_FILL,
+    "high": ORANGE_FILL,
+    "medium": YELLOW_FILL,
+    "low": GREEN_FILL,
+    "info": BLUE_FILL,
+}
+
+AUDIT_HEADERS = ["Severity", "Control ID", "Finding Title", "Description", "Recommendation", "Status"]
+RISK_HEADERS = ["Risk ID", "Title", "Category", "Likelihood", "Impact", "Score", "Status", "Owner", "Description"]
+
+MAX_COLUMN_WIDTH = 50
+# Column widths are taken from the rows seen before the first row is written;
+# a write-only sheet cannot change them afterwards.
+WIDTH_SAMPLE_ROWS = 1000
+# Rows pulled from an async stream before they are written in a worker thread.
+WRITE_BATCH_ROWS = 1000
+
+
+class _StreamingSheet:
+    """Write-only worksheet that sizes its columns in the same pass as writing.
+
+    The first ``WIDTH_SAMPLE_ROWS`` rows are held back to measure column
+    widths; after that every row goes straight to the output file, so memory
+    stays flat regardless of the number of rows.
+    """
+
+    def __init__(self, wb: Workbook, title: str, headers: list[str], center_headers: bool = False):
+        self.ws = wb.create_sheet(title)
+        self.widths = [len(h) for h in headers]
+        self.pending: list[list[Any]] = []
+        self.flushed = False
+        self.append([
+            self.styled(h, fill=HEADER_FILL, font=HEADER_FONT, alignment=HEADER_ALIGNMENT if center_headers else None)
+            for h in headers
+        ])
+
+    def styled(
+        self,
+        value: Any,
+        fill: PatternFill | None = None,
+        font: Font | None = None,
+        alignment: Alignment | None = None,
+    ) -> Cell:
+        cell = WriteOnlyCell(self.ws, value=value)
+        if fill is not None:
+            cell.fill = fill
+        if font is not None:
+            cell.font = font
+        if alignment is not None:
+            cell.alignment = alignment
+        return cell
+
+    def append(self, row: list[Any]) -> None:
+        if self.flushed:
+            self.ws.append(row)
+            return
+        for i, value in enumerate(row):
+            if isinstance(value, Cell):
+                value = value.value
+            self.widths[i] = max(self.widths[i], len(str(value or "")))
+        self.pending.append(row)
+        if len(self.pending) > WIDTH_SAMPLE_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        for i, width in enumerate(self.widths, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = min(width + 2, MAX_COLUMN_WIDTH)
+        for row in self.pending:
+            self.ws.append(row)
+        self.pending = []
+        self.flushed = True
+
+    def close(self) -> None:
+        if not self.flushed:
+            self._flush()
+
+
+def _new_workbook() -> Workbook:
+    return Workbook(write_only=True)
+
+
+def _finding_row(sheet: _StreamingSheet, finding) -> list[Any]:
+    return [
+        sheet.styled(finding.severity.upper(), fill=SEVERITY_FILLS.get(finding.severity)),
+        finding.control_id,
+        finding.title,
+        finding.description,
+        finding.recommendation,
+        finding.status,
+    ]
+
+
+def _score_fill(score: int) -> PatternFill:
+    if score >= 16:
+        return RED_FILL
+    if score >= 9:
+        return YELLOW_FILL
+    return GREEN_FILL
+
+
+def _risk_row(sheet: _StreamingSheet, risk) -> list[Any]:
+    return [
+        risk.id[:8],
+        risk.title,
+        risk.category,
+        risk.likelihood,
+        risk.impact,
+        sheet.styled(risk.score, fill=_score_fill(risk.score)),
+        risk.status,
+        risk.owner,
+        risk.description,
+    ]
+
+
+def _audit_output_path(audit_id: str) -> Path:
+    return get_settings().output_dir / f"audit_{audit_id[:8]}.xlsx"
+
+
+def _risk_output_path() -> Path:
+    return get_settings().output_dir / "risk_register.xlsx"
+
+
+def _save(wb: Workbook, sheet: _StreamingSheet, output_path: Path) -> Path:
+    sheet.close()
     wb.save(str(output_path))
     return output_path
 
 
-def generate_risk_register(risks: list) -> Path:
+def generate_audit_excel(audit) -> Path:
+    """Generate an Excel spreadsheet for audit findings."""
+    wb = _new_workbook()
+    sheet = _StreamingSheet(wb, "Audit Findings", AUDIT_HEADERS, center_headers=True)
+    for finding in audit.findings or []:
+        sheet.append(_finding_row(sheet, finding))
+    return _save(wb, sheet, _audit_output_path(audit.id))
+
+
+def _append_rows(sheet: _StreamingSheet, make_row: Callable[[_StreamingSheet, Any], list[Any]], rows: list) -> None:
+    for row in rows:
+        sheet.append(make_row(sheet, row))
+
+
+async def _stream_to_workbook(
+    sheet_title: str,
+    headers: list[str],
+    rows: AsyncIterable,
+    make_row: Callable[[_StreamingSheet, Any], list[Any]],
+    output_path: Path,
+    center_headers: bool = False,
+) -> Path:
+    """Write an async stream of rows to a workbook without blocking the event loop.
+
+    Rows are read from the stream on the loop and handed to a worker thread
+    in batches of ``WRITE_BATCH_ROWS``; building cells and saving the file
+    happen in that thread. Only one batch is in flight at a time, so the
+    sheet is never touched by two threads at once.
+    """
+    wb = _new_workbook()
+    sheet = _StreamingSheet(wb, sheet_title, headers, center_headers=center_headers)
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= WRITE_BATCH_ROWS:
+            await asyncio.to_thread(_append_rows, sheet, make_row, batch)
+            batch = []
+    if batch:
+        await asyncio.to_thread(_append_rows, sheet, make_row, batch)
+    return await asyncio.to_thread(_save, wb, sheet, output_path)
+
+
+async def stream_audit_excel(audit_id: str, findings: AsyncIterable) -> Path:
+    """Generate the audit findings spreadsheet from an async stream of rows."""
+    return await _stream_to_workbook(
+        "Audit Findings", AUDIT_HEADERS, findings, _finding_row, _audit_output_path(audit_id), center_headers=True
+    )
+
+
+def generate_risk_register(risks: Iterable) -> Path:
     """Generate an Excel risk register."""
-    settings = get_settings()
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Risk Register"
-
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-
-    headers = ["Risk ID", "Title", "Category", "Likelihood", "Impact", "Score", "Status", "Owner", "Description"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-
-    for row, risk in enumerate(risks, 2):
-        ws.cell(row=row, column=1, value=risk.id[:8])
-        ws.cell(row=row, column=2, value=risk.title)
-        ws.cell(row=row, column=3, value=risk.category)
-        ws.cell(row=row, column=4, value=risk.likelihood)
-        ws.cell(row=row, column=5, value=risk.impact)
-
-        score_cell = ws.cell(row=row, column=6, value=risk.score)
-        if risk.score >= 16:
-            score_cell.fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-        elif risk.score >= 9:
-            score_cell.fill = PatternFill(start_color="FFCC00", end_color="FFCC00", fill_type="solid")
-        else:
-            score_cell.fill = PatternFill(start_color="92D050", end_color="92D050", fill_type="solid")
-
-        ws.cell(row=row, column=7, value=risk.status)
-        ws.cell(row=row, column=8, value=risk.owner)
-        ws.cell(row=row, column=9, value=risk.description)
-
-    for col in ws.columns:
-        max_length = max(len(str(cell.value or "")) for cell in col)
-        ws.column_dimensions[col[0].column_letter].width = min(max_length + 2, 50)
-
-    output_path = settings.output_dir / "risk_register.xlsx"
-    wb.save(str(output_path))
-    return output_path
+    wb = _new_workbook()
+    sheet = _StreamingSheet(wb, "Risk Register", RISK_HEADERS)
+    for risk in risks:
+        sheet.append(_risk_row(sheet, risk))
+    return _save(wb, sheet, _risk_output_path())
+
+
+async def stream_risk_register(risks: AsyncIterable) -> Path:
+    """Generate the Excel risk register from an async stream of rows."""
+    return await _stream_to_workbook("Risk Register", RISK_HEADERS, risks, _risk_row, _risk_output_path())
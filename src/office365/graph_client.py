@@ -1,15 +1,166 @@
 from __future__ import annotations
 
+import asyncio
+import email.utils
 import logging
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
 
-from src.office365.auth import get_access_token
+from src.config import get_settings
+from src.office365.auth import acquire_token
 
 logger = logging.getLogger(__name__)
 
-GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+# Throttling responses; Graph did not act on the request.
+RETRY_STATUSES = frozenset({429, 503})
+# Gateway errors can arrive after Graph acted, so only idempotent requests repeat them.
+GATEWAY_STATUSES = frozenset({502, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_limiters: dict[str, asyncio.Semaphore] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared, pooled HTTP client for Graph requests.
+
+    One client (and its connection pool) is kept per event loop, so TCP and
+    TLS setup is paid once rather than on every request.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=httpx.Timeout(settings.graph_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.graph_max_connections,
+                max_keepalive_connections=settings.graph_max_connections,
+            ),
+        )
+        _client_loop = loop
+        _limiters.clear()
+    return _client
+
+
+def set_client(client: httpx.AsyncClient) -> None:
+    """Use ``client`` for Graph requests, e.g. one wired to a mock transport."""
+    global _client, _client_loop
+    _client = client
+    _client_loop = asyncio.get_running_loop()
+    _limiters.clear()
+
+
+async def close_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+    _limiters.clear()
+
+
+def _limiter(tenant: str) -> asyncio.Semaphore:
+    if tenant not in _limiters:
+        _limiters[tenant] = asyncio.Semaphore(get_settings().graph_max_concurrency)
+    return _limiters[tenant]
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    settings = get_settings()
+    delay = min(settings.graph_backoff_max, settings.graph_backoff_base * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def graph_url(endpoint: str) -> str:
+    if endpoint.startswith(("https://", "http://")):
+        return endpoint
+    return f"{get_settings().graph_base_url}{endpoint}"
+
+
+async def send(
+    method: str,
+    url: str,
+    headers: dict[str, str] | None = None,
+    json_data: Any = None,
+    data: bytes | None = None,
+) -> httpx.Response:
+    """Send a request on the shared client with throttling-aware retries.
+
+    429 and 503 responses are retried up to ``graph_max_retries`` times, as
+    are 502 and 504 for idempotent methods (a gateway error can arrive after
+    Graph acted, so a POST is never repeated on one). Retries honour
+    ``Retry-After`` and otherwise back off exponentially with jitter.
+    Requests to one tenant share a concurrency limit so bulk work does not
+    provoke throttling in the first place.
+    """
+    settings = get_settings()
+    method = method.upper()
+    client = get_client()
+    limiter = _limiter(settings.azure_tenant_id)
+
+    attempt = 0
+    while True:
+        try:
+            async with limiter:
+                if data is not None:
+                    resp = await client.request(method, url, headers=headers, content=data)
+                else:
+                    resp = await client.request(method, url, headers=headers, json=json_data)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            error, delay = e, backoff_delay(attempt)
+        except httpx.TransportError as e:
+            # The request may have reached Graph; only repeat it if that is harmless.
+            if method not in IDEMPOTENT_METHODS:
+                raise
+            error, delay = e, backoff_delay(attempt)
+        else:
+            retryable = resp.status_code in RETRY_STATUSES or (
+                resp.status_code in GATEWAY_STATUSES and method in IDEMPOTENT_METHODS
+            )
+            if not retryable:
+                resp.raise_for_status()
+                return resp
+            error = httpx.HTTPStatusError(
+                f"Graph returned {resp.status_code} for {method} {url}", request=resp.request, response=resp
+            )
+            retry_after = _retry_after(resp)
+            delay = min(retry_after, settings.graph_backoff_max) if retry_after is not None else backoff_delay(attempt)
+
+        if attempt >= settings.graph_max_retries:
+            raise error
+        attempt += 1
+        logger.warning(f"Graph {method} {url} failed ({error}); retry {attempt} in {delay:.1f}s")
+        await asyncio.sleep(delay)
 
 
 async def graph_request(
@@ -21,7 +172,10 @@ async def graph_request(
     content_type: str | None = None,
 ) -> dict[str, Any]:
     """Make an authenticated request to Microsoft Graph API."""
-    token = get_access_token()
+    if method.upper() not in {"GET", "POST", "PUT", "PATCH", "DELETE"}:
+        raise ValueError(f"Unsupported method: {method}")
+
+    token = await acquire_token()
     req_headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": content_type or "application/json",
@@ -29,29 +183,76 @@ async def graph_request(
     if headers:
         req_headers.update(headers)
 
-    url = f"{GRAPH_BASE}{endpoint}"
-
-    async with httpx.AsyncClient() as client:
-        if method.upper() == "GET":
-            resp = await client.get(url, headers=req_headers)
-        elif method.upper() == "POST":
-            if data:
-                resp = await client.post(url, headers=req_headers, content=data)
-            else:
-                resp = await client.post(url, headers=req_headers, json=json_data)
-        elif method.upper() == "PUT":
-            if data:
-                resp = await client.put(url, headers=req_headers, content=data)
-            else:
-                resp = await client.put(url, headers=req_headers, json=json_data)
-        elif method.upper() == "PATCH":
-            resp = await client.patch(url, headers=req_headers, json=json_data)
-        elif method.upper() == "DELETE":
-            resp = await client.delete(url, headers=req_headers)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
+    resp = await send(method, graph_url(endpoint), headers=req_headers, json_data=json_data, data=data)
+    if resp.status_code == 204 or not resp.content:
+        return {}
+    return resp.json()
+
+
+async def iter_pages(endpoint: str, prefetch: bool = True) -> AsyncIterator[dict[str, Any]]:
+    """Yield every page of a Graph collection, following ``@odata.nextLink``.
+
+    With ``prefetch`` the next page is requested as soon as its link is
+    known, so it downloads while the caller processes the current one.
+    """
+    fetch: asyncio.Task | None = asyncio.create_task(graph_request("GET", endpoint))
+    try:
+        while fetch is not None:
+            page = await fetch
+            link = page.get("@odata.nextLink")
+            fetch = asyncio.create_task(graph_request("GET", link)) if link and prefetch else None
+            yield page
+            if link and fetch is None:
+                fetch = asyncio.create_task(graph_request("GET", link))
+    finally:
+        if fetch is not None and not fetch.done():
+            fetch.cancel()
+
+
+async def iter_items(endpoint: str, prefetch: bool = True) -> AsyncIterator[dict[str, Any]]:
+    """Yield every item of a paged Graph collection."""
+    async for page in iter_pages(endpoint, prefetch=prefetch):
+        for item in page.get("value", []):
+            yield item
+
+
+@asynccontextmanager
+async def open_stream(
+    url: str,
+    headers: dict[str, str] | None = None,
+    authenticated: bool = True,
+) -> AsyncIterator[httpx.Response]:
+    """GET ``url`` and hand back the response without reading its body.
 
-        resp.raise_for_status()
-        if resp.status_code == 204:
-            return {}
-        return resp.json()
+    Used for downloads: the caller iterates ``aiter_bytes()`` so the body is
+    never held in memory. Throttling responses are retried like ``send``;
+    redirects are followed (httpx drops the Authorization header when the
+    host changes). Pass ``authenticated=False`` for pre-authenticated URLs.
+    """
+    settings = get_settings()
+    headers = dict(headers or {})
+    if authenticated:
+        headers["Authorization"] = f"Bearer {await acquire_token()}"
+    client = get_client()
+    limiter = _limiter(settings.azure_tenant_id)
+    attempt = 0
+    while True:
+        async with limiter:
+            request = client.build_request("GET", url, headers=headers)
+            resp = await client.send(request, stream=True, follow_redirects=True)
+        retryable = resp.status_code in RETRY_STATUSES or resp.status_code in GATEWAY_STATUSES
+        if not retryable or attempt >= settings.graph_max_retries:
+            break
+        await resp.aclose()
+        retry_after = _retry_after(resp)
+        delay = min(retry_after, settings.graph_backoff_max) if retry_after is not None else backoff_delay(attempt)
+        attempt += 1
+        logger.warning(f"Graph GET {url} returned {resp.status_code}; retry {attempt} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    try:
+        if resp.is_error:
+            await resp.aread()
+            resp.raise_for_status()
+        yield resp
+    finally:
+        await resp.aclose()
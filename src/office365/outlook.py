@@ -4,19 +4,35 @@ import base64
 import logging
 from pathlib import Path
 
+from src.office365.batch import sub_request
 from src.office365.graph_client import graph_request
+from src.office365.upload import chunk_size, upload_chunks
 
 logger = logging.getLogger(__name__)
 
+# Graph rejects requests over 4 MB, so inline (base64) attachments must stay
+# under 3 MB; larger files go through an attachment upload session, whose
+# chunks are also capped at 4 MB.
+INLINE_ATTACHMENT_LIMIT = 3 * 1024 * 1024
+MAX_ATTACHMENT_CHUNK = 4 * 1024 * 1024
 
-async def send_email(
+
+def _attachment(path: Path) -> dict:
+    with open(path, "rb") as f:
+        content = base64.b64encode(f.read()).decode()
+    return {
+        "@odata.type": "#microsoft.graph.fileAttachment",
+        "name": path.name,
+        "contentBytes": content,
+    }
+
+
+def build_message(
     to_addresses: list[str],
     subject: str,
     body: str,
     attachments: list[Path] | None = None,
-    sender: str = "me",
 ) -> dict:
-    """Send an email via Microsoft Graph API."""
     message = {
         "subject": subject,
         "body": {"contentType": "HTML", "content": body},
@@ -26,20 +42,82 @@ async def send_email(
     }
 
     if attachments:
-        message["attachments"] = []
-        for path in attachments:
-            with open(path, "rb") as f:
-                content = base64.b64encode(f.read()).decode()
-            message["attachments"].append({
-                "@odata.type": "#microsoft.graph.fileAttachment",
-                "name": path.name,
-                "contentBytes": content,
-            })
-
-    result = await graph_request(
+        message["attachments"] = [_attachment(path) for path in attachments]
+    return message
+
+
+def send_mail_request(
+    id: str,
+    to_addresses: list[str],
+    subject: str,
+    body: str,
+    sender: str = "me",
+) -> dict:
+    """Build a ``sendMail`` sub-request for ``batch.send_batch``."""
+    return sub_request(
+        id,
         "POST",
         f"/users/{sender}/sendMail",
-        json_data={"message": message, "saveToSentItems": True},
+        body={"message": build_message(to_addresses, subject, body), "saveToSentItems": True},
+    )
+
+
+async def _attach_large(sender: str, message_id: str, path: Path) -> None:
+    session = await graph_request(
+        "POST",
+        f"/users/{sender}/messages/{message_id}/attachments/createUploadSession",
+        json_data={
+            "AttachmentItem": {"attachmentType": "file", "name": path.name, "size": path.stat().st_size},
+        },
     )
+    await upload_chunks(path, session["uploadUrl"], size=chunk_size(MAX_ATTACHMENT_CHUNK))
+
+
+async def _send_via_draft(
+    to_addresses: list[str],
+    subject: str,
+    body: str,
+    attachments: list[Path],
+    sender: str,
+) -> dict:
+    draft = await graph_request("POST", f"/users/{sender}/messages", json_data=build_message(to_addresses, subject, body))
+    try:
+        for path in attachments:
+            if path.stat().st_size > INLINE_ATTACHMENT_LIMIT:
+                await _attach_large(sender, draft["id"], path)
+            else:
+                await graph_request(
+                    "POST", f"/users/{sender}/messages/{draft['id']}/attachments", json_data=_attachment(path)
+                )
+        return await graph_request("POST", f"/users/{sender}/messages/{draft['id']}/send")
+    except Exception:
+        await graph_request("DELETE", f"/users/{sender}/messages/{draft['id']}")
+        raise
+
+
+async def send_email(
+    to_addresses: list[str],
+    subject: str,
+    body: str,
+    attachments: list[Path] | None = None,
+    sender: str = "me",
+) -> dict:
+    """Send an email via Microsoft Graph API.
+
+    Attachments totalling up to 3 MB go inline in a single ``sendMail``
+    call. Larger sets are added to a draft one at a time, with files over
+    3 MB streamed from disk through attachment upload sessions, and the
+    draft is then sent.
+    """
+    attachments = [Path(p) for p in attachments or []]
+    if sum(p.stat().st_size for p in attachments) > INLINE_ATTACHMENT_LIMIT:
+        result = await _send_via_draft(to_addresses, subject, body, attachments, sender)
+    else:
+        message = build_message(to_addresses, subject, body, attachments)
+        result = await graph_request(
+            "POST",
+            f"/users/{sender}/sendMail",
+            json_data={"message": message, "saveToSentItems": True},
+        )
     logger.info(f"Email sent to {to_addresses}")
     return result
@@ -1,57 +1,141 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-from src.office365.graph_client import graph_request
+from src.office365.graph_client import graph_request, graph_url, iter_items, open_stream
+from src.office365.upload import SIMPLE_UPLOAD_LIMIT, ProgressCallback, upload_large_file
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 async def upload_file(
     file_path: str,
     site_name: str = "",
     folder: str = "General",
+    on_progress: ProgressCallback | None = None,
 ) -> str:
-    """Upload a file to SharePoint via Microsoft Graph API."""
+    """Upload a file to SharePoint via Microsoft Graph API.
+
+    Files over 4 MB go through a resumable upload session and are streamed
+    from disk in chunks.
+    """
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    with open(path, "rb") as f:
-        content = f.read()
-
     if site_name:
-        endpoint = f"/sites/{site_name}/drive/root:/{folder}/{path.name}:/content"
+        item = f"/sites/{site_name}/drive/root:/{folder}/{path.name}"
     else:
-        endpoint = f"/me/drive/root:/{folder}/{path.name}:/content"
+        item = f"/me/drive/root:/{folder}/{path.name}"
 
-    result = await graph_request(
-        "PUT",
-        endpoint,
-        data=content,
-        content_type="application/octet-stream",
-    )
+    size = path.stat().st_size
+    if size > SIMPLE_UPLOAD_LIMIT:
+        result = await upload_large_file(path, item, on_progress=on_progress)
+    else:
+        with open(path, "rb") as f:
+            content = f.read()
+        result = await graph_request(
+            "PUT",
+            f"{item}:/content",
+            data=content,
+            content_type="application/octet-stream",
+        )
+        if on_progress:
+            on_progress(size, size)
 
     url = result.get("webUrl", "")
     logger.info(f"Uploaded {path.name} to SharePoint: {url}")
     return url
 
 
+def _item(site_name: str, path: str) -> str:
+    return f"/sites/{site_name}/drive/root:/{path}"
+
+
+def _part_sidecar(part: Path) -> Path:
+    return part.with_name(part.name + ".json")
+
+
+def _part_etag(part: Path) -> str | None:
+    """Return the eTag of the item version ``part`` was downloaded from."""
+    try:
+        return json.loads(_part_sidecar(part).read_text(encoding="utf-8")).get("eTag")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
 async def download_file(
     site_name: str,
     file_path: str,
     local_path: str,
+    on_progress: ProgressCallback | None = None,
 ) -> str:
-    """Download a file from SharePoint."""
-    endpoint = f"/sites/{site_name}/drive/root:/{file_path}:/content"
-    result = await graph_request("GET", endpoint)
-    Path(local_path).write_bytes(result)
+    """Download a file from SharePoint.
+
+    The body is streamed to ``<local_path>.part`` in chunks and renamed once
+    complete. The item's eTag is kept beside the partial file; if one is left
+    from an earlier attempt of the same version, only the remaining bytes are
+    requested, otherwise the download starts over.
+    """
+    item = await graph_request("GET", _item(site_name, file_path))
+    # The download URL is pre-authenticated and short-lived.
+    download_url = item.get("@microsoft.graph.downloadUrl")
+    url = download_url or graph_url(f"{_item(site_name, file_path)}:/content")
+    total = item.get("size")
+    etag = item.get("eTag")
+
+    target = Path(local_path)
+    part = target.with_name(target.name + ".part")
+    sidecar = _part_sidecar(part)
+    stored_etag = _part_etag(part)
+    offset = part.stat().st_size if part.exists() else 0
+    if not etag or stored_etag != etag or (total is not None and offset > total):
+        offset = 0
+    if offset and offset == total:
+        part.replace(target)
+        sidecar.unlink(missing_ok=True)
+        return local_path
+
+    headers = {}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = stored_etag
+    sidecar.write_text(json.dumps({"eTag": etag}), encoding="utf-8")
+
+    async with open_stream(url, headers=headers, authenticated=not download_url) as resp:
+        if resp.status_code != 206:
+            offset = 0  # Range ignored or the item changed: start over.
+        with open(part, "ab" if offset else "wb") as f:
+            done = offset
+            async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
+                done += len(chunk)
+                if on_progress:
+                    on_progress(done, total or done)
+
+    part.replace(target)
+    sidecar.unlink(missing_ok=True)
     return local_path
 
 
+async def iter_files(
+    site_name: str,
+    folder: str = "General",
+    page_size: int = 200,
+    prefetch: bool = True,
+) -> AsyncIterator[dict]:
+    """Yield every item in a SharePoint folder, following Graph paging."""
+    endpoint = f"{_item(site_name, folder)}:/children?$top={page_size}"
+    async for item in iter_items(endpoint, prefetch=prefetch):
+        yield item
+
+
 async def list_files(site_name: str, folder: str = "General") -> list[dict]:
     """List files in a SharePoint folder."""
-    endpoint = f"/sites/{site_name}/drive/root:/{folder}:/children"
-    result = await graph_request("GET", endpoint)
-    return result.get("value", [])
+    return [item async for item in iter_files(site_name, folder)]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 
+from src.office365.batch import sub_request
 from src.office365.graph_client import graph_request
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,32 @@ async def send_chat_message(
     return result
 
 
+def channel_message_request(
+    id: str,
+    team_id: str,
+    channel_id: str,
+    content: str,
+    content_type: str = "html",
+) -> dict:
+    """Build a channel message sub-request for ``batch.send_batch``."""
+    return sub_request(
+        id,
+        "POST",
+        f"/teams/{team_id}/channels/{channel_id}/messages",
+        body={"body": {"contentType": content_type, "content": content}},
+    )
+
+
+def chat_message_request(id: str, chat_id: str, content: str, content_type: str = "html") -> dict:
+    """Build a chat message sub-request for ``batch.send_batch``."""
+    return sub_request(
+        id,
+        "POST",
+        f"/chats/{chat_id}/messages",
+        body={"body": {"contentType": content_type, "content": content}},
+    )
+
+
 async def list_teams() -> list[dict]:
     """List teams the app has access to."""
     result = await graph_request("GET", "/me/joinedTeams")
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.config import get_settings
+from src.office365.graph_client import graph_request, send
+
+logger = logging.getLogger(__name__)
+
+# Graph requires every chunk except the last to be a multiple of 320 KiB.
+CHUNK_ALIGNMENT = 320 * 1024
+MAX_CHUNK_SIZE = 60 * 1024 * 1024
+# Simple PUT uploads are limited to 4 MB; larger files need an upload session.
+SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def chunk_size(requested: int | None = None) -> int:
+    """Round a chunk size down to a valid multiple of 320 KiB."""
+    size = requested or get_settings().graph_upload_chunk_size
+    size = min(size, MAX_CHUNK_SIZE)
+    return max(CHUNK_ALIGNMENT, size - size % CHUNK_ALIGNMENT)
+
+
+def _sidecar(path: Path) -> Path:
+    return path.with_name(path.name + ".upload.json")
+
+
+def _load_state(path: Path, endpoint: str) -> dict | None:
+    """Return the saved session for ``path`` if the file has not changed since."""
+    try:
+        state = json.loads(_sidecar(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    stat = path.stat()
+    if state.get("endpoint") != endpoint or state.get("size") != stat.st_size or state.get("mtime") != stat.st_mtime:
+        return None
+    return state
+
+
+def _save_state(path: Path, state: dict) -> None:
+    _sidecar(path).write_text(json.dumps(state), encoding="utf-8")
+
+
+def _next_offset(body: dict[str, Any]) -> int | None:
+    ranges = body.get("nextExpectedRanges") or []
+    if not ranges:
+        return None
+    return int(str(ranges[0]).split("-", 1)[0])
+
+
+async def _session_offset(upload_url: str) -> int | None:
+    """Ask Graph where an existing session should continue, or ``None`` if it has gone."""
+    try:
+        resp = await send("GET", upload_url)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+    offset = _next_offset(resp.json())
+    return 0 if offset is None else offset
+
+
+def _read_chunk(path: Path, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+async def create_upload_session(endpoint: str) -> dict[str, Any]:
+    """Start an upload session for the drive item at ``endpoint`` (a ``root:/path`` URL)."""
+    return await graph_request(
+        "POST",
+        f"{endpoint}:/createUploadSession",
+        json_data={"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+    )
+
+
+async def cancel_upload(path: str | Path) -> None:
+    """Discard the saved upload session for ``path``, if any."""
+    path = Path(path)
+    sidecar = _sidecar(path)
+    try:
+        state = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    try:
+        await send("DELETE", state["upload_url"])
+    except httpx.HTTPStatusError:
+        pass
+    sidecar.unlink(missing_ok=True)
+
+
+async def upload_large_file(
+    path: str | Path,
+    endpoint: str,
+    on_progress: ProgressCallback | None = None,
+    chunk: int | None = None,
+) -> dict[str, Any]:
+    """Upload ``path`` to the drive item at ``endpoint`` through an upload session.
+
+    The file is streamed from disk in chunks, so memory use is bounded by
+    the chunk size whatever the file size. The session URL is saved next to
+    the file; if the upload is interrupted, calling this again continues
+    from the last byte Graph received. ``on_progress(uploaded, total)`` is
+    called after each chunk.
+    Returns the created drive item.
+    """
+    path = Path(path)
+    total = path.stat().st_size
+    if total == 0:
+        raise ValueError(f"Cannot use an upload session for empty file {path}")
+    size = chunk_size(chunk)
+
+    offset = None
+    state = _load_state(path, endpoint)
+    if state:
+        offset = await _session_offset(state["upload_url"])
+        if offset is not None:
+            logger.info(f"Resuming upload of {path.name} at byte {offset}")
+    if offset is None:
+        session = await create_upload_session(endpoint)
+        stat = path.stat()
+        state = {
+            "endpoint": endpoint,
+            "upload_url": session["uploadUrl"],
+            "expires": session.get("expirationDateTime", ""),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+        _save_state(path, state)
+        offset = 0
+    resp = await upload_chunks(path, state["upload_url"], offset, size, on_progress)
+    _sidecar(path).unlink(missing_ok=True)
+    return resp.json()
+
+
+async def upload_chunks(
+    path: Path,
+    upload_url: str,
+    offset: int = 0,
+    size: int | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> httpx.Response:
+    """Send ``path`` from ``offset`` to an upload session and return the final response.
+
+    Graph only accepts a session's chunks in order, so chunks are sent one
+    at a time while the next one is read from disk.
+    """
+    total = path.stat().st_size
+    size = size or chunk_size()
+    if on_progress:
+        on_progress(offset, total)
+
+    read_ahead: asyncio.Task | None = None
+    try:
+        read_ahead = asyncio.create_task(asyncio.to_thread(_read_chunk, path, offset, size))
+        while True:
+            data = await read_ahead
+            end = offset + len(data)
+            read_ahead = None
+            if end < total:
+                read_ahead = asyncio.create_task(asyncio.to_thread(_read_chunk, path, end, size))
+
+            # The upload URL is pre-authenticated: it must not carry a bearer token.
+            try:
+                resp = await send(
+                    "PUT",
+                    upload_url,
+                    headers={"Content-Range": f"bytes {offset}-{end - 1}/{total}"},
+                    data=data,
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 416:
+                    raise
+                # Graph already has some of this range (e.g. a retried chunk landed).
+                next_offset = await _session_offset(upload_url)
+                if next_offset is None:
+                    raise
+            else:
+                # Drive sessions answer 202 until done; Outlook attachment
+                # sessions answer 200. Either way, no expected ranges = done.
+                next_offset = _next_offset(resp.json()) if resp.content else None
+                if next_offset is None and resp.status_code in (200, 201):
+                    if on_progress:
+                        on_progress(total, total)
+                    return resp
+                next_offset = end if next_offset is None else next_offset
+
+            if on_progress:
+                on_progress(next_offset, total)
+            if next_offset != end or read_ahead is None:
+                if read_ahead is not None:
+                    read_ahead.cancel()
+                read_ahead = asyncio.create_task(asyncio.to_thread(_read_chunk, path, next_offset, size))
+            offset = next_offset
+    finally:
+        if read_ahead is not None and not read_ahead.done():
+            read_ahead.cancel()
@@ -70,9 +70,8 @@ def generate_policy_document(policy) -> Path:
 
     doc.add_heading("Policy Content", level=1)
 
-    if policy.versions:
-        latest = max(policy.versions, key=lambda v: v.version_number)
-        for paragraph in latest.content.split("\n"):
+    if policy.latest_version:
+        for paragraph in policy.latest_version.content.split("\n"):
             if paragraph.strip():
                 doc.add_paragraph(paragraph.strip())
 
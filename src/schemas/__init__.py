@@ -1,15 +1,27 @@
-from src.schemas.audit import AuditCreate, AuditResponse, AuditFindingResponse
-from src.schemas.framework import FrameworkResponse, FrameworkControlResponse
-from src.schemas.risk import RiskCreate, RiskResponse, RiskMitigationCreate, RiskUpdateScore
-from src.schemas.policy import PolicyCreate, PolicyResponse, PolicyDistributeRequest
+from src.schemas.audit import AuditCreate, AuditResponse, AuditSummary, AuditFindingCreate, AuditFindingResponse
+from src.schemas.framework import (
+    FrameworkResponse, FrameworkControlResponse, ControlSearchResult, FrameworkPosture, CategoryPosture,
+    ControlPostureResponse,
+)
+from src.schemas.risk import (
+    RiskCreate, RiskResponse, RiskSummary, RiskMitigationCreate, RiskUpdateScore, RiskMatrixSummary,
+)
+from src.schemas.policy import (
+    PolicyCreate, PolicyResponse, PolicySummary, PolicyDistributeRequest, DistributionProgress, PolicyVersionResponse,
+    PolicyVersionSummary,
+)
 from src.schemas.report import ReportCreate, ReportResponse
 from src.schemas.agent import AgentExecuteRequest, AgentExecuteResponse
+from src.schemas.search import SearchResult
 
 __all__ = [
-    "AuditCreate", "AuditResponse", "AuditFindingResponse",
-    "FrameworkResponse", "FrameworkControlResponse",
-    "RiskCreate", "RiskResponse", "RiskMitigationCreate", "RiskUpdateScore",
-    "PolicyCreate", "PolicyResponse", "PolicyDistributeRequest",
+    "AuditCreate", "AuditResponse", "AuditSummary", "AuditFindingCreate", "AuditFindingResponse",
+    "FrameworkResponse", "FrameworkControlResponse", "ControlSearchResult", "FrameworkPosture", "CategoryPosture",
+    "ControlPostureResponse",
+    "RiskCreate", "RiskResponse", "RiskSummary", "RiskMitigationCreate", "RiskUpdateScore", "RiskMatrixSummary",
+    "PolicyCreate", "PolicyResponse", "PolicySummary", "PolicyDistributeRequest", "DistributionProgress",
+    "PolicyVersionResponse", "PolicyVersionSummary",
     "ReportCreate", "ReportResponse",
     "AgentExecuteRequest", "AgentExecuteResponse",
+    "SearchResult",
 ]
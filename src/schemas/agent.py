@@ -13,3 +13,5 @@ class AgentExecuteResponse(BaseModel):
     result: str
     iterations: int
     tokens_used: int
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
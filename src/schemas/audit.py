@@ -11,9 +11,18 @@ class AuditCreate(BaseModel):
     scope: str = ""
 
 
+class AuditFindingCreate(BaseModel):
+    control_id: str = ""
+    title: str
+    description: str = ""
+    severity: str = "medium"  # critical, high, medium, low, info
+    recommendation: str = ""
+
+
 class AuditFindingResponse(BaseModel):
     id: str
     control_id: str
+    framework_control_pk: str | None = None
     title: str
     description: str
     severity: str
@@ -24,7 +33,7 @@ class AuditFindingResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class AuditResponse(BaseModel):
+class AuditSummary(BaseModel):
     id: str
     title: str
     framework_id: str
@@ -33,6 +42,9 @@ class AuditResponse(BaseModel):
     summary: str
     created_at: datetime
     completed_at: datetime | None = None
-    findings: list[AuditFindingResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class AuditResponse(AuditSummary):
+    findings: list[AuditFindingResponse] = []
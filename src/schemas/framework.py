@@ -24,3 +24,60 @@ class FrameworkResponse(BaseModel):
     controls: list[FrameworkControlResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class ControlSearchResult(BaseModel):
+    id: str
+    framework_id: str
+    framework: str
+    control_id: str
+    title: str
+    description: str
+    category: str
+
+    model_config = {"from_attributes": True}
+
+
+class ControlPostureResponse(BaseModel):
+    control_id: str
+    category: str
+    critical: int
+    high: int
+    medium: int
+    low: int
+    info: int
+    open_findings: int
+    last_audit_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class CategoryPosture(BaseModel):
+    category: str
+    total_controls: int
+    controls_with_findings: int
+    critical: int
+    high: int
+    medium: int
+    low: int
+    info: int
+    open_findings: int
+    last_audit_at: datetime | None = None
+
+
+class FrameworkPosture(BaseModel):
+    framework_id: str
+    framework: str
+    total_controls: int
+    controls_with_findings: int
+    critical: int
+    high: int
+    medium: int
+    low: int
+    info: int
+    open_findings: int
+    last_audit_at: datetime | None = None
+    # The materialized rows do not cover every control; rebuild to refresh them.
+    stale: bool = False
+    categories: list[CategoryPosture] = []
+    controls: list[ControlPostureResponse] = []
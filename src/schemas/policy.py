@@ -16,10 +16,23 @@ class PolicyDistributeRequest(BaseModel):
     recipients: list[str]
 
 
-class PolicyVersionResponse(BaseModel):
+class DistributionCounts(BaseModel):
+    pending: int = 0
+    sending: int = 0
+    sent: int = 0
+    failed: int = 0
+
+
+class DistributionProgress(DistributionCounts):
+    policy_id: str
+    total: int
+    by_channel: dict[str, DistributionCounts] = {}
+    complete: bool
+
+
+class PolicyVersionSummary(BaseModel):
     id: str
     version_number: int
-    content: str
     change_summary: str
     created_by: str
     created_at: datetime
@@ -27,7 +40,11 @@ class PolicyVersionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class PolicyResponse(BaseModel):
+class PolicyVersionResponse(PolicyVersionSummary):
+    content: str
+
+
+class PolicySummary(BaseModel):
     id: str
     title: str
     framework_id: str | None = None
@@ -36,6 +53,11 @@ class PolicyResponse(BaseModel):
     current_version: int
     created_at: datetime
     updated_at: datetime
-    versions: list[PolicyVersionResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class PolicyResponse(PolicySummary):
+    latest_version: PolicyVersionResponse | None = None
+    # Version history without the text; fetch a version's text from /versions/{n}.
+    versions: list[PolicyVersionSummary] = []
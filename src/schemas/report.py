@@ -20,6 +20,7 @@ class ReportResponse(BaseModel):
     file_path: str
     source_id: str
     status: str
+    error: str = ""
     created_at: datetime
 
     model_config = {"from_attributes": True}
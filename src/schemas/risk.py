@@ -37,7 +37,7 @@ class RiskMitigationResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class RiskResponse(BaseModel):
+class RiskSummary(BaseModel):
     id: str
     title: str
     description: str
@@ -49,6 +49,21 @@ class RiskResponse(BaseModel):
     owner: str
     created_at: datetime
     updated_at: datetime
-    mitigations: list[RiskMitigationResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class RiskResponse(RiskSummary):
+    mitigations: list[RiskMitigationResponse] = []
+
+
+class RiskMatrixCell(BaseModel):
+    likelihood: int
+    impact: int
+    count: int
+    score_sum: int
+
+
+class RiskMatrixSummary(BaseModel):
+    matrix: list[list[RiskMatrixCell]]  # [impact - 1][likelihood - 1]
+    total: int
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    kind: str  # policy, finding, risk
+    id: str
+    parent_id: str | None = None  # policy id for policy versions, audit id for findings
+    title: str
+    snippet: str
+    rank: float  # BM25, lower is better; only comparable between results of the same kind
+
+    model_config = {"from_attributes": True}
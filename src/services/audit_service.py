@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import datetime
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
+from src.frameworks.index import FrameworkIndex, get_index
 from src.models.audit import Audit, AuditFinding
-from src.schemas.audit import AuditCreate
+from src.schemas.audit import AuditCreate, AuditFindingCreate
+from src.services import posture_service
+from src.services.changes import mark_changed
+from src.services.pagination import STREAM_BATCH_SIZE, Page, paginate
 
 
 async def create_audit(db: AsyncSession, data: AuditCreate) -> Audit:
@@ -19,6 +25,7 @@ async def create_audit(db: AsyncSession, data: AuditCreate) -> Audit:
     )
     db.add(audit)
     await db.commit()
+    mark_changed("audits")
     return await get_audit(db, audit.id)
 
 
@@ -29,15 +36,57 @@ async def list_audits(db: AsyncSession) -> list[Audit]:
     return list(result.scalars().all())
 
 
-async def get_audit(db: AsyncSession, audit_id: str) -> Audit | None:
-    result = await db.execute(
-        select(Audit)
-        .options(selectinload(Audit.findings))
-        .where(Audit.id == audit_id)
-    )
+async def list_audits_page(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    columns: list[str] | None = None,
+    include_findings: bool = False,
+    with_total: bool = False,
+) -> Page[Audit]:
+    """List audits newest first, one keyset page at a time.
+
+    Findings are only loaded when ``include_findings`` is set, and ``columns``
+    restricts which audit columns are fetched.
+    """
+    stmt = select(Audit)
+    if columns:
+        stmt = stmt.options(load_only(*(getattr(Audit, c) for c in columns)))
+    if include_findings:
+        stmt = stmt.options(selectinload(Audit.findings))
+    return await paginate(db, stmt, Audit.created_at, Audit.id, limit, cursor, with_total=with_total)
+
+
+async def get_audit(db: AsyncSession, audit_id: str, with_findings: bool = True) -> Audit | None:
+    stmt = select(Audit).where(Audit.id == audit_id)
+    if with_findings:
+        stmt = stmt.options(selectinload(Audit.findings))
+    result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def stream_findings(db: AsyncSession, audit_id: str) -> AsyncIterator[Row]:
+    """Yield an audit's findings as plain rows, streamed in batches for exports."""
+    result = await db.stream(
+        select(
+            AuditFinding.id, AuditFinding.control_id, AuditFinding.title, AuditFinding.description,
+            AuditFinding.severity, AuditFinding.status, AuditFinding.recommendation,
+        )
+        .where(AuditFinding.audit_id == audit_id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for row in result:
+        yield row
+
+
+def _control_pk(index: FrameworkIndex, framework_id: str | None, control_id: str) -> str | None:
+    """Resolve a finding's free-text ``control_id`` to the framework control's key."""
+    if not framework_id or not control_id:
+        return None
+    control = index.control(framework_id, control_id)
+    return control.id if control else None
+
+
 async def add_finding(
     db: AsyncSession,
     audit_id: str,
@@ -47,20 +96,83 @@ async def add_finding(
     severity: str,
     recommendation: str,
 ) -> AuditFinding:
+    framework_id = await db.scalar(select(Audit.framework_id).where(Audit.id == audit_id))
     finding = AuditFinding(
         audit_id=audit_id,
         control_id=control_id,
+        framework_control_pk=_control_pk(await get_index(db), framework_id, control_id),
         title=title,
         description=description,
         severity=severity,
         recommendation=recommendation,
     )
     db.add(finding)
+    await db.flush()
+    if framework_id:
+        await posture_service.refresh_controls(db, framework_id, [control_id])
     await db.commit()
+    mark_changed("audit_findings", "control_posture")
     await db.refresh(finding)
     return finding
 
 
+BULK_BATCH_SIZE = 1000
+
+
+async def _iterate(items: Iterable | AsyncIterable):
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def add_findings_bulk(
+    db: AsyncSession,
+    audit_id: str,
+    findings: Iterable[AuditFindingCreate] | AsyncIterable[AuditFindingCreate],
+) -> int:
+    """Insert many findings for one audit in a single transaction.
+
+    Rows are written with multi-row INSERTs of ``BULK_BATCH_SIZE`` and
+    committed once, so memory stays bounded for streamed input and the whole
+    import is one fsync. Nothing is kept if any finding fails.
+    """
+    audit = await db.get(Audit, audit_id)
+    if audit is None:
+        raise ValueError(f"Audit {audit_id} not found")
+
+    index = await get_index(db)
+    inserted = 0
+    batch: list[dict] = []
+    touched: set[str] = set()
+    try:
+        async for finding in _iterate(findings):
+            batch.append({
+                "audit_id": audit_id,
+                "framework_control_pk": _control_pk(index, audit.framework_id, finding.control_id),
+                **finding.model_dump(),
+            })
+            touched.add(finding.control_id)
+            if len(batch) >= BULK_BATCH_SIZE:
+                await db.execute(insert(AuditFinding), batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            await db.execute(insert(AuditFinding), batch)
+            inserted += len(batch)
+        await posture_service.refresh_controls(db, audit.framework_id, touched)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    # Core inserts bypass the identity map; drop any stale loaded collection.
+    db.expire(audit, ["findings"])
+    mark_changed("audit_findings", "control_posture")
+    return inserted
+
+
 async def complete_audit(db: AsyncSession, audit_id: str, summary: str) -> Audit | None:
     audit = await get_audit(db, audit_id)
     if not audit:
@@ -68,5 +180,68 @@ async def complete_audit(db: AsyncSession, audit_id: str, summary: str) -> Audit
     audit.status = "completed"
     audit.summary = summary
     audit.completed_at = datetime.datetime.now(datetime.UTC)
+    # The completion date becomes the last audit date of every control it touched.
+    await posture_service.refresh_for_audit(db, audit_id)
     await db.commit()
+    mark_changed("audits", "control_posture")
     return await get_audit(db, audit_id)
+
+
+LINK_BATCH_SIZE = 1000
+
+
+async def link_findings(
+    db: AsyncSession, framework_id: str | None = None, batch_size: int = LINK_BATCH_SIZE
+) -> dict:
+    """Resolve ``framework_control_pk`` for findings that do not have one yet.
+
+    Findings are walked in primary-key order, ``batch_size`` at a time, and
+    each batch is committed on its own so the job can run against a large
+    table alongside other writers. Returns the number of findings linked
+    and, per framework and ``control_id``, how many still match no control.
+    """
+    index = await get_index(db)
+    linked = 0
+    unmatched: Counter[tuple[str, str]] = Counter()
+    relinked: set[str] = set()
+    last_id = ""
+    while True:
+        stmt = (
+            select(AuditFinding.id, AuditFinding.control_id, Audit.framework_id)
+            .join(Audit, Audit.id == AuditFinding.audit_id)
+            .where(AuditFinding.framework_control_pk.is_(None), AuditFinding.id > last_id)
+            .order_by(AuditFinding.id)
+            .limit(batch_size)
+        )
+        if framework_id:
+            stmt = stmt.where(Audit.framework_id == framework_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for id, control_id, fid in rows:
+            pk = _control_pk(index, fid, control_id)
+            if pk:
+                updates.append({"id": id, "framework_control_pk": pk})
+                relinked.add(fid)
+            elif control_id:
+                unmatched[(fid, control_id)] += 1
+        if updates:
+            await db.execute(update(AuditFinding), updates)
+            await db.commit()
+            linked += len(updates)
+
+    if linked:
+        mark_changed("audit_findings")
+        for fid in relinked:
+            await posture_service.rebuild(db, fid)
+    names = {fw.id: fw.name for fw in index.frameworks}
+    return {
+        "linked": linked,
+        "unmatched": [
+            {"framework": names.get(fid, fid), "control_id": control_id, "findings": count}
+            for (fid, control_id), count in unmatched.most_common()
+        ],
+    }
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+# Per-table write counters, bumped by the service layer whenever it commits a
+# change. Caches built from table contents key themselves on these counters
+# and are rebuilt only when one of the tables they read from has changed.
+_versions: defaultdict[str, int] = defaultdict(int)
+
+
+def mark_changed(*tables: str) -> None:
+    """Record that the service layer wrote to ``tables``."""
+    for table in tables:
+        _versions[table] += 1
+
+
+def table_versions(*tables: str) -> tuple[int, ...]:
+    """Return the current write counters for ``tables``."""
+    return tuple(_versions[table] for table in tables)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import datetime
+import html
+import logging
+import uuid
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.config import get_settings
+from src.models.policy import Policy, PolicyDistribution, PolicyVersion
+from src.services.changes import mark_changed
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("email", "teams", "sharepoint")
+BATCHED_CHANNELS = ("email", "teams")
+SHAREPOINT_FOLDER = "Policies"
+STATUSES = ("pending", "sending", "sent", "failed")
+
+
+def _now() -> datetime.datetime:
+    """Current UTC time as a naive datetime, matching how the DateTime columns store it."""
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+def _message(policy: Policy, content: str) -> tuple[str, str]:
+    subject = f"Policy: {policy.title} (v{policy.current_version})"
+    body = f"<h2>{html.escape(policy.title)}</h2><pre>{html.escape(content)}</pre>"
+    return subject, body
+
+
+def _sub_request(dist: PolicyDistribution, subject: str, body: str, sender: str) -> dict:
+    from src.office365.outlook import send_mail_request
+    from src.office365.teams import channel_message_request, chat_message_request
+
+    if dist.channel == "email":
+        return send_mail_request(dist.id, [dist.recipient], subject, body, sender=sender)
+    # Teams recipients are "<team-id>/<channel-id>" for channels, or a chat id.
+    if "/" in dist.recipient:
+        team_id, channel_id = dist.recipient.split("/", 1)
+        return channel_message_request(dist.id, team_id, channel_id, body)
+    return chat_message_request(dist.id, dist.recipient, body)
+
+
+async def _latest_content(db: AsyncSession, policy: Policy) -> str:
+    result = await db.execute(
+        select(PolicyVersion.content)
+        .where(
+            PolicyVersion.policy_id == policy.id,
+            PolicyVersion.version_number == policy.current_version,
+        )
+    )
+    return result.scalar_one_or_none() or ""
+
+
+def _sent(when: datetime.datetime) -> dict:
+    """Column values for a delivered row; see ``_record``."""
+    return {"status": "sent", "sent_at": when, "error": "", "lease_owner": None, "lease_expires_at": None}
+
+
+def _failed(dist: PolicyDistribution, error: str, retryable: bool = True) -> dict:
+    """Reschedule ``dist`` with backoff, or fail it for good once out of attempts."""
+    from src.office365.graph_client import backoff_delay
+
+    logger.error(f"Distribution {dist.id} to {dist.recipient} failed (attempt {dist.attempts}): {error}")
+    outcome = {"error": error, "lease_owner": None, "lease_expires_at": None}
+    if retryable and dist.attempts < get_settings().distribution_max_attempts:
+        delay = datetime.timedelta(seconds=backoff_delay(dist.attempts))
+        return {**outcome, "status": "pending", "next_attempt_at": _now() + delay}
+    return {**outcome, "status": "failed"}
+
+
+async def _record(db: AsyncSession, dist: PolicyDistribution, outcome: dict) -> bool:
+    """Write ``outcome`` if ``dist`` is still leased to this caller.
+
+    A lease that expired mid-send may already belong to another worker; its
+    result then wins and this one is dropped.
+    """
+    result = await db.execute(
+        update(PolicyDistribution)
+        .where(PolicyDistribution.id == dist.id, PolicyDistribution.lease_owner == dist.lease_owner)
+        .values(**outcome)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        logger.warning(f"Distribution {dist.id} lost its lease before its outcome was recorded")
+        return False
+    for key, value in outcome.items():
+        set_committed_value(dist, key, value)
+    return True
+
+
+async def _send_sharepoint(db: AsyncSession, policy: Policy, dists: list[PolicyDistribution]) -> dict[str, dict]:
+    from src.office365.sharepoint import upload_file
+    from src.services.render_service import render_document
+
+    outcomes = {}
+    path = await render_document(db, "policy_document", "docx", policy.id)
+    for dist in dists:
+        try:
+            await upload_file(str(path), site_name=dist.recipient, folder=SHAREPOINT_FOLDER)
+        except Exception as e:
+            outcomes[dist.id] = _failed(dist, str(e))
+        else:
+            outcomes[dist.id] = _sent(_now())
+    return outcomes
+
+
+def _claimable(now: datetime.datetime):
+    return or_(
+        and_(
+            PolicyDistribution.status == "pending",
+            or_(PolicyDistribution.next_attempt_at.is_(None), PolicyDistribution.next_attempt_at <= now),
+        ),
+        # A worker that died mid-send leaves its lease to expire.
+        and_(PolicyDistribution.status == "sending", PolicyDistribution.lease_expires_at < now),
+    )
+
+
+async def claim(
+    db: AsyncSession, channel: str, limit: int, policy_id: str | None = None
+) -> list[PolicyDistribution]:
+    """Lease up to ``limit`` due rows on ``channel`` for this caller.
+
+    The rows are marked ``sending`` with a fresh lease token in a single
+    ``UPDATE``, so concurrent workers (in this or another process) never
+    pick up the same row. Rows whose lease expired are claimable again.
+    """
+    now = _now()
+    token = str(uuid.uuid4())
+    due = (
+        select(PolicyDistribution.id)
+        .where(PolicyDistribution.channel == channel, _claimable(now))
+        .order_by(PolicyDistribution.created_at, PolicyDistribution.id)
+        .limit(limit)
+    )
+    if policy_id:
+        due = due.where(PolicyDistribution.policy_id == policy_id)
+    result = await db.execute(
+        update(PolicyDistribution)
+        .where(PolicyDistribution.id.in_(due.scalar_subquery()), _claimable(now))
+        .values(
+            status="sending",
+            lease_owner=token,
+            lease_expires_at=now + datetime.timedelta(seconds=get_settings().distribution_lease_seconds),
+            attempts=PolicyDistribution.attempts + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if not result.rowcount:
+        return []
+    claimed = await db.execute(
+        select(PolicyDistribution)
+        .where(PolicyDistribution.lease_owner == token)
+        .execution_options(populate_existing=True)
+    )
+    return list(claimed.scalars())
+
+
+async def deliver(db: AsyncSession, dists: list[PolicyDistribution], sender: str = "me") -> None:
+    """Send claimed rows and record the outcome on each one.
+
+    Email and Teams rows are sent through Graph ``$batch`` (up to 20 per
+    request); each sub-response sets that row's ``status`` and ``sent_at``.
+    SharePoint rows upload the rendered policy document to the named site.
+    Throttling and transport errors reschedule a row; other errors fail it.
+    Outcomes are only written for rows whose lease this caller still holds.
+    """
+    from src.office365.batch import error_message, send_batch, succeeded
+    from src.office365.graph_client import RETRY_STATUSES
+
+    by_policy: dict[str, list[PolicyDistribution]] = {}
+    for dist in dists:
+        by_policy.setdefault(dist.policy_id, []).append(dist)
+
+    outcomes: dict[str, dict] = {}
+    requests, batched = [], {}
+    for pid, rows in by_policy.items():
+        policy = await db.get(Policy, pid)
+        if policy is None:
+            for dist in rows:
+                outcomes[dist.id] = _failed(dist, f"Policy {pid} not found", retryable=False)
+            continue
+        subject, body = _message(policy, await _latest_content(db, policy))
+        for dist in rows:
+            if dist.channel in BATCHED_CHANNELS:
+                requests.append(_sub_request(dist, subject, body, sender))
+                batched[dist.id] = dist
+            elif dist.channel != "sharepoint":
+                outcomes[dist.id] = _failed(dist, f"Unknown channel {dist.channel!r}", retryable=False)
+        sharepoint = [d for d in rows if d.channel == "sharepoint"]
+        if sharepoint:
+            outcomes.update(await _send_sharepoint(db, policy, sharepoint))
+
+    if requests:
+        try:
+            responses = await send_batch(requests)
+        except Exception as e:
+            for dist in batched.values():
+                outcomes[dist.id] = _failed(dist, str(e))
+        else:
+            now = _now()
+            for id, resp in responses.items():
+                if succeeded(resp):
+                    outcomes[id] = _sent(now)
+                else:
+                    outcomes[id] = _failed(
+                        batched[id], error_message(resp), retryable=resp.get("status") in RETRY_STATUSES
+                    )
+
+    for dist in dists:
+        if dist.id in outcomes:
+            await _record(db, dist, outcomes[dist.id])
+    await db.commit()
+    mark_changed("policy_distributions")
+
+
+async def send_pending(db: AsyncSession, policy_id: str | None = None, sender: str = "me") -> dict[str, int]:
+    """Deliver every due distribution now, without the background workers.
+
+    Returns the number of rows sent and failed; rows rescheduled for a
+    later attempt count as neither.
+    """
+    settings = get_settings()
+    outcome = {"sent": 0, "failed": 0}
+    for channel in CHANNELS:
+        while dists := await claim(db, channel, settings.distribution_batch_size, policy_id):
+            await deliver(db, dists, sender)
+            for dist in dists:
+                if dist.status in outcome:
+                    outcome[dist.status] += 1
+    return outcome
+
+
+async def get_progress(db: AsyncSession, policy_id: str) -> dict:
+    """Count a policy's distributions by status, overall and per channel."""
+    result = await db.execute(
+        select(PolicyDistribution.channel, PolicyDistribution.status, func.count())
+        .where(PolicyDistribution.policy_id == policy_id)
+        .group_by(PolicyDistribution.channel, PolicyDistribution.status)
+    )
+    totals = dict.fromkeys(STATUSES, 0)
+    by_channel: dict[str, dict[str, int]] = {}
+    for channel, status, count in result:
+        totals[status] = totals.get(status, 0) + count
+        by_channel.setdefault(channel, dict.fromkeys(STATUSES, 0))[status] = count
+    total = sum(totals.values())
+    return {
+        "policy_id": policy_id,
+        "total": total,
+        **totals,
+        "by_channel": by_channel,
+        "complete": totals["pending"] + totals["sending"] == 0,
+    }
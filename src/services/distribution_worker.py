@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from src.config import get_settings
+from src.services import distribution_service
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Rate limiter allowing ``rate`` sends per second with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> int:
+        self._refill()
+        return int(self.tokens)
+
+    async def acquire(self, n: int = 1) -> None:
+        async with self._lock:
+            self._refill()
+            if self.tokens < n:
+                await asyncio.sleep((n - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= n
+
+    def release(self, n: int) -> None:
+        """Return tokens acquired for sends that did not happen."""
+        self.tokens = min(self.burst, self.tokens + n)
+
+
+class DistributionWorkers:
+    """Coroutines that drain the ``policy_distributions`` queue.
+
+    Each worker takes tokens from a channel's rate limit, then leases at most
+    that many due rows and sends them, so a lease never waits on the rate
+    limit. Leasing happens in the database, so several API processes can
+    run workers against the same table.
+    """
+
+    def __init__(self, session_factory, workers: int | None = None, policy_id: str | None = None):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.workers = settings.distribution_workers if workers is None else workers
+        self.policy_id = policy_id
+        batch = settings.distribution_batch_size
+        self.buckets = {
+            "email": TokenBucket(settings.distribution_rate_email, batch),
+            "teams": TokenBucket(settings.distribution_rate_teams, batch),
+            "sharepoint": TokenBucket(settings.distribution_rate_sharepoint, batch),
+        }
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Check the queue now instead of at the next poll."""
+        self._wake.set()
+
+    async def _run_once(self) -> bool:
+        """Claim and send one batch per channel; return whether any work was done."""
+        settings = get_settings()
+        worked = False
+        for channel, bucket in self.buckets.items():
+            limit = max(1, min(settings.distribution_batch_size, bucket.available()))
+            # Wait for the rate limit before leasing, so the wait does not eat into the lease.
+            await bucket.acquire(limit)
+            async with self.session_factory() as db:
+                dists = await distribution_service.claim(db, channel, limit, self.policy_id)
+                bucket.release(limit - len(dists))
+                if not dists:
+                    continue
+                await distribution_service.deliver(db, dists)
+            worked = True
+        return worked
+
+    async def _worker(self, n: int) -> None:
+        poll = get_settings().distribution_poll_interval
+        while True:
+            try:
+                if await self._run_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Distribution worker {n} failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=poll)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+
+_workers: DistributionWorkers | None = None
+
+
+def start_workers(session_factory) -> DistributionWorkers | None:
+    """Start the background distribution workers if Graph is configured."""
+    global _workers
+    settings = get_settings()
+    if _workers is not None or settings.distribution_workers <= 0 or not settings.azure_client_id:
+        return _workers
+    _workers = DistributionWorkers(session_factory)
+    _workers.start()
+    logger.info(f"Started {_workers.workers} policy distribution workers")
+    return _workers
+
+
+async def stop_workers() -> None:
+    global _workers
+    if _workers is not None:
+        await _workers.stop()
+        _workers = None
+
+
+def wake() -> None:
+    if _workers is not None:
+        _workers.wake()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import logging
 from pathlib import Path
 
-import yaml
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.frameworks.registry import load_yaml
+from src.models.audit import Audit, AuditFinding
 from src.models.framework import ComplianceFrameworkModel, FrameworkControl
+from src.services import posture_service
+from src.services.changes import mark_changed
+
+logger = logging.getLogger(__name__)
 
 
 async def list_frameworks(db: AsyncSession) -> list[ComplianceFrameworkModel]:
@@ -35,39 +42,148 @@ async def get_framework_by_name(db: AsyncSession, name: str) -> ComplianceFramew
     return result.scalar_one_or_none()
 
 
-async def import_framework(db: AsyncSession, yaml_path: Path) -> ComplianceFrameworkModel:
-    with open(yaml_path) as f:
-        data = yaml.safe_load(f)
+def _control_fields(ctrl: dict) -> dict:
+    return {
+        "title": ctrl["title"],
+        "description": ctrl.get("description", ""),
+        "category": ctrl.get("category", ""),
+    }
+
+
+async def _upsert_controls(db: AsyncSession, framework_id: str, controls: list[dict]) -> tuple[int, int, int]:
+    """Apply only the control changes between the database and the file.
+
+    Returns the number of controls added, updated and removed.
+    """
+    result = await db.execute(select(FrameworkControl).where(FrameworkControl.framework_id == framework_id))
+    existing = {c.control_id: c for c in result.scalars()}
+    incoming = {ctrl["id"]: _control_fields(ctrl) for ctrl in controls}
+
+    added = updated = removed = 0
+    for control_id, fields in incoming.items():
+        control = existing.get(control_id)
+        if control is None:
+            db.add(FrameworkControl(framework_id=framework_id, control_id=control_id, **fields))
+            added += 1
+        elif any(getattr(control, k) != v for k, v in fields.items()):
+            for k, v in fields.items():
+                setattr(control, k, v)
+            updated += 1
+    gone = [control for control_id, control in existing.items() if control_id not in incoming]
+    if gone:
+        # Unlink findings explicitly; SQLite does not enforce ON DELETE SET NULL by default.
+        await db.execute(
+            update(AuditFinding)
+            .where(AuditFinding.framework_control_pk.in_([c.id for c in gone]))
+            .values(framework_control_pk=None)
+            .execution_options(synchronize_session=False)
+        )
+    for control in gone:
+        await db.delete(control)
+        removed += 1
+    if added:
+        await db.flush()
+        await _link_new_controls(db, framework_id)
+    return added, updated, removed
+
+
+async def _link_new_controls(db: AsyncSession, framework_id: str) -> None:
+    """Link the framework's unlinked findings to controls that now match them."""
+    await db.execute(
+        update(AuditFinding)
+        .where(
+            AuditFinding.framework_control_pk.is_(None),
+            AuditFinding.audit_id.in_(select(Audit.id).where(Audit.framework_id == framework_id)),
+        )
+        .values(framework_control_pk=(
+            select(FrameworkControl.id)
+            .where(FrameworkControl.framework_id == framework_id, FrameworkControl.control_id == AuditFinding.control_id)
+            .limit(1)
+            .scalar_subquery()
+        ))
+        .execution_options(synchronize_session=False)
+    )
 
-    existing = await get_framework_by_name(db, data["name"])
-    if existing:
-        return existing
 
-    framework = ComplianceFrameworkModel(
-        name=data["name"],
-        version=data.get("version", "1.0"),
-        description=data.get("description", ""),
-    )
-    db.add(framework)
+async def _sync_file(db: AsyncSession, path: Path, known: ComplianceFrameworkModel | None) -> tuple[str, str]:
+    """Bring the framework imported from ``path`` up to date with the file.
+
+    Returns the framework id and what happened: ``unchanged``, ``moved``,
+    ``created`` or ``updated``.
+    """
+    stat = path.stat()
+    if known is not None and known.source_mtime == stat.st_mtime and known.source_size == stat.st_size:
+        return known.id, "unchanged"
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    action = "unchanged"
+    if known is None:
+        # The same file may have been imported before from a path that no longer exists.
+        moved = (await db.execute(
+            select(ComplianceFrameworkModel).where(ComplianceFrameworkModel.source_hash == digest).limit(1)
+        )).scalar_one_or_none()
+        if moved is not None and not Path(moved.source_path).exists():
+            known, action = moved, "moved"
+    if known is not None and known.source_hash == digest:
+        known.source_path, known.source_mtime, known.source_size = str(path), stat.st_mtime, stat.st_size
+        await db.commit()
+        return known.id, action
+
+    data = load_yaml(path, raw, digest)
+    framework = known or (await db.execute(
+        select(ComplianceFrameworkModel).where(ComplianceFrameworkModel.name == data["name"])
+    )).scalar_one_or_none()
+
+    action = "updated"
+    if framework is None:
+        framework = ComplianceFrameworkModel(name=data["name"])
+        db.add(framework)
+        action = "created"
+    framework.name = data["name"]
+    framework.version = data.get("version", "1.0")
+    framework.description = data.get("description", "")
+    framework.source_path = str(path)
+    framework.source_hash = digest
+    framework.source_mtime = stat.st_mtime
+    framework.source_size = stat.st_size
     await db.flush()
 
-    for ctrl in data.get("controls", []):
-        control = FrameworkControl(
-            framework_id=framework.id,
-            control_id=ctrl["id"],
-            title=ctrl["title"],
-            description=ctrl.get("description", ""),
-            category=ctrl.get("category", ""),
-        )
-        db.add(control)
-
+    added, updated, removed = await _upsert_controls(db, framework.id, data.get("controls", []))
+    if added or updated or removed:
+        await db.flush()
+        await posture_service.refresh_controls(db, framework.id)
     await db.commit()
-    return await get_framework(db, framework.id)
+    mark_changed("compliance_frameworks", "framework_controls", "audit_findings", "control_posture")
+    logger.info(f"{action.title()} framework {framework.name} from {path.name}: "
+                f"{added} controls added, {updated} updated, {removed} removed")
+    return framework.id, action
 
 
-async def import_all_frameworks(db: AsyncSession, frameworks_dir: Path) -> list[ComplianceFrameworkModel]:
-    imported = []
+async def import_framework(db: AsyncSession, yaml_path: Path) -> ComplianceFrameworkModel:
+    """Import a framework YAML file, applying any changes since the last import."""
+    path = Path(yaml_path).resolve()
+    known = (await db.execute(
+        select(ComplianceFrameworkModel).where(ComplianceFrameworkModel.source_path == str(path))
+    )).scalar_one_or_none()
+    framework_id, _ = await _sync_file(db, path, known)
+    return await get_framework(db, framework_id)
+
+
+async def import_all_frameworks(db: AsyncSession, frameworks_dir: Path) -> dict[str, int]:
+    """Sync every YAML file in ``frameworks_dir`` and count what changed.
+
+    The manifest of previously imported files is read in one query; files
+    whose size and mtime are unchanged are skipped without being read, so
+    a warm start costs one ``stat`` per file.
+    """
+    result = await db.execute(
+        select(ComplianceFrameworkModel).where(ComplianceFrameworkModel.source_path.is_not(None))
+    )
+    manifest = {fw.source_path: fw for fw in result.scalars()}
+    counts = {"created": 0, "updated": 0, "moved": 0, "unchanged": 0}
     for yaml_file in sorted(frameworks_dir.glob("*.yaml")):
-        fw = await import_framework(db, yaml_file)
-        imported.append(fw)
-    return imported
+        path = yaml_file.resolve()
+        _, action = await _sync_file(db, path, manifest.get(str(path)))
+        counts[action] += 1
+    return counts
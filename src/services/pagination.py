@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, and_, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.types import NullType
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+# Rows per server-side cursor fetch for unbounded exports (``yield_per``).
+STREAM_BATCH_SIZE = 1000
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+    total: int | None = None  # rows across all pages, when requested
+
+
+def _encode_sort_value(value: Any) -> Any:
+    # SQLite hands back stored strings, but drivers such as asyncpg return
+    # datetime objects; tag those so they survive the JSON round trip.
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode_sort_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if value.keys() == {"dt"}:
+            return datetime.fromisoformat(value["dt"])
+        if value.keys() == {"date"}:
+            return date.fromisoformat(value["date"])
+        raise ValueError(f"Unknown cursor sort value: {value!r}")
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: str) -> str:
+    raw = json.dumps([_encode_sort_value(sort_value), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, str]:
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        sort_value = _decode_sort_value(sort_value)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(row_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return sort_value, row_id
+
+
+def _as_stored(column: InstrumentedAttribute):
+    # The column without type conversion, so a sort value read from one page
+    # compares exactly as stored when bound into the next page's query (e.g.
+    # SQLite datetimes written with and without microseconds).
+    return type_coerce(column, NullType())
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    with_total: bool = False,
+) -> Page:
+    """Return one page of ``stmt`` ordered by ``(sort_column, id) DESC``.
+
+    Keyset pagination: the cursor carries the sort value and id of the last
+    row of the previous page, and the next page starts strictly after that
+    key. Rows deleted or re-sorted since the previous page do not affect
+    where the next one starts. With ``with_total`` the page also carries the
+    number of rows ``stmt`` matches across all pages.
+    """
+    total = None
+    if with_total:
+        total = (await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))).scalar_one()
+    sort_key = _as_stored(sort_column)
+    if cursor:
+        after_sort, after_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            sort_key < after_sort,
+            and_(sort_key == after_sort, id_column < after_id),
+        ))
+    stmt = (
+        stmt.add_columns(sort_key.label("cursor_sort"))
+        .order_by(sort_column.desc(), id_column.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_sort = rows[-1]
+        next_cursor = encode_cursor(last_sort, getattr(last, id_column.key))
+    return Page(items=[row[0] for row in rows], next_cursor=next_cursor, total=total)
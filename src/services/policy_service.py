@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from src.config import get_settings
 from src.models.policy import Policy, PolicyDistribution, PolicyVersion
 from src.schemas.policy import PolicyCreate
+from src.services import version_store
+from src.services.changes import mark_changed
+from src.services.pagination import Page, paginate
 
 
 async def create_policy(db: AsyncSession, data: PolicyCreate, content: str = "") -> Policy:
@@ -25,22 +30,49 @@ async def create_policy(db: AsyncSession, data: PolicyCreate, content: str = "")
     )
     db.add(version)
     await db.commit()
+    mark_changed("policies", "policy_versions")
     return await get_policy(db, policy.id)
 
 
 async def list_policies(db: AsyncSession) -> list[Policy]:
+    """List policies with their current version, but not their history."""
     result = await db.execute(
         select(Policy)
-        .options(selectinload(Policy.versions), selectinload(Policy.distributions))
+        .options(selectinload(Policy.latest_version), selectinload(Policy.distributions))
         .order_by(Policy.updated_at.desc())
     )
     return list(result.scalars().all())
 
 
+async def list_policies_page(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    columns: list[str] | None = None,
+    include_versions: bool = False,
+    with_total: bool = False,
+) -> Page[Policy]:
+    """List policies most recently updated first, one keyset page at a time.
+
+    Versions are only loaded when ``include_versions`` is set, and
+    ``columns`` restricts which policy columns are fetched.
+    """
+    stmt = select(Policy)
+    if columns:
+        stmt = stmt.options(load_only(*(getattr(Policy, c) for c in columns)))
+    if include_versions:
+        stmt = stmt.options(selectinload(Policy.versions), selectinload(Policy.latest_version))
+    return await paginate(db, stmt, Policy.updated_at, Policy.id, limit, cursor, with_total=with_total)
+
+
 async def get_policy(db: AsyncSession, policy_id: str) -> Policy | None:
     result = await db.execute(
         select(Policy)
-        .options(selectinload(Policy.versions), selectinload(Policy.distributions))
+        .options(
+            selectinload(Policy.versions),
+            selectinload(Policy.latest_version),
+            selectinload(Policy.distributions),
+        )
         .where(Policy.id == policy_id)
     )
     return result.scalar_one_or_none()
@@ -52,13 +84,38 @@ async def approve_policy(db: AsyncSession, policy_id: str) -> Policy | None:
         return None
     policy.status = "approved"
     await db.commit()
+    mark_changed("policies")
     return await get_policy(db, policy_id)
 
 
+def _archive(version: PolicyVersion, newer: str) -> None:
+    """Move a superseded version's text out of ``content``.
+
+    Every ``policy_snapshot_interval``-th version keeps a compressed full
+    copy; the others keep a compressed diff against ``newer``, the next
+    version's text. The text stays in the rebuilt-version cache.
+    """
+    text = version.content
+    if version_store.is_snapshot(version.version_number):
+        version.encoding, version.data = version_store.SNAPSHOT, version_store.compress(text)
+    else:
+        version.encoding, version.data = version_store.DELTA, version_store.make_delta(newer, text)
+    version.content = ""
+    version_store.texts.put(version.id, text)
+
+
 async def add_version(db: AsyncSession, policy_id: str, content: str, summary: str) -> PolicyVersion:
-    policy = await get_policy(db, policy_id)
+    policy = await db.get(Policy, policy_id)
     if not policy:
         raise ValueError(f"Policy {policy_id} not found")
+    previous = (await db.execute(
+        select(PolicyVersion).where(
+            PolicyVersion.policy_id == policy_id,
+            PolicyVersion.version_number == policy.current_version,
+        )
+    )).scalar_one_or_none()
+    if previous is not None and previous.encoding == version_store.FULL:
+        _archive(previous, content)
     new_version = policy.current_version + 1
     policy.current_version = new_version
     version = PolicyVersion(
@@ -69,10 +126,132 @@ async def add_version(db: AsyncSession, policy_id: str, content: str, summary: s
     )
     db.add(version)
     await db.commit()
+    mark_changed("policies", "policy_versions")
     await db.refresh(version)
+    # Relationships already loaded on the policy still point at the old version.
+    db.expire(policy, ["latest_version", "versions"])
     return version
 
 
+async def get_version_content(db: AsyncSession, policy_id: str, version_number: int) -> str | None:
+    """Return the text of any version of a policy, or ``None`` if it does not exist.
+
+    Older versions are rebuilt by walking up to the nearest full text (a
+    snapshot, the current version or a cached rebuild) and applying the
+    diffs back down, so at most ``policy_snapshot_interval`` diffs are read.
+    Rebuilt texts are kept in an LRU cache.
+    """
+    window = max(1, get_settings().policy_snapshot_interval)
+    chain = []
+    start = version_number
+    found_base = False
+    while not found_base:
+        rows = (await db.execute(
+            select(PolicyVersion.id, PolicyVersion.version_number, PolicyVersion.encoding)
+            .where(PolicyVersion.policy_id == policy_id, PolicyVersion.version_number >= start)
+            .order_by(PolicyVersion.version_number)
+            .limit(window)
+        )).all()
+        if not rows:
+            break
+        for row in rows:
+            chain.append(row)
+            if row.encoding != version_store.DELTA or row.id in version_store.texts:
+                found_base = True
+                break
+        start = rows[-1].version_number + 1
+    if not chain or chain[0].version_number != version_number:
+        return None
+    if not found_base:
+        raise ValueError(f"Policy {policy_id} has a version diff with no newer version to apply it to")
+
+    base = chain[-1]
+    text = version_store.texts.get(base.id)
+    payload = dict((await db.execute(
+        select(PolicyVersion.id, PolicyVersion.data).where(PolicyVersion.id.in_([r.id for r in chain[:-1]]))
+    )).all()) if len(chain) > 1 else {}
+    if text is None:
+        row = (await db.execute(
+            select(PolicyVersion.content, PolicyVersion.data).where(PolicyVersion.id == base.id)
+        )).one()
+        text = version_store.decompress(row.data) if base.encoding == version_store.SNAPSHOT else row.content
+        version_store.texts.put(base.id, text)
+    for row in reversed(chain[:-1]):
+        text = version_store.apply_delta(text, payload[row.id])
+        version_store.texts.put(row.id, text)
+    return text
+
+
+async def get_version(db: AsyncSession, policy_id: str, version_number: int) -> PolicyVersion | None:
+    """Load one version of a policy with its ``content`` rebuilt."""
+    version = (await db.execute(
+        select(PolicyVersion).where(
+            PolicyVersion.policy_id == policy_id, PolicyVersion.version_number == version_number
+        )
+    )).scalar_one_or_none()
+    if version is None or version.encoding == version_store.FULL:
+        return version
+    # Set the rebuilt text without marking the row dirty; it is never written back.
+    set_committed_value(version, "content", await get_version_content(db, policy_id, version_number))
+    return version
+
+
+async def _compact_policy(db: AsyncSession, policy_id: str, current_version: int) -> int:
+    """Archive one policy's superseded full-text versions, newest first.
+
+    Versions are loaded one at a time; only the text of the version just
+    archived is kept, as the ``newer`` text for the one below it.
+    """
+    rows = (await db.execute(
+        select(PolicyVersion.id, PolicyVersion.version_number, PolicyVersion.encoding)
+        .where(PolicyVersion.policy_id == policy_id, PolicyVersion.version_number <= current_version)
+        .order_by(PolicyVersion.version_number.desc())
+    )).all()
+    converted = 0
+    newer_number, newer = None, None
+    for row in rows:
+        if row.encoding == version_store.FULL and newer_number is not None:
+            version = await db.get(PolicyVersion, row.id)
+            if newer is None:
+                newer = await get_version_content(db, policy_id, newer_number)
+            text = version.content
+            _archive(version, newer)
+            converted += 1
+            newer = text
+        else:
+            # Read or rebuilt only if the next version down needs it.
+            newer = None
+        newer_number = row.version_number
+    if converted:
+        await db.commit()
+    return converted
+
+
+async def compact_versions(db: AsyncSession, policy_id: str | None = None) -> int:
+    """Archive superseded versions that still hold their full text.
+
+    Versions written before diff storage existed are converted newest first,
+    one policy per commit, so memory is bounded by one policy's history.
+    Returns the number of versions converted.
+    """
+    stmt = (
+        select(Policy.id, Policy.current_version)
+        .where(Policy.versions.any(and_(
+            PolicyVersion.encoding == version_store.FULL,
+            PolicyVersion.version_number < Policy.current_version,
+        )))
+        .order_by(Policy.id)
+    )
+    if policy_id:
+        stmt = stmt.where(Policy.id == policy_id)
+    converted = 0
+    for pid, current_version in (await db.execute(stmt)).all():
+        converted += await _compact_policy(db, pid, current_version)
+    if converted:
+        mark_changed("policy_versions")
+    return converted
+
+
 async def distribute_policy(
     db: AsyncSession, policy_id: str, channel: str, recipients: list[str]
 ) -> list[PolicyDistribution]:
@@ -86,4 +265,5 @@ async def distribute_policy(
         db.add(dist)
         distributions.append(dist)
     await db.commit()
+    mark_changed("policy_distributions")
     return distributions
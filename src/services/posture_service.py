@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterable
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.audit import Audit, AuditFinding
+from src.models.framework import ComplianceFrameworkModel, FrameworkControl
+from src.models.posture import ControlPosture
+from src.services.changes import mark_changed
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+# Keep IN lists well under SQLite's bound-parameter limit.
+CONTROL_CHUNK_SIZE = 500
+
+
+def _chunks(items: list[str], size: int = CONTROL_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def _refresh(db: AsyncSession, framework_id: str, control_ids: list[str] | None) -> int:
+    controls_stmt = select(FrameworkControl.control_id, FrameworkControl.category).where(
+        FrameworkControl.framework_id == framework_id
+    )
+    findings_stmt = (
+        select(
+            FrameworkControl.control_id,
+            AuditFinding.severity,
+            func.sum(case((AuditFinding.status == "open", 1), else_=0)),
+            func.max(func.coalesce(Audit.completed_at, Audit.created_at)),
+        )
+        .join(FrameworkControl, FrameworkControl.id == AuditFinding.framework_control_pk)
+        .join(Audit, Audit.id == AuditFinding.audit_id)
+        .where(FrameworkControl.framework_id == framework_id)
+        .group_by(FrameworkControl.control_id, AuditFinding.severity)
+    )
+    clear = delete(ControlPosture).where(ControlPosture.framework_id == framework_id)
+    if control_ids is not None:
+        controls_stmt = controls_stmt.where(FrameworkControl.control_id.in_(control_ids))
+        findings_stmt = findings_stmt.where(FrameworkControl.control_id.in_(control_ids))
+        clear = clear.where(ControlPosture.control_id.in_(control_ids))
+
+    now = datetime.datetime.now(datetime.UTC)
+    rows = {
+        control_id: {
+            "framework_id": framework_id,
+            "control_id": control_id,
+            "category": category or "",
+            **dict.fromkeys(SEVERITIES, 0),
+            "open_findings": 0,
+            "last_audit_at": None,
+            "updated_at": now,
+        }
+        for control_id, category in await db.execute(controls_stmt)
+    }
+    for control_id, severity, open_count, last_audit_at in await db.execute(findings_stmt):
+        row = rows.get(control_id)
+        if row is None:
+            continue
+        severity = (severity or "").lower()
+        if severity in SEVERITIES:
+            row[severity] += open_count or 0
+        row["open_findings"] += open_count or 0
+        if last_audit_at and (row["last_audit_at"] is None or last_audit_at > row["last_audit_at"]):
+            row["last_audit_at"] = last_audit_at
+
+    await db.execute(clear)
+    if rows:
+        await db.execute(insert(ControlPosture), list(rows.values()))
+    return len(rows)
+
+
+async def refresh_controls(
+    db: AsyncSession, framework_id: str, control_ids: Iterable[str] | None = None
+) -> int:
+    """Recompute the posture rows of a framework's controls, or of all of them.
+
+    Only findings on the given controls are aggregated, so the cost follows
+    what a write touched rather than the size of the findings table. The
+    caller commits. Returns the number of rows written.
+    """
+    if control_ids is None:
+        return await _refresh(db, framework_id, None)
+    ids = sorted({c for c in control_ids if c})
+    written = 0
+    for chunk in _chunks(ids):
+        written += await _refresh(db, framework_id, chunk)
+    return written
+
+
+async def refresh_for_audit(db: AsyncSession, audit_id: str, control_ids: Iterable[str] | None = None) -> int:
+    """Recompute posture for the controls an audit's findings touch.
+
+    With no ``control_ids``, every control the audit has a finding on is
+    refreshed, e.g. after the audit completes and its date changes.
+    """
+    framework_id = (await db.execute(select(Audit.framework_id).where(Audit.id == audit_id))).scalar_one_or_none()
+    if framework_id is None:
+        return 0
+    if control_ids is None:
+        control_ids = (await db.execute(
+            select(AuditFinding.control_id).where(AuditFinding.audit_id == audit_id).distinct()
+        )).scalars().all()
+    return await refresh_controls(db, framework_id, control_ids)
+
+
+async def rebuild(db: AsyncSession, framework_id: str | None = None) -> int:
+    """Recompute the posture table from scratch for one framework or all of them."""
+    if framework_id:
+        framework_ids = [framework_id]
+    else:
+        framework_ids = list((await db.execute(select(ComplianceFrameworkModel.id))).scalars())
+        await db.execute(delete(ControlPosture).where(ControlPosture.framework_id.not_in(framework_ids)))
+    written = 0
+    for fid in framework_ids:
+        written += await refresh_controls(db, fid)
+    await db.commit()
+    mark_changed("control_posture")
+    return written
+
+
+def _rollup(rows: Iterable[ControlPosture]) -> dict:
+    totals = {"total_controls": 0, "controls_with_findings": 0, **dict.fromkeys(SEVERITIES, 0), "open_findings": 0}
+    last = None
+    for row in rows:
+        totals["total_controls"] += 1
+        totals["controls_with_findings"] += row.open_findings > 0
+        for severity in SEVERITIES:
+            totals[severity] += getattr(row, severity)
+        totals["open_findings"] += row.open_findings
+        if row.last_audit_at and (last is None or row.last_audit_at > last):
+            last = row.last_audit_at
+    return {**totals, "last_audit_at": last}
+
+
+async def get_posture(db: AsyncSession, framework_id: str) -> dict | None:
+    """Open findings for a framework, overall, per category and per control.
+
+    Reads only the materialized posture rows and never writes. ``stale`` is
+    set when they do not cover every control (e.g. controls were added
+    outside the import path); ``rebuild`` or ``scm framework posture
+    --rebuild`` fixes that.
+    """
+    framework = await db.get(ComplianceFrameworkModel, framework_id)
+    if framework is None:
+        return None
+    stmt = (
+        select(ControlPosture)
+        .where(ControlPosture.framework_id == framework_id)
+        .order_by(ControlPosture.category, ControlPosture.control_id)
+        # Rows are rewritten with Core statements; don't trust the identity map.
+        .execution_options(populate_existing=True)
+    )
+    rows = list((await db.execute(stmt)).scalars())
+    controls = await db.scalar(
+        select(func.count(FrameworkControl.control_id.distinct())).where(FrameworkControl.framework_id == framework_id)
+    )
+
+    by_category: dict[str, list[ControlPosture]] = {}
+    for row in rows:
+        by_category.setdefault(row.category, []).append(row)
+    summary = _rollup(rows)
+    completed = await db.scalar(
+        select(func.max(Audit.completed_at)).where(Audit.framework_id == framework_id, Audit.status == "completed")
+    )
+    summary["last_audit_at"] = completed or summary["last_audit_at"]
+    return {
+        "framework_id": framework.id,
+        "framework": framework.name,
+        **summary,
+        "stale": len(rows) != controls,
+        "categories": [{"category": category, **_rollup(group)} for category, group in by_category.items()],
+        "controls": rows,
+    }
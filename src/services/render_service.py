@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.models.audit import Audit
+from src.models.report import Report
+from src.models.risk import Risk
+from src.schemas.audit import AuditResponse, AuditSummary
+from src.schemas.policy import PolicyResponse
+from src.schemas.report import ReportCreate
+from src.schemas.risk import RiskSummary
+from src.services import audit_service, policy_service, risk_service
+from src.services.changes import mark_changed
+
+logger = logging.getLogger(__name__)
+
+# Report types accepted by the API, mapped to the document types used by the
+# agent's generate_document tool.
+DOC_TYPE_ALIASES = {
+    "audit": "audit_report",
+    "risk": "risk_register",
+    "policy": "policy_document",
+    "executive": "executive_summary",
+}
+
+SUPPORTED = {
+    ("audit_report", "docx"),
+    ("audit_report", "xlsx"),
+    ("risk_register", "xlsx"),
+    ("policy_document", "docx"),
+    ("executive_summary", "pptx"),
+}
+
+_executor: Executor | None = None
+_jobs: set[asyncio.Task] = set()
+
+
+def get_executor() -> Executor:
+    """Return the shared pool that CPU-heavy document rendering runs on."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        if settings.render_executor == "thread":
+            _executor = ThreadPoolExecutor(max_workers=settings.render_workers, thread_name_prefix="render")
+        else:
+            # Spawned workers do not inherit the event loop or open DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.render_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def normalize_doc_type(doc_type: str) -> str:
+    return DOC_TYPE_ALIASES.get(doc_type, doc_type)
+
+
+def is_supported(doc_type: str, fmt: str) -> bool:
+    return (normalize_doc_type(doc_type), fmt) in SUPPORTED
+
+
+async def _render(fn, *snapshots) -> Path:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), fn, *snapshots)
+
+
+async def render_document(db: AsyncSession, doc_type: str, fmt: str, source_id: str = "") -> Path | None:
+    """Render a document and return its path, or ``None`` if there is nothing to render.
+
+    ORM objects are converted to plain schema snapshots before rendering so
+    python-docx and python-pptx work runs in the executor, off the event loop.
+    Excel exports stream from a database cursor instead, with the workbook
+    written in a worker thread.
+    """
+    from src.office365.excel import stream_audit_excel, stream_risk_register
+    from src.office365.powerpoint import generate_executive_summary
+    from src.office365.word import generate_audit_report, generate_policy_document
+
+    doc_type = normalize_doc_type(doc_type)
+    if doc_type == "audit_report" and fmt == "docx" and source_id:
+        audit = await audit_service.get_audit(db, source_id)
+        if audit:
+            return await _render(generate_audit_report, AuditResponse.model_validate(audit))
+    elif doc_type == "audit_report" and fmt == "xlsx" and source_id:
+        audit = await audit_service.get_audit(db, source_id, with_findings=False)
+        if audit:
+            return await stream_audit_excel(audit.id, audit_service.stream_findings(db, audit.id))
+    elif doc_type == "risk_register" and fmt == "xlsx":
+        return await stream_risk_register(risk_service.stream_risks(db))
+    elif doc_type == "policy_document" and fmt == "docx" and source_id:
+        policy = await policy_service.get_policy(db, source_id)
+        if policy:
+            return await _render(generate_policy_document, PolicyResponse.model_validate(policy))
+    elif doc_type == "executive_summary" and fmt == "pptx":
+        audits = (await db.execute(select(Audit).order_by(Audit.created_at.desc(), Audit.id.desc()))).scalars()
+        risks = (await db.execute(select(Risk).order_by(Risk.score.desc(), Risk.id.desc()))).scalars()
+        return await _render(
+            generate_executive_summary,
+            [AuditSummary.model_validate(a) for a in audits],
+            [RiskSummary.model_validate(r) for r in risks],
+        )
+    return None
+
+
+async def _claim(db: AsyncSession, report_id: str) -> bool:
+    """Move a report from ``pending`` to ``rendering``; ``False`` if another process got there first."""
+    result = await db.execute(
+        update(Report).where(Report.id == report_id, Report.status == "pending").values(status="rendering")
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def _run_job(bind, report_id: str, doc_type: str, fmt: str, source_id: str, claimed: bool = False) -> None:
+    async with AsyncSession(bind, expire_on_commit=False) as db:
+        if not claimed and not await _claim(db, report_id):
+            return
+        report = await db.get(Report, report_id)
+        try:
+            path = await render_document(db, doc_type, fmt, source_id)
+            if path is None:
+                raise ValueError(f"Could not generate {doc_type} in {fmt} format")
+            report.file_path = str(path)
+            report.status = "generated"
+        except Exception as e:
+            logger.error(f"Report {report_id} failed: {e}")
+            report.status = "failed"
+            report.error = str(e)
+        await db.commit()
+        mark_changed("reports")
+
+
+async def start_report_job(db: AsyncSession, data: ReportCreate) -> Report:
+    """Create a pending report and render it in the background.
+
+    The report id doubles as the job id: its ``status`` moves from
+    ``pending`` through ``rendering`` to ``generated`` or ``failed``.
+    """
+    if not is_supported(data.report_type, data.format):
+        raise ValueError(f"Unsupported report: {data.report_type} in {data.format} format")
+    report = Report(
+        title=data.title or f"{data.report_type.title()} Report",
+        report_type=data.report_type,
+        format=data.format,
+        source_id=data.source_id,
+        status="pending",
+    )
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+    mark_changed("reports")
+    _start_job(db.bind, report.id, report.report_type, report.format, report.source_id)
+    return report
+
+
+def _start_job(bind, report_id: str, doc_type: str, fmt: str, source_id: str, claimed: bool = False) -> None:
+    task = asyncio.create_task(_run_job(bind, report_id, doc_type, fmt, source_id, claimed))
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+
+
+async def resume_pending_jobs(db: AsyncSession) -> int:
+    """Queue every ``pending`` report again, e.g. after a restart lost its job.
+
+    Jobs live only in this process, so reports left pending at shutdown would
+    otherwise never finish. Each report is claimed first, so when several
+    API workers start together only one of them renders it. Returns the
+    number of jobs started.
+    """
+    pending = (await db.execute(
+        select(Report.id, Report.report_type, Report.format, Report.source_id).where(Report.status == "pending")
+    )).all()
+    started = 0
+    for report_id, doc_type, fmt, source_id in pending:
+        if await _claim(db, report_id):
+            _start_job(db.bind, report_id, doc_type, fmt, source_id, claimed=True)
+            started += 1
+    if started:
+        logger.info(f"Resumed {started} pending report jobs")
+    return started
+
+
+async def wait_for_jobs() -> None:
+    """Wait until every background report job has finished."""
+    while _jobs:
+        await asyncio.gather(*list(_jobs), return_exceptions=True)
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.report import Report
 from src.schemas.report import ReportCreate
+from src.services.changes import mark_changed
 
 
 async def create_report(db: AsyncSession, data: ReportCreate, file_path: str) -> Report:
@@ -17,6 +18,7 @@ async def create_report(db: AsyncSession, data: ReportCreate, file_path: str) ->
     )
     db.add(report)
     await db.commit()
+    mark_changed("reports")
     await db.refresh(report)
     return report
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from src.models.risk import Risk, RiskMitigation
 from src.schemas.risk import RiskCreate, RiskMitigationCreate, RiskUpdateScore
+from src.services.changes import mark_changed
+from src.services.pagination import STREAM_BATCH_SIZE, Page, paginate
 
 
 async def create_risk(db: AsyncSession, data: RiskCreate) -> Risk:
@@ -20,6 +24,7 @@ async def create_risk(db: AsyncSession, data: RiskCreate) -> Risk:
     )
     db.add(risk)
     await db.commit()
+    mark_changed("risks")
     return await get_risk(db, risk.id)
 
 
@@ -30,6 +35,41 @@ async def list_risks(db: AsyncSession) -> list[Risk]:
     return list(result.scalars().all())
 
 
+async def list_risks_page(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    columns: list[str] | None = None,
+    include_mitigations: bool = False,
+    with_total: bool = False,
+) -> Page[Risk]:
+    """List risks by score, one keyset page at a time.
+
+    Mitigations are only loaded when ``include_mitigations`` is set, and
+    ``columns`` restricts which risk columns are fetched.
+    """
+    stmt = select(Risk)
+    if columns:
+        stmt = stmt.options(load_only(*(getattr(Risk, c) for c in columns)))
+    if include_mitigations:
+        stmt = stmt.options(selectinload(Risk.mitigations))
+    return await paginate(db, stmt, Risk.score, Risk.id, limit, cursor, with_total=with_total)
+
+
+async def stream_risks(db: AsyncSession) -> AsyncIterator[Row]:
+    """Yield every risk by score as a plain row, streamed in batches for exports."""
+    result = await db.stream(
+        select(
+            Risk.id, Risk.title, Risk.description, Risk.category, Risk.likelihood,
+            Risk.impact, Risk.score, Risk.status, Risk.owner,
+        )
+        .order_by(Risk.score.desc(), Risk.id.desc())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for row in result:
+        yield row
+
+
 async def get_risk(db: AsyncSession, risk_id: str) -> Risk | None:
     result = await db.execute(
         select(Risk).options(selectinload(Risk.mitigations)).where(Risk.id == risk_id)
@@ -47,6 +87,7 @@ async def update_risk_score(db: AsyncSession, risk_id: str, data: RiskUpdateScor
     if data.status:
         risk.status = data.status
     await db.commit()
+    mark_changed("risks")
     return await get_risk(db, risk_id)
 
 
@@ -59,10 +100,20 @@ async def add_mitigation(db: AsyncSession, risk_id: str, data: RiskMitigationCre
     )
     db.add(mitigation)
     await db.commit()
+    mark_changed("risk_mitigations")
     await db.refresh(mitigation)
     return mitigation
 
 
+def _cell_axis(column, value: int):
+    # Interior cells match exactly so the index provides the page order.
+    if value <= 1:
+        return column <= 1
+    if value >= 5:
+        return column >= 5
+    return column == value
+
+
 async def get_risk_matrix(db: AsyncSession) -> list[list[list[Risk]]]:
     """Return 5x5 matrix [impact][likelihood] with lists of risks."""
     risks = await list_risks(db)
@@ -72,3 +123,40 @@ async def get_risk_matrix(db: AsyncSession) -> list[list[list[Risk]]]:
         im = max(0, min(4, risk.impact - 1))
         matrix[im][li].append(risk)
     return matrix
+
+
+async def get_risk_matrix_summary(db: AsyncSession) -> list[list[dict[str, int]]]:
+    """Return a 5x5 matrix [impact][likelihood] of risk counts and score sums.
+
+    The database aggregates with one ``GROUP BY`` over the covering index,
+    so the cost does not grow with the columns or mitigations of each risk.
+    """
+    matrix = [
+        [{"likelihood": li, "impact": im, "count": 0, "score_sum": 0} for li in range(1, 6)]
+        for im in range(1, 6)
+    ]
+    result = await db.execute(
+        select(Risk.likelihood, Risk.impact, func.count(), func.sum(Risk.score))
+        .group_by(Risk.likelihood, Risk.impact)
+    )
+    for likelihood, impact, count, score_sum in result:
+        cell = matrix[max(0, min(4, impact - 1))][max(0, min(4, likelihood - 1))]
+        cell["count"] += count
+        cell["score_sum"] += score_sum or 0
+    return matrix
+
+
+async def list_risks_in_cell(
+    db: AsyncSession,
+    likelihood: int,
+    impact: int,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> Page[Risk]:
+    """List the risks in one matrix cell, one keyset page at a time.
+
+    Out-of-range scores fall into the edge cells, as in the matrix views,
+    so a cell lists exactly the risks its summary count covers.
+    """
+    stmt = select(Risk).where(_cell_axis(Risk.likelihood, likelihood), _cell_axis(Risk.impact, impact))
+    return await paginate(db, stmt, Risk.score, Risk.id, limit, cursor)
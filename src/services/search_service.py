@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.audit import AuditFinding
+from src.models.policy import Policy, PolicyVersion
+from src.models.risk import Risk
+from src.models.search import FTS_TABLES, rebuild_fts_ddl
+from src.services import policy_service, version_store
+
+KINDS = ("policy", "finding", "risk")
+SNIPPET_TOKENS = 16
+SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS = "[", "]", "…"
+# Per-column BM25 weights, in FTS column order (unindexed keys count as columns).
+TITLE_WEIGHT = 3.0
+
+_TERM = re.compile(r"\w+\*?")
+
+_QUERIES = {
+    "policy": """
+        SELECT f.id, f.policy_id AS parent_id, p.title,
+               snippet(search_policy_versions, 3, :open, :close, :ellipsis, :tokens) AS snippet,
+               bm25(search_policy_versions) AS rank
+        FROM search_policy_versions f JOIN policies p ON p.id = f.policy_id
+        WHERE search_policy_versions MATCH :query AND (:all_versions OR f.version_number = p.current_version)
+        ORDER BY rank LIMIT :limit
+    """,
+    "finding": f"""
+        SELECT f.id, f.audit_id AS parent_id, f.title,
+               snippet(search_findings, -1, :open, :close, :ellipsis, :tokens) AS snippet,
+               bm25(search_findings, 0, 0, {TITLE_WEIGHT}, 1, 1) AS rank
+        FROM search_findings f
+        WHERE search_findings MATCH :query
+        ORDER BY rank LIMIT :limit
+    """,
+    "risk": f"""
+        SELECT f.id, NULL AS parent_id, f.title,
+               snippet(search_risks, -1, :open, :close, :ellipsis, :tokens) AS snippet,
+               bm25(search_risks, 0, {TITLE_WEIGHT}, 1) AS rank
+        FROM search_risks f
+        WHERE search_risks MATCH :query
+        ORDER BY rank LIMIT :limit
+    """,
+}
+
+
+_INSERT_ARCHIVED = """
+    INSERT INTO search_policy_versions (rowid, id, policy_id, version_number, content)
+    SELECT fts_rowid, :id, :policy_id, :version_number, :content
+    FROM search_policy_versions_keys WHERE source_id = :id
+"""
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every term.
+
+    Terms are quoted so punctuation in user input cannot be read as FTS5
+    syntax; a trailing ``*`` is kept as a prefix match.
+    """
+    terms = []
+    for term in _TERM.findall(query):
+        prefix = term.endswith("*")
+        terms.append(f'"{term.rstrip("*")}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+async def _search_fts(
+    db: AsyncSession, query: str, kinds: list[str], limit: int, markers: tuple[str, str], all_versions: bool
+) -> list[dict]:
+    params = {
+        "query": query,
+        "limit": limit,
+        "all_versions": all_versions,
+        "open": markers[0],
+        "close": markers[1],
+        "ellipsis": SNIPPET_ELLIPSIS,
+        "tokens": SNIPPET_TOKENS,
+    }
+    results = []
+    for kind in kinds:
+        rows = await db.execute(text(_QUERIES[kind]), params)
+        results.extend({"kind": kind, **row._asdict()} for row in rows)
+    return results
+
+
+async def _search_like(
+    db: AsyncSession, query: str, kinds: list[str], limit: int, all_versions: bool
+) -> list[dict]:
+    """Unranked substring search for databases without FTS5.
+
+    Superseded policy versions hold their text as compressed diffs, so only
+    versions still stored as full text can match here.
+    """
+    terms = [t.rstrip("*") for t in _TERM.findall(query)]
+
+    def matches(*columns):
+        return [or_(*(c.ilike(f"%{t}%") for c in columns)) for t in terms]
+
+    results = []
+    if "policy" in kinds:
+        stmt = (
+            select(PolicyVersion.id, PolicyVersion.policy_id, Policy.title, PolicyVersion.content)
+            .join(Policy, Policy.id == PolicyVersion.policy_id)
+            .where(*matches(PolicyVersion.content))
+            .limit(limit)
+        )
+        if not all_versions:
+            stmt = stmt.where(PolicyVersion.version_number == Policy.current_version)
+        results.extend(
+            {"kind": "policy", "id": id, "parent_id": pid, "title": title, "snippet": content[:200], "rank": 0.0}
+            for id, pid, title, content in await db.execute(stmt)
+        )
+    if "finding" in kinds:
+        stmt = select(AuditFinding.id, AuditFinding.audit_id, AuditFinding.title, AuditFinding.description).where(
+            *matches(AuditFinding.title, AuditFinding.description, AuditFinding.recommendation)
+        ).limit(limit)
+        results.extend(
+            {"kind": "finding", "id": id, "parent_id": aid, "title": title, "snippet": desc[:200], "rank": 0.0}
+            for id, aid, title, desc in await db.execute(stmt)
+        )
+    if "risk" in kinds:
+        stmt = select(Risk.id, Risk.title, Risk.description).where(
+            *matches(Risk.title, Risk.description)
+        ).limit(limit)
+        results.extend(
+            {"kind": "risk", "id": id, "parent_id": None, "title": title, "snippet": desc[:200], "rank": 0.0}
+            for id, title, desc in await db.execute(stmt)
+        )
+    return results
+
+
+async def search(
+    db: AsyncSession,
+    query: str,
+    kinds: list[str] | None = None,
+    limit: int = 20,
+    markers: tuple[str, str] = (SNIPPET_OPEN, SNIPPET_CLOSE),
+    all_versions: bool = False,
+) -> list[dict]:
+    """Full-text search across policies, audit findings and risks.
+
+    On SQLite this runs against the FTS5 indexes: every term must match and
+    results carry a snippet with matched terms between ``markers`` (brackets
+    by default; pass characters that cannot occur in the text to tell
+    matches apart from literal brackets). Policies match on their current
+    version unless ``all_versions`` is set. Results are grouped by kind, up to ``limit``
+    per kind, each group ordered by BM25 (lower is better). Each FTS table
+    scores against its own corpus statistics, so ``rank`` is only
+    comparable within a kind.
+    """
+    kinds = [k for k in KINDS if k in (kinds or KINDS)]
+    match = fts_query(query)
+    if not match or not kinds:
+        return []
+    if db.bind.dialect.name == "sqlite":
+        return await _search_fts(db, match, kinds, limit, markers, all_versions)
+    return await _search_like(db, query, kinds, limit, all_versions)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Re-create the FTS5 indexes from their source tables.
+
+    The triggers keep the indexes in sync with every write through SQLite;
+    run this after loading data that bypassed them (e.g. a restore into
+    tables whose triggers were dropped). Returns the number of indexes
+    rebuilt (none on databases without FTS5).
+    """
+    if db.bind.dialect.name != "sqlite":
+        return 0
+    for table in FTS_TABLES:
+        for statement in rebuild_fts_ddl(table):
+            await db.execute(text(statement))
+    await _index_archived_versions(db)
+    await db.commit()
+    return len(FTS_TABLES)
+
+
+async def _index_archived_versions(db: AsyncSession) -> None:
+    # Superseded versions keep only a compressed diff, which SQL cannot read;
+    # rebuild their text here. Newest first, so each rebuild starts from the
+    # one before it in the version cache.
+    archived = (await db.execute(
+        select(PolicyVersion.id, PolicyVersion.policy_id, PolicyVersion.version_number)
+        .where(PolicyVersion.encoding != version_store.FULL)
+        .order_by(PolicyVersion.policy_id, PolicyVersion.version_number.desc())
+    )).all()
+    for row in archived:
+        content = await policy_service.get_version_content(db, row.policy_id, row.version_number)
+        await db.execute(text(_INSERT_ARCHIVED), {**row._asdict(), "content": content})
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import zlib
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+from src.config import get_settings
+
+# How a PolicyVersion row holds its text.
+FULL = "full"  # plain text in ``content``; always the case for the current version
+SNAPSHOT = "snapshot"  # zlib-compressed text in ``data``
+DELTA = "delta"  # zlib-compressed reverse diff against the next version in ``data``
+
+
+def compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def make_delta(newer: str, older: str) -> bytes:
+    """Encode ``older`` as line ranges copied from ``newer`` plus inserted text."""
+    a = newer.splitlines(keepends=True)
+    b = older.splitlines(keepends=True)
+    ops: list = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(newer: str, delta: bytes) -> str:
+    """Rebuild the older text from ``newer`` and a delta made by :func:`make_delta`."""
+    lines = newer.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        parts.append(op if isinstance(op, str) else "".join(lines[op[0]:op[1]]))
+    return "".join(parts)
+
+
+def is_snapshot(version_number: int) -> bool:
+    return version_number % max(1, get_settings().policy_snapshot_interval) == 0
+
+
+class TextCache:
+    """Least-recently-used cache of rebuilt version texts, keyed by version id.
+
+    A version's text never changes once written, so entries never go stale.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._texts: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        text = self._texts.get(key)
+        if text is not None:
+            self._texts.move_to_end(key)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        if self.maxsize <= 0:
+            return
+        self._texts[key] = text
+        self._texts.move_to_end(key)
+        while len(self._texts) > self.maxsize:
+            self._texts.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._texts
+
+    def clear(self) -> None:
+        self._texts.clear()
+
+
+texts = TextCache(get_settings().policy_version_cache_size)
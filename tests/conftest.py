@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 from pathlib import Path
 
+import httpx
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -19,6 +20,13 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def framework_cache_dir(tmp_path, monkeypatch):
+    """Keep the parsed-framework cache out of the repository's data directory."""
+    monkeypatch.setenv("FRAMEWORK_CACHE_DIR", str(tmp_path / "framework-cache"))
+    return tmp_path / "framework-cache"
+
+
 @pytest_asyncio.fixture
 async def db_session():
     engine = create_async_engine("sqlite+aiosqlite:///:memory:")
@@ -44,3 +52,23 @@ async def client(db_session):
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def mock_graph(monkeypatch):
+    """Route Graph requests to an in-process handler instead of the network."""
+    from src.office365 import graph_client
+
+    async def fake_token():
+        return "test-token"
+
+    monkeypatch.setattr(graph_client, "acquire_token", fake_token)
+    monkeypatch.setenv("GRAPH_BACKOFF_BASE", "0.001")
+    handlers = {}
+
+    async def dispatch(request: httpx.Request) -> httpx.Response:
+        return await handlers["handler"](request)
+
+    graph_client.set_client(httpx.AsyncClient(transport=httpx.MockTransport(dispatch)))
+    yield handlers
+    await graph_client.close_client()
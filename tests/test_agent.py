@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.agent.engine import execute_tool_uses
+from src.database import Base
+
+
+@pytest.fixture
+async def file_db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'agent.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+def _tool_use(id: str, name: str, **args):
+    return SimpleNamespace(id=id, name=name, input=args)
+
+
+@pytest.mark.asyncio
+async def test_tool_results_keep_order_around_writes(file_db, monkeypatch):
+    from src.agent import engine
+
+    # Probe how many tools run at once; reads pause so overlapping ones are seen.
+    running, peak, writes_overlapped = 0, 0, False
+    real_execute_tool = engine.execute_tool
+
+    async def probe(db, name, args):
+        nonlocal running, peak, writes_overlapped
+        if not engine.is_read_only(name):
+            writes_overlapped |= running > 0
+            return await real_execute_tool(db, name, args)
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.02)
+            return await real_execute_tool(db, name, args)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(engine, "execute_tool", probe)
+    tool_uses = [
+        _tool_use("t1", "query_risks"),
+        _tool_use("t2", "query_policies"),
+        _tool_use("t3", "assess_risk", title="Phishing", likelihood=3, impact=4),
+        _tool_use("t4", "query_risks"),
+        _tool_use("t5", "query_audits"),
+    ]
+    results = await execute_tool_uses(file_db, tool_uses)
+
+    assert [r["tool_use_id"] for r in results] == ["t1", "t2", "t3", "t4", "t5"]
+    assert json.loads(results[0]["content"])["items"] == []
+    assert json.loads(results[2]["content"])["score"] == 12
+    # The read after the write sees the new risk.
+    assert [r["title"] for r in json.loads(results[3]["content"])["items"]] == ["Phishing"]
+    # Consecutive reads overlapped; the write ran alone.
+    assert peak == 2
+    assert not writes_overlapped
+
+
+@pytest.mark.asyncio
+async def test_query_tools_return_a_bounded_projection(db_session):
+    from src.agent.tools import execute_tool
+    from src.schemas.risk import RiskCreate
+    from src.services import risk_service
+
+    for i in range(3):
+        await risk_service.create_risk(db_session, RiskCreate(title=f"Risk {i}", likelihood=i + 1, impact=2))
+    page = json.loads(await execute_tool(db_session, "query_risks", {"limit": 2}))
+    assert [r["score"] for r in page["items"]] == [6, 4]
+    assert set(page["items"][0]) == {"id", "title", "score", "status"}
+    assert page["total"] == 3 and page["next_cursor"]
+
+    # The cursor reaches the rows past the first page.
+    rest = json.loads(await execute_tool(db_session, "query_risks", {"limit": 2, "cursor": page["next_cursor"]}))
+    assert [r["score"] for r in rest["items"]] == [2]
+    assert rest["total"] == 3 and rest["next_cursor"] is None
+
+
+class _FakeStream:
+    def __init__(self, message):
+        self.message = message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for block in self.message.content:
+            if block.type == "text":
+                yield SimpleNamespace(type="text", text=block.text)
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    async def get_final_message(self):
+        return self.message
+
+
+class _FakeAsyncAnthropic:
+    def __init__(self, responses):
+        self._responses = iter(responses)
+        self.calls = []
+        self.messages = SimpleNamespace(stream=self._stream)
+
+    def _stream(self, **kwargs):
+        self.calls.append(kwargs)
+        return _FakeStream(next(self._responses))
+
+    async def close(self):
+        pass
+
+
+def _message(*content, stop_reason="end_turn"):
+    return SimpleNamespace(
+        content=list(content),
+        stop_reason=stop_reason,
+        usage=SimpleNamespace(
+            input_tokens=10, output_tokens=5, cache_read_input_tokens=100, cache_creation_input_tokens=20
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_agent_streams_events(db_session, monkeypatch):
+    from src.agent import engine
+
+    responses = [
+        _message(
+            SimpleNamespace(type="text", text="Checking risks."),
+            SimpleNamespace(type="tool_use", id="t1", name="query_risks", input={}),
+            stop_reason="tool_use",
+        ),
+        _message(SimpleNamespace(type="text", text="No risks recorded.")),
+    ]
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    fake_client = _FakeAsyncAnthropic(responses)
+    monkeypatch.setattr(engine.anthropic, "AsyncAnthropic", lambda **kwargs: fake_client)
+    monkeypatch.setattr(engine, "execute_tool_uses", lambda db, tool_uses: _results(tool_uses))
+
+    events = []
+
+    async def on_event(event):
+        events.append(event)
+
+    result = await engine.run_agent(db_session, "List risks", on_event=on_event)
+
+    assert result["status"] == "completed"
+    assert result["iterations"] == 2
+    assert result["result"] == "No risks recorded."
+    assert [e["type"] for e in events] == ["text", "tool_use", "tool_result", "text", "done"]
+
+    # The stable prefix carries cache breakpoints and cache usage is tracked.
+    call = fake_client.calls[0]
+    assert call["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert call["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert result["cache_read_tokens"] == 200
+    assert result["cache_write_tokens"] == 40
+
+
+async def _results(tool_uses):
+    return [{"type": "tool_result", "tool_use_id": t.id, "content": "[]"} for t in tool_uses]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_closes_task_on_failure_or_cancellation(db_session, monkeypatch):
+    import asyncio
+
+    from sqlalchemy import select
+
+    from src.agent import engine
+    from src.models.agent_task import AgentTask
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    async def broken_context(db):
+        raise RuntimeError("context unavailable")
+
+    monkeypatch.setattr(engine, "build_context", broken_context)
+    result = await engine.run_agent(db_session, "Fails early")
+    assert result["status"] == "failed"
+    monkeypatch.undo()
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    started = asyncio.Event()
+
+    async def hang(db, tool_uses):
+        started.set()
+        await asyncio.Event().wait()
+
+    tool_call = _message(SimpleNamespace(type="tool_use", id="t1", name="query_risks", input={}), stop_reason="tool_use")
+    monkeypatch.setattr(engine.anthropic, "AsyncAnthropic", lambda **kwargs: _FakeAsyncAnthropic([tool_call]))
+    monkeypatch.setattr(engine, "execute_tool_uses", hang)
+    run = asyncio.create_task(engine.run_agent(db_session, "Gets cancelled"))
+    await started.wait()
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    tasks = {t.instruction: t for t in (await db_session.execute(select(AgentTask))).scalars()}
+    assert (tasks["Fails early"].status, tasks["Fails early"].error) == ("failed", "context unavailable")
+    assert tasks["Gets cancelled"].status == "cancelled"
+    assert tasks["Gets cancelled"].completed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_without_api_key(client, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "")
+    resp = await client.post("/api/v1/agent/stream", json={"instruction": "hello"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text.startswith("event: done\n")
+    assert '"status": "failed"' in resp.text
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_reports_early_failure(client, monkeypatch):
+    from src.agent import engine
+
+    async def failing_run_agent(db, instruction, on_event=None):
+        raise RuntimeError("context unavailable")
+
+    monkeypatch.setattr(engine, "run_agent", failing_run_agent)
+    resp = await client.post("/api/v1/agent/stream", json={"instruction": "hello"})
+    assert resp.status_code == 200
+    assert resp.text.startswith("event: error\n")
+    assert "context unavailable" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_build_context_is_cached_until_a_write(db_session):
+    from src.agent.context import build_context
+    from src.schemas.risk import RiskCreate
+    from src.services import risk_service
+
+    assert await build_context(db_session) == "No existing data."
+
+    for i in range(7):
+        await risk_service.create_risk(db_session, RiskCreate(title=f"Risk {i}", likelihood=1 + i % 5, impact=2))
+    context = await build_context(db_session)
+    assert "Current Risks (7):" in context
+    assert context.count("[Score:") == 5
+
+    # A write that bypasses the service layer does not invalidate the cache.
+    from src.models.risk import Risk
+    db_session.add(Risk(title="Direct", likelihood=5, impact=5, score=25))
+    await db_session.commit()
+    assert await build_context(db_session) == context
+
+    await risk_service.create_risk(db_session, RiskCreate(title="Another", likelihood=1, impact=1))
+    assert "Current Risks (9):" in await build_context(db_session)
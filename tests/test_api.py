@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 from src.models.framework import ComplianceFrameworkModel
+from src.models.risk import Risk
 
 
 @pytest.mark.asyncio
@@ -54,6 +55,17 @@ async def test_risks_crud(client):
     resp = await client.get("/api/v1/risks/matrix")
     assert resp.status_code == 200
     assert "matrix" in resp.json()
+    assert [r["id"] for r in resp.json()["matrix"][4][4]] == [risk["id"]]
+
+    resp = await client.get("/api/v1/risks/matrix", params={"mode": "summary"})
+    assert resp.status_code == 200
+    assert resp.json()["matrix"][4][4]["count"] == 1
+    assert resp.json()["total"] == 1
+
+    resp = await client.get("/api/v1/risks/matrix/5/5")
+    assert resp.status_code == 200
+    assert [r["id"] for r in resp.json()] == [risk["id"]]
+    assert (await client.get("/api/v1/risks/matrix/6/1")).status_code == 422
 
 
 @pytest.mark.asyncio
@@ -97,6 +109,30 @@ async def test_policies_crud(client):
     assert resp.json()["status"] == "approved"
 
 
+@pytest.mark.asyncio
+async def test_policy_versions(client, db_session):
+    from src.services import policy_service
+    resp = await client.post("/api/v1/policies", json={"title": "Versioned Policy"})
+    policy_id = resp.json()["id"]
+    await policy_service.add_version(db_session, policy_id, "Second draft", "Revise")
+
+    resp = await client.get(f"/api/v1/policies/{policy_id}")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["latest_version"]["content"] == "Second draft"
+    assert [v["version_number"] for v in body["versions"]] == [1, 2]
+    assert "content" not in body["versions"][0]
+
+    resp = await client.get(f"/api/v1/policies/{policy_id}/versions/2")
+    assert resp.status_code == 200
+    assert resp.json()["content"] == "Second draft"
+    resp = await client.get(f"/api/v1/policies/{policy_id}/versions/1")
+    assert resp.status_code == 200
+    assert resp.json()["version_number"] == 1
+    resp = await client.get(f"/api/v1/policies/{policy_id}/versions/3")
+    assert resp.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_not_found(client):
     resp = await client.get("/api/v1/risks/nonexistent")
@@ -107,3 +143,166 @@ async def test_not_found(client):
 
     resp = await client.get("/api/v1/policies/nonexistent")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_pagination_and_projection(client, db_session):
+    for i in range(5):
+        resp = await client.post("/api/v1/risks", json={"title": f"Risk {i}", "likelihood": 2, "impact": 2})
+        assert resp.status_code == 201
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "fields": "id,title"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/api/v1/risks", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert all(set(row) == {"id", "title"} for row in page)
+        seen.extend(row["id"] for row in page)
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    # Pages default to 50 rows.
+    resp = await client.get("/api/v1/risks")
+    assert len(resp.json()) == 5
+    assert "x-next-cursor" not in resp.headers
+
+    # The cursor carries the last row's sort key, so deleting that row does
+    # not disturb the next page.
+    resp = await client.get("/api/v1/risks", params={"limit": 2})
+    first = [row["id"] for row in resp.json()]
+    cursor = resp.headers["x-next-cursor"]
+    await db_session.delete(await db_session.get(Risk, first[-1]))
+    await db_session.commit()
+    resp = await client.get("/api/v1/risks", params={"cursor": cursor})
+    assert resp.status_code == 200
+    rest = [row["id"] for row in resp.json()]
+    assert len(rest) == 3 and not set(rest) & set(first)
+    assert (await client.get("/api/v1/risks", params={"cursor": "bm90IGpzb24"})).status_code == 400
+
+    # Datetime sort keys round-trip exactly as stored (server defaults have no
+    # microseconds), so rows sharing a timestamp are neither skipped nor repeated.
+    from src.models.audit import Audit
+    db_session.add_all(Audit(title=f"Audit {i}", framework_id="fw") for i in range(3))
+    await db_session.commit()
+    seen, cursor = [], None
+    while True:
+        resp = await client.get("/api/v1/audits", params={"limit": 1, **({"cursor": cursor} if cursor else {})})
+        seen.extend(row["id"] for row in resp.json())
+        if not (cursor := resp.headers.get("x-next-cursor")):
+            break
+    assert len(seen) == len(set(seen)) == 3
+
+    resp = await client.get("/api/v1/risks")
+    assert "mitigations" not in resp.json()[0]
+    resp = await client.get("/api/v1/risks", params={"include_mitigations": True})
+    assert resp.json()[0]["mitigations"] == []
+
+    resp = await client.get("/api/v1/risks", params={"fields": "id,nope"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_findings(client, db_session):
+    fw = ComplianceFrameworkModel(name="BulkFW", version="1.0", description="Test")
+    db_session.add(fw)
+    await db_session.commit()
+    resp = await client.post("/api/v1/audits", json={"framework_id": fw.id})
+    audit_id = resp.json()["id"]
+
+    resp = await client.post(f"/api/v1/audits/{audit_id}/findings:bulk", json=[
+        {"control_id": "B-1", "title": "One", "severity": "high"},
+        {"control_id": "B-2", "title": "Two"},
+    ])
+    assert resp.status_code == 201
+    assert resp.json()["inserted"] == 2
+
+    ndjson = "\n".join(f'{{"title": "Line {i}", "severity": "low"}}' for i in range(3)) + "\n"
+    resp = await client.post(
+        f"/api/v1/audits/{audit_id}/findings:bulk",
+        content=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 201
+    assert resp.json()["inserted"] == 3
+
+    resp = await client.post(
+        f"/api/v1/audits/{audit_id}/findings:bulk",
+        content='{"title": "ok"}\n{"severity": "low"}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 422
+    assert "Line 2" in resp.json()["detail"]
+
+    # Undecodable bytes are a payload error, not a missing audit.
+    resp = await client.post(
+        f"/api/v1/audits/{audit_id}/findings:bulk",
+        content=b'{"title": "ok"}\n\xff\xfe\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 422
+
+    resp = await client.get(f"/api/v1/audits/{audit_id}/findings")
+    assert len(resp.json()) == 5
+
+    resp = await client.post("/api/v1/audits/missing/findings:bulk", json=[])
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_framework_posture(client, db_session):
+    from src.models.framework import FrameworkControl
+    fw = ComplianceFrameworkModel(name="PostureFW", version="1.0", description="Test")
+    db_session.add(fw)
+    await db_session.flush()
+    db_session.add(FrameworkControl(framework_id=fw.id, control_id="P-1", title="Control", category="Ops"))
+    await db_session.commit()
+
+    audit = (await client.post("/api/v1/audits", json={"framework_id": fw.id})).json()
+    resp = await client.post(f"/api/v1/audits/{audit['id']}/findings:bulk", json=[
+        {"control_id": "P-1", "title": "Gap", "severity": "high"},
+    ])
+    assert resp.status_code == 201
+
+    resp = await client.get(f"/api/v1/frameworks/{fw.id}/posture")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["high"], data["controls_with_findings"]) == (1, 1)
+    assert data["stale"] is False
+    assert data["categories"][0]["category"] == "Ops"
+    assert data["controls"][0]["control_id"] == "P-1"
+
+    resp = await client.get(f"/api/v1/frameworks/{fw.id}/posture", params={"include_controls": False})
+    assert resp.json()["controls"] == []
+    assert (await client.get("/api/v1/frameworks/missing/posture")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_search(client, db_session):
+    import json
+
+    from src.agent.tools import execute_tool
+    resp = await client.post("/api/v1/risks", json={
+        "title": "Forklift collision", "description": "Pedestrians share aisles with forklifts",
+        "likelihood": 3, "impact": 4,
+    })
+    assert resp.status_code == 201
+
+    resp = await client.get("/api/v1/search", params={"q": "forklift aisles"})
+    assert resp.status_code == 200
+    [hit] = resp.json()
+    assert (hit["kind"], hit["title"]) == ("risk", "Forklift collision")
+    assert "[" in hit["snippet"]
+
+    resp = await client.get("/api/v1/search", params={"q": "forklift", "kind": "policy"})
+    assert resp.json() == []
+    assert (await client.get("/api/v1/search", params={"q": "x", "kind": "memo"})).status_code == 422
+
+    result = json.loads(await execute_tool(db_session, "search_compliance_data", {"query": "pedestrian*"}))
+    assert [r["title"] for r in result] == ["Forklift collision"]
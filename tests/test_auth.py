@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.office365 import auth
+
+
+class FakeApp:
+    """Stand-in for msal.ConfidentialClientApplication that counts token fetches."""
+
+    instances = 0
+
+    def __init__(self, client_id, client_credential, authority, token_cache):
+        FakeApp.instances += 1
+        self.token_cache = token_cache
+        self.calls = 0
+        self.expires_in = 3600
+        self.threads = set()
+
+    def acquire_token_for_client(self, scopes):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        self.token_cache.has_state_changed = True
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+
+@pytest.fixture
+def fake_msal(monkeypatch):
+    FakeApp.instances = 0
+    monkeypatch.setattr(auth.msal, "ConfidentialClientApplication", FakeApp)
+    auth.reset_tokens()
+    yield
+    auth.reset_tokens()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch(fake_msal):
+    tokens = await asyncio.gather(*(auth.acquire_token() for _ in range(20)))
+    app = auth.get_confidential_client()
+
+    assert set(tokens) == {"token-1"}
+    assert app.calls == 1
+    assert threading.get_ident() not in app.threads
+    assert await auth.acquire_token() == "token-1"
+    assert auth.get_access_token() == "token-1"
+    assert FakeApp.instances == 1
+
+
+@pytest.mark.asyncio
+async def test_refreshes_in_background_before_expiry(fake_msal, monkeypatch):
+    monkeypatch.setenv("AZURE_TOKEN_REFRESH_MARGIN", "300")
+    app = auth.get_confidential_client()
+    app.expires_in = 120  # already inside the refresh margin
+
+    assert await auth.acquire_token() == "token-1"
+    # Still valid: returned immediately while the next one is fetched.
+    assert await auth.acquire_token() == "token-1"
+    await auth.get_token_provider()._refresh_task
+    assert app.calls == 2
+    assert await auth.acquire_token() == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_refresh_margin_is_capped_at_msal_window(fake_msal, monkeypatch):
+    # MSAL would hand back the same token this far from expiry.
+    monkeypatch.setenv("AZURE_TOKEN_REFRESH_MARGIN", "3600")
+    app = auth.get_confidential_client()
+    app.expires_in = 600
+
+    assert await auth.acquire_token() == "token-1"
+    assert await auth.acquire_token() == "token-1"
+    assert auth.get_token_provider()._refresh_task is None
+    assert app.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_persists_token_cache(fake_msal, monkeypatch, tmp_path):
+    path = tmp_path / "tokens.json"
+    monkeypatch.setenv("AZURE_TOKEN_CACHE_PATH", str(path))
+
+    await auth.acquire_token()
+
+    assert path.exists()
+    assert path.stat().st_mode & 0o077 == 0
+    json.loads(path.read_text())
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from src.config import Settings
+from src.database import create_engine_from_settings
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_applies_pragmas(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}",
+        sqlite_busy_timeout_ms=2500,
+        sqlite_cache_size_kib=4096,
+    )
+    engine = create_engine_from_settings(settings)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 2500
+            assert (await conn.execute(text("PRAGMA cache_size"))).scalar() == -4096
+        assert engine.echo is False
+    finally:
+        await engine.dispose()
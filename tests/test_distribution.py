@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+
+import httpx
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.database import Base
+from src.models.policy import Policy, PolicyDistribution
+from src.schemas.policy import PolicyCreate
+from src.services import distribution_service, policy_service
+from src.services.distribution_worker import DistributionWorkers
+
+
+@pytest.mark.asyncio
+async def test_send_pending_batches_and_retries_failures(db_session, mock_graph):
+    policy = await policy_service.create_policy(db_session, PolicyCreate(title="Acceptable Use"), content="Be nice.")
+    emails = [f"user{i}@example.com" for i in range(44)]
+    await policy_service.distribute_policy(db_session, policy.id, "email", emails)
+    await policy_service.distribute_policy(db_session, policy.id, "teams", ["team-1/channel-1", "chat-1"])
+
+    batches = []
+    throttled = set()
+
+    async def handler(request):
+        assert request.url.path == "/v1.0/$batch"
+        subs = json.loads(request.content)["requests"]
+        batches.append(subs)
+        responses = []
+        for sub in subs:
+            recipient = json.dumps(sub["body"])
+            if "user7@" in recipient:
+                responses.append({"id": sub["id"], "status": 403, "body": {"error": {"message": "Denied"}}})
+            elif "user3@" in recipient and sub["id"] not in throttled:
+                throttled.add(sub["id"])
+                responses.append({"id": sub["id"], "status": 429, "headers": {"Retry-After": "0"}, "body": {}})
+            else:
+                responses.append({"id": sub["id"], "status": 202, "body": {}})
+        return httpx.Response(200, json={"responses": responses})
+
+    mock_graph["handler"] = handler
+    outcome = await distribution_service.send_pending(db_session, policy.id)
+
+    assert outcome == {"sent": 45, "failed": 1}
+    # 44 emails in batches of 20 and 2 Teams messages, plus one retry
+    # carrying only the throttled request.
+    assert sorted(len(b) for b in batches) == [1, 2, 4, 20, 20]
+    retried = min(batches, key=len)
+    assert retried[0]["id"] in throttled
+    urls = {s["url"] for b in batches for s in b}
+    assert "/teams/team-1/channels/channel-1/messages" in urls
+    assert "/chats/chat-1/messages" in urls
+
+    result = await db_session.execute(select(PolicyDistribution).where(PolicyDistribution.policy_id == policy.id))
+    rows = {d.recipient: d for d in result.scalars()}
+    assert rows["user7@example.com"].status == "failed"
+    assert rows["user7@example.com"].sent_at is None
+    assert rows["user3@example.com"].status == "sent"
+    assert all(d.sent_at is not None for r, d in rows.items() if r != "user7@example.com")
+    # Naive UTC, like every other timestamp the queue writes.
+    assert rows["user3@example.com"].sent_at.tzinfo is None
+
+    # Nothing is left pending, so a second run sends nothing.
+    assert await distribution_service.send_pending(db_session, policy.id) == {"sent": 0, "failed": 0}
+    assert len(batches) == 5
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _queue(session_factory, channel: str, recipients: list[str]) -> str:
+    async with session_factory() as db:
+        policy = await policy_service.create_policy(db, PolicyCreate(title="Travel"), content="Book early.")
+        await policy_service.distribute_policy(db, policy.id, channel, recipients)
+        return policy.id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_never_share_rows(session_factory):
+    await _queue(session_factory, "email", [f"u{i}@example.com" for i in range(30)])
+
+    async def claim_one():
+        async with session_factory() as db:
+            return [d.id for d in await distribution_service.claim(db, "email", 7)]
+
+    claims = await asyncio.gather(*(claim_one() for _ in range(6)))
+    ids = [i for c in claims for i in c]
+    assert len(ids) == len(set(ids)) == 30
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(session_factory):
+    await _queue(session_factory, "email", ["a@example.com"])
+    async with session_factory() as db:
+        [dist] = await distribution_service.claim(db, "email", 10)
+        assert await distribution_service.claim(db, "email", 10) == []
+
+        dist.lease_expires_at = datetime.datetime(2000, 1, 1)
+        await db.commit()
+        [again] = await distribution_service.claim(db, "email", 10)
+        assert again.id == dist.id
+        assert again.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_queue_and_reschedule_transport_errors(session_factory, mock_graph, monkeypatch):
+    monkeypatch.setenv("DISTRIBUTION_RATE_EMAIL", "1000")
+    monkeypatch.setenv("DISTRIBUTION_POLL_INTERVAL", "0.01")
+    monkeypatch.setenv("GRAPH_MAX_RETRIES", "0")
+    policy_id = await _queue(session_factory, "email", [f"u{i}@example.com" for i in range(50)])
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(503)
+        subs = json.loads(request.content)["requests"]
+        return httpx.Response(200, json={"responses": [{"id": s["id"], "status": 202} for s in subs]})
+
+    mock_graph["handler"] = handler
+    workers = DistributionWorkers(session_factory, workers=3)
+    workers.start()
+    try:
+        for _ in range(200):
+            async with session_factory() as db:
+                progress = await distribution_service.get_progress(db, policy_id)
+            if progress["complete"]:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await workers.stop()
+
+    assert progress["sent"] == 50
+    assert progress["by_channel"]["email"]["sent"] == 50
+    async with session_factory() as db:
+        attempts = (await db.execute(select(func.max(PolicyDistribution.attempts)))).scalar_one()
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_outcome_is_not_written_after_the_lease_is_lost(session_factory, mock_graph):
+    await _queue(session_factory, "email", ["a@example.com"])
+    async with session_factory() as db:
+        [dist] = await distribution_service.claim(db, "email", 10)
+        # The lease expires mid-send and another worker takes the row.
+        async with session_factory() as other:
+            await other.execute(
+                update(PolicyDistribution).values(lease_expires_at=datetime.datetime(2000, 1, 1))
+            )
+            await other.commit()
+            [stolen] = await distribution_service.claim(other, "email", 10)
+
+        mock_graph["handler"] = lambda request: httpx.Response(
+            200, json={"responses": [{"id": dist.id, "status": 202, "body": {}}]}
+        )
+        await distribution_service.deliver(db, [dist])
+
+    async with session_factory() as db:
+        row = await db.get(PolicyDistribution, dist.id)
+        assert row.status == "sending"
+        assert row.lease_owner == stolen.lease_owner
+        assert row.sent_at is None
+
+
+@pytest.mark.asyncio
+async def test_rows_for_a_deleted_policy_fail_without_retry(session_factory, mock_graph):
+    policy_id = await _queue(session_factory, "email", ["a@example.com", "b@example.com"])
+    async with session_factory() as db:
+        dists = await distribution_service.claim(db, "email", 10)
+        await db.execute(delete(Policy).where(Policy.id == policy_id))
+        await db.commit()
+        await distribution_service.deliver(db, dists)
+
+    async with session_factory() as db:
+        rows = (await db.execute(select(PolicyDistribution))).scalars().all()
+        assert {r.status for r in rows} == {"failed"}
+        assert all("not found" in r.error for r in rows)
+
+
+def test_cli_send_drains_with_background_workers_disabled(tmp_path, monkeypatch):
+    import threading
+
+    from sqlalchemy.pool import NullPool
+    from typer.testing import CliRunner
+
+    import src.database
+    from src.cli.main import app
+    from src.office365 import batch
+
+    monkeypatch.setenv("DISTRIBUTION_WORKERS", "0")
+    monkeypatch.setenv("DISTRIBUTION_RATE_EMAIL", "1000")
+    monkeypatch.setenv("DISTRIBUTION_POLL_INTERVAL", "0.01")
+    # Each CLI call runs its own event loop, so connections must not be pooled across them.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cli.db'}", poolclass=NullPool)
+    monkeypatch.setattr(src.database, "engine", engine)
+    monkeypatch.setattr(src.database, "async_session", async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+
+    async def fake_send_batch(requests):
+        return {r["id"]: {"id": r["id"], "status": 202, "body": {}} for r in requests}
+
+    monkeypatch.setattr(batch, "send_batch", fake_send_batch)
+
+    async def create_policy():
+        await src.database.init_db()
+        async with src.database.async_session() as db:
+            return (await policy_service.create_policy(db, PolicyCreate(title="Travel"), content="Book early.")).id
+
+    policy_id = asyncio.run(create_policy())
+    result = {}
+    args = ["policy", "distribute", policy_id, "--to", "a@example.com", "--to", "b@example.com", "--send"]
+    thread = threading.Thread(target=lambda: result.update(out=CliRunner().invoke(app, args)), daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive(), "policy distribute --send did not finish"
+    assert result["out"].exit_code == 0, result["out"].output
+    assert "Sent: 2" in result["out"].output
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import load_workbook
+
+from src.office365 import excel
+from src.schemas.risk import RiskCreate
+from src.services import risk_service
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel, "get_settings", lambda: SimpleNamespace(output_dir=tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_stream_risk_register(db_session, output_dir, monkeypatch):
+    monkeypatch.setattr(excel, "WIDTH_SAMPLE_ROWS", 2)
+    for i in range(5):
+        await risk_service.create_risk(
+            db_session, RiskCreate(title=f"Risk number {i}", likelihood=i + 1, impact=4, owner="Security team")
+        )
+
+    path = await excel.stream_risk_register(risk_service.stream_risks(db_session))
+
+    ws = load_workbook(path).active
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0][0] == "Risk ID"
+    assert [row[5] for row in rows[1:]] == [20, 16, 12, 8, 4]
+    assert ws["F2"].fill.start_color.rgb.endswith("FF0000")
+    assert ws.column_dimensions["B"].width == len("Risk number 0") + 2
+
+
+@pytest.mark.asyncio
+async def test_streamed_workbook_is_written_off_the_event_loop(db_session, output_dir, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(excel, "WRITE_BATCH_ROWS", 2)
+    threads = []
+    real_append = excel._append_rows
+
+    def append(sheet, make_row, rows):
+        threads.append(threading.get_ident())
+        real_append(sheet, make_row, rows)
+
+    monkeypatch.setattr(excel, "_append_rows", append)
+    for i in range(5):
+        await risk_service.create_risk(db_session, RiskCreate(title=f"Risk {i}", likelihood=2, impact=2))
+
+    path = await excel.stream_risk_register(risk_service.stream_risks(db_session))
+
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+    assert load_workbook(path).active.max_row == 6
+
+
+@pytest.mark.asyncio
+async def test_report_job_renders_in_background(client, db_session, output_dir, monkeypatch):
+    from src.office365 import powerpoint
+    from src.services import render_service
+
+    monkeypatch.setattr(powerpoint, "get_settings", lambda: SimpleNamespace(output_dir=output_dir))
+    monkeypatch.setenv("RENDER_EXECUTOR", "thread")
+    monkeypatch.setattr(render_service, "_executor", None)
+    await risk_service.create_risk(db_session, RiskCreate(title="Outage", likelihood=4, impact=4))
+
+    try:
+        resp = await client.post("/api/v1/reports", json={"report_type": "executive", "format": "pptx"})
+        assert resp.status_code == 202
+        report = resp.json()
+        assert report["status"] == "pending"
+
+        await render_service.wait_for_jobs()
+        resp = await client.get(f"/api/v1/reports/{report['id']}")
+        assert resp.json()["status"] == "generated"
+        resp = await client.get(f"/api/v1/reports/{report['id']}/download")
+        assert resp.status_code == 200
+    finally:
+        render_service.shutdown_executor()
+
+    resp = await client.post("/api/v1/reports", json={"report_type": "risk", "format": "pptx"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_pending_reports_resume_after_restart(db_session, output_dir, monkeypatch):
+    from src.models.report import Report
+    from src.services import render_service
+
+    report = Report(title="Left pending", report_type="risk", format="xlsx", status="pending")
+    db_session.add(report)
+    await db_session.commit()
+
+    assert await render_service.resume_pending_jobs(db_session) == 1
+    # A second worker starting at the same time finds nothing left to claim.
+    assert await render_service.resume_pending_jobs(db_session) == 0
+    await render_service.wait_for_jobs()
+    await db_session.refresh(report)
+    assert report.status == "generated"
+    assert report.file_path
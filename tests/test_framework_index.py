@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.agent.tools import execute_tool
+from src.config import get_settings
+from src.frameworks.index import get_index
+from src.services import framework_service
+
+
+@pytest.fixture
+async def frameworks(db_session):
+    return await framework_service.import_all_frameworks(db_session, get_settings().frameworks_dir)
+
+
+@pytest.mark.asyncio
+async def test_lookup_and_category_buckets(db_session, frameworks):
+    index = await get_index(db_session)
+
+    gdpr = index.framework("GDPR")
+    assert gdpr is index.framework("gdpr") is index.framework(gdpr.id)
+    control = index.control("GDPR", "GDPR-5.3")
+    assert control.title == "Data minimization"
+    assert index.control("GDPR", "NOPE") is None
+    assert "Data Processing Principles" in index.categories("GDPR")
+    assert control in index.by_category("GDPR", "Data Processing Principles")
+    assert len(index) == sum(len(fw.controls) for fw in index.frameworks)
+
+
+@pytest.mark.asyncio
+async def test_search_matches_all_terms_and_ranks_titles_first(db_session, frameworks):
+    index = await get_index(db_session)
+
+    results = index.search("personal data")
+    assert results
+    assert all(
+        {"personal", "data"} <= set(f"{c.control_id} {c.title} {c.description} {c.category}".lower().split())
+        for c in results
+    )
+    assert {c.framework for c in index.search("security", framework="ISO 27001")} == {"ISO 27001"}
+    assert index.search("the and of") == []
+    assert index.search("security", framework="Unknown") == []
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_after_framework_import(db_session, frameworks, tmp_path):
+    before = await get_index(db_session)
+    assert await get_index(db_session) is before
+
+    (tmp_path / "custom.yaml").write_text(
+        "name: Custom\ncontrols:\n  - id: C-1\n    title: Forklift inspection\n    category: Safety\n"
+    )
+    await framework_service.import_framework(db_session, tmp_path / "custom.yaml")
+
+    after = await get_index(db_session)
+    assert after is not before
+    assert [c.control_id for c in after.search("forklift")] == ["C-1"]
+
+
+@pytest.mark.asyncio
+async def test_search_tool_and_endpoint(client, db_session, frameworks):
+    results = json.loads(await execute_tool(db_session, "search_controls", {"query": "purpose", "framework": "GDPR"}))
+    assert results[0]["id"] == "GDPR-5.2"
+
+    resp = await client.get("/api/v1/frameworks/controls/search", params={"q": "purpose limitation"})
+    assert resp.status_code == 200
+    assert resp.json()[0]["control_id"] == "GDPR-5.2"
+    assert (await client.get("/api/v1/frameworks/controls/search", params={"q": "x", "framework": "nope"})).status_code == 404
+
+    summary = json.loads(await execute_tool(db_session, "query_frameworks", {"name": "GDPR"}))
+    assert summary["name"] == "GDPR" and summary["controls"]
@@ -50,3 +50,101 @@ async def test_get_framework_by_name(db_session):
 
     missing = await get_framework_by_name(db_session, "NonExistent")
     assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_import_all_skips_unchanged_and_diffs_changed_files(db_session, tmp_path, monkeypatch):
+    from src.services import framework_service
+
+    source = tmp_path / "custom.yaml"
+    source.write_text(
+        "name: Custom\nversion: '1'\ncontrols:\n"
+        "  - {id: C-1, title: Guard rails, category: Site}\n"
+        "  - {id: C-2, title: Fire exits, category: Site}\n"
+        "  - {id: C-3, title: First aid kits, category: Health}\n"
+    )
+    assert (await framework_service.import_all_frameworks(db_session, tmp_path))["created"] == 1
+    before = {c.control_id: c.id for c in (await get_framework_by_name(db_session, "Custom")).controls}
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("unchanged file was parsed")
+
+    monkeypatch.setattr(framework_service, "load_yaml", no_parse)
+    assert (await framework_service.import_all_frameworks(db_session, tmp_path))["unchanged"] == 1
+    monkeypatch.undo()
+
+    source.write_text(
+        "name: Custom\nversion: '2'\ncontrols:\n"
+        "  - {id: C-1, title: Guard rails, category: Site}\n"
+        "  - {id: C-2, title: Fire exits and assembly points, category: Site}\n"
+        "  - {id: C-4, title: Hearing protection, category: Health}\n"
+    )
+    assert (await framework_service.import_all_frameworks(db_session, tmp_path))["updated"] == 1
+
+    db_session.expire_all()
+    fw = await get_framework_by_name(db_session, "Custom")
+    controls = {c.control_id: c for c in fw.controls}
+    assert fw.version == "2"
+    assert sorted(controls) == ["C-1", "C-2", "C-4"]
+    assert controls["C-2"].title == "Fire exits and assembly points"
+    # Untouched and modified controls keep their rows.
+    assert controls["C-1"].id == before["C-1"]
+    assert controls["C-2"].id == before["C-2"]
+
+
+@pytest.mark.asyncio
+async def test_findings_link_to_controls(db_session, tmp_path):
+    from sqlalchemy import select
+
+    from src.models.audit import AuditFinding
+    from src.schemas.audit import AuditCreate, AuditFindingCreate
+    from src.services import audit_service, framework_service, posture_service
+
+    source = tmp_path / "linked.yaml"
+    source.write_text(
+        "name: Linked\nversion: '1'\ncontrols:\n"
+        "  - {id: L-1, title: Lockout, category: Energy}\n"
+        "  - {id: L-2, title: Tagout, category: Energy}\n"
+    )
+    fw = await framework_service.import_framework(db_session, source)
+    controls = {c.control_id: c.id for c in fw.controls}
+    audit = await audit_service.create_audit(db_session, AuditCreate(framework_id=fw.id))
+
+    finding = await audit_service.add_finding(db_session, audit.id, "L-1", "No locks", "", "high", "")
+    assert finding.framework_control_pk == controls["L-1"]
+    await audit_service.add_findings_bulk(db_session, audit.id, [
+        AuditFindingCreate(control_id="L-2", title="Tags missing"),
+        AuditFindingCreate(control_id="L-3", title="Not a control yet"),
+        AuditFindingCreate(control_id="L-3", title="Also not a control"),
+    ])
+
+    async def links():
+        rows = await db_session.execute(select(AuditFinding.title, AuditFinding.framework_control_pk))
+        return dict(rows.all())
+
+    assert (await links())["Tags missing"] == controls["L-2"]
+    assert (await links())["Not a control yet"] is None
+
+    # Findings written before linking existed are resolved by the backfill
+    # job, which reports what it could not resolve.
+    db_session.add(AuditFinding(audit_id=audit.id, control_id="L-1", title="Legacy", severity="low"))
+    await db_session.commit()
+    result = await audit_service.link_findings(db_session, batch_size=1)
+    assert result["linked"] == 1
+    assert (await links())["Legacy"] == controls["L-1"]
+    assert result["unmatched"] == [{"framework": "Linked", "control_id": "L-3", "findings": 2}]
+
+    # Re-importing with L-3 added links those findings; removing L-2 unlinks its finding.
+    source.write_text(
+        "name: Linked\nversion: '2'\ncontrols:\n"
+        "  - {id: L-1, title: Lockout, category: Energy}\n"
+        "  - {id: L-3, title: Verification, category: Energy}\n"
+    )
+    await framework_service.import_framework(db_session, source)
+    linked = await links()
+    assert linked["Tags missing"] is None
+    assert linked["Not a control yet"] is not None
+    assert linked["No locks"] == controls["L-1"]
+
+    posture = await posture_service.get_posture(db_session, fw.id)
+    assert {c.control_id: c.open_findings for c in posture["controls"]} == {"L-1": 2, "L-3": 2}
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.office365 import graph_client
+
+
+@pytest.mark.asyncio
+async def test_retries_after_throttling(mock_graph):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"value": [1, 2]})
+
+    mock_graph["handler"] = handler
+    result = await graph_client.graph_request("GET", "/me/joinedTeams")
+
+    assert result == {"value": [1, 2]}
+    assert len(calls) == 3
+    assert calls[0].headers["Authorization"] == "Bearer test-token"
+    assert str(calls[0].url) == "https://graph.microsoft.com/v1.0/me/joinedTeams"
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(mock_graph, monkeypatch):
+    monkeypatch.setenv("GRAPH_MAX_RETRIES", "2")
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    mock_graph["handler"] = handler
+    with pytest.raises(httpx.HTTPStatusError):
+        await graph_client.graph_request("POST", "/users/me/sendMail", json_data={})
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_per_tenant(mock_graph, monkeypatch):
+    monkeypatch.setenv("GRAPH_MAX_CONCURRENCY", "3")
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(204)
+
+    mock_graph["handler"] = handler
+    await asyncio.gather(*(graph_client.graph_request("DELETE", f"/items/{i}") for i in range(12)))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_gateway_errors_for_post(mock_graph):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(504)
+
+    mock_graph["handler"] = handler
+    with pytest.raises(httpx.HTTPStatusError):
+        await graph_client.graph_request("POST", "/users/me/sendMail", json_data={})
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_gateway_errors_for_get(mock_graph):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) < 2:
+            return httpx.Response(504, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": "me"})
+
+    mock_graph["handler"] = handler
+    assert await graph_client.graph_request("GET", "/me") == {"id": "me"}
+    assert len(calls) == 2
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from src.office365 import outlook
+
+
+def _mail_handler(requests: list[httpx.Request], received: bytearray):
+    async def handler(request):
+        requests.append(request)
+        path = request.url.path
+        if request.url.host == "attach.example":
+            span, total = request.headers["Content-Range"].removeprefix("bytes ").split("/")
+            assert len(request.content) <= outlook.MAX_ATTACHMENT_CHUNK
+            received.extend(request.content)
+            if len(received) == int(total):
+                return httpx.Response(201, headers={"Location": "https://graph/attachments/1"})
+            return httpx.Response(200, json={"nextExpectedRanges": [f"{len(received)}-"]})
+        if path.endswith("/attachments/createUploadSession"):
+            return httpx.Response(201, json={"uploadUrl": "https://attach.example/session"})
+        if path.endswith("/users/me/messages") and request.method == "POST":
+            return httpx.Response(201, json={"id": "draft-1"})
+        if path.endswith("/attachments"):
+            return httpx.Response(201, json={"id": "att"})
+        return httpx.Response(202)
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_small_attachments_stay_inline(mock_graph, tmp_path):
+    small = tmp_path / "summary.docx"
+    small.write_bytes(b"x" * 1024)
+    requests = []
+    mock_graph["handler"] = _mail_handler(requests, bytearray())
+
+    await outlook.send_email(["a@example.com"], "Audit", "<p>Done</p>", attachments=[small])
+
+    assert [r.url.path for r in requests] == ["/v1.0/users/me/sendMail"]
+    body = json.loads(requests[0].content)
+    assert body["message"]["attachments"][0]["name"] == "summary.docx"
+
+
+@pytest.mark.asyncio
+async def test_large_attachments_use_draft_and_upload_session(mock_graph, tmp_path):
+    small = tmp_path / "summary.docx"
+    small.write_bytes(b"s" * 1024)
+    large = tmp_path / "register.xlsx"
+    content = bytes(range(256)) * (40 * 1024)  # 10 MiB
+    large.write_bytes(content)
+    requests, received = [], bytearray()
+    mock_graph["handler"] = _mail_handler(requests, received)
+
+    await outlook.send_email(["a@example.com"], "Audit", "<p>Done</p>", attachments=[small, large])
+
+    paths = [r.url.path for r in requests if r.url.host != "attach.example"]
+    assert paths == [
+        "/v1.0/users/me/messages",
+        "/v1.0/users/me/messages/draft-1/attachments",
+        "/v1.0/users/me/messages/draft-1/attachments/createUploadSession",
+        "/v1.0/users/me/messages/draft-1/send",
+    ]
+    assert bytes(received) == content
+    assert "attachments" not in json.loads(requests[0].content)
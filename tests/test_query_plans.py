@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+from sqlalchemy import event, text
+
+from src.agent.context import _render_context
+from src.models.framework import ComplianceFrameworkModel
+from src.schemas.audit import AuditCreate
+from src.schemas.policy import PolicyCreate
+from src.schemas.risk import RiskCreate, RiskMitigationCreate
+from src.services import audit_service, framework_service, policy_service, report_service, risk_service
+from src.services.pagination import encode_cursor
+
+# Plan steps that read a whole table without an index ("SCAN risks") or sort
+# a result set in memory because no index provides the order.
+FULL_SCAN = re.compile(r"^(SCAN \w+|USE TEMP B-TREE FOR .*)$")
+
+
+async def _explain(db, statement, parameters):
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[-1] for row in result]
+
+
+@pytest.mark.asyncio
+async def test_service_queries_use_indexes(db_session):
+    fw = ComplianceFrameworkModel(name="Plan FW", version="1.0", description="")
+    db_session.add(fw)
+    await db_session.commit()
+    audit = await audit_service.create_audit(db_session, AuditCreate(framework_id=fw.id))
+    await audit_service.add_finding(db_session, audit.id, "PF-1", "Finding", "", "high", "")
+    risk = await risk_service.create_risk(db_session, RiskCreate(title="Risk", likelihood=2, impact=3))
+    await risk_service.add_mitigation(db_session, risk.id, RiskMitigationCreate(action="Fix"))
+    policy = await policy_service.create_policy(db_session, PolicyCreate(title="Policy"), "Content")
+    await policy_service.distribute_policy(db_session, policy.id, "email", ["a@example.com"])
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await audit_service.list_audits(db_session)
+        await audit_service.get_audit(db_session, audit.id)
+        page = await audit_service.list_audits_page(db_session, limit=1, include_findings=True)
+        await audit_service.list_audits_page(db_session, limit=1, cursor=encode_cursor("2026-01-01 00:00:00", audit.id))
+        await risk_service.list_risks(db_session)
+        await risk_service.get_risk(db_session, risk.id)
+        await risk_service.list_risks_page(db_session, limit=1, cursor=encode_cursor(risk.score, risk.id), include_mitigations=True)
+        await risk_service.get_risk_matrix_summary(db_session)
+        await risk_service.list_risks_in_cell(db_session, 2, 3, limit=1, cursor=encode_cursor(risk.score, risk.id))
+        await policy_service.list_policies(db_session)
+        await policy_service.get_policy(db_session, policy.id)
+        await policy_service.list_policies_page(db_session, limit=1, cursor=encode_cursor("2026-01-01 00:00:00", policy.id), include_versions=True)
+        await framework_service.get_framework(db_session, fw.id)
+        await framework_service.get_framework_by_name(db_session, fw.name)
+        await report_service.list_reports(db_session)
+        await _render_context(db_session)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    assert statements
+    for statement, parameters in statements:
+        plan = await _explain(db_session, statement, parameters)
+        scans = [step for step in plan if FULL_SCAN.match(step)]
+        assert not scans, f"Full table scan {scans} in plan {plan} for:\n{statement}"
+
+
+@pytest.mark.asyncio
+async def test_search_triggers_delete_by_key(db_session):
+    conn = await db_session.connection()
+    triggers = (await conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search_%'"
+    )).all()
+    deletes = [
+        (name, statement)
+        for name, sql in triggers
+        for statement in re.findall(r"DELETE FROM \w+ WHERE [^;]+", sql)
+    ]
+    assert {name.rsplit("_", 1)[1] for name, _ in deletes} == {"ad", "au"}
+    for name, statement in deletes:
+        plan = await _explain(db_session, re.sub(r"\bold\.(\w+)", "'1'", statement), ())
+        # ":=" is FTS5's rowid-equality lookup; a bare "INDEX 0:" reads every row.
+        fts_scans = [step for step in plan if "VIRTUAL TABLE" in step and not step.endswith(":=")]
+        scans = [step for step in plan if FULL_SCAN.match(step)]
+        assert not fts_scans and not scans, f"{name} scans the index: {plan}"
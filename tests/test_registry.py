@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from src.frameworks import registry
+
+FRAMEWORKS_DIR = Path(__file__).parent.parent / "data" / "frameworks"
+
+
+def test_discover_frameworks_loads_every_file():
+    frameworks = registry.discover_frameworks(FRAMEWORKS_DIR)
+    assert {"GDPR", "ISO 27001"} <= set(frameworks)
+    assert frameworks["GDPR"].get_controls()
+
+
+def test_uses_libyaml_when_available():
+    if getattr(registry.yaml, "__with_libyaml__", False):
+        assert registry.SafeLoader is registry.yaml.CSafeLoader
+
+
+def test_cache_skips_parsing_until_file_changes(tmp_path, framework_cache_dir, monkeypatch):
+    path = tmp_path / "gdpr.yaml"
+    shutil.copy(FRAMEWORKS_DIR / "gdpr.yaml", path)
+    first = registry.load_yaml(path)
+    assert list(framework_cache_dir.glob("*.pickle"))
+
+    parses = []
+    real_load = registry.yaml.load
+    monkeypatch.setattr(registry.yaml, "load", lambda *a, **kw: parses.append(1) or real_load(*a, **kw))
+
+    assert registry.load_yaml(path) == first
+    # Touching the file without changing it is detected by the content hash.
+    os.utime(path, ns=(1, 1))
+    assert registry.load_yaml(path) == first
+    assert parses == []
+
+    path.write_text(path.read_text().replace("General Data Protection Regulation", "GDPR (amended)"))
+    assert "GDPR (amended)" in registry.load_yaml(path)["description"]
+    assert parses == [1]
+
+
+def test_preread_bytes_are_not_read_or_hashed_again(tmp_path, framework_cache_dir, monkeypatch):
+    path = tmp_path / "gdpr.yaml"
+    shutil.copy(FRAMEWORKS_DIR / "gdpr.yaml", path)
+    raw = path.read_bytes()
+    digest = registry.hashlib.sha256(raw).hexdigest()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was read or hashed again")
+
+    monkeypatch.setattr(Path, "read_bytes", fail)
+    monkeypatch.setattr(registry.hashlib, "sha256", fail)
+    assert registry.load_yaml(path, raw, digest)["name"] == "GDPR"
+
+
+def test_corrupt_cache_is_ignored(tmp_path, framework_cache_dir):
+    path = tmp_path / "gdpr.yaml"
+    shutil.copy(FRAMEWORKS_DIR / "gdpr.yaml", path)
+    registry.load_yaml(path)
+    for cache_file in framework_cache_dir.glob("*.pickle"):
+        cache_file.write_bytes(b"not a pickle")
+
+    assert registry.load_yaml(path)["name"] == "GDPR"
+
+
+def test_cache_can_be_disabled(framework_cache_dir, monkeypatch):
+    monkeypatch.setenv("FRAMEWORK_CACHE", "false")
+    assert registry.load_yaml(FRAMEWORKS_DIR / "gdpr.yaml")["name"] == "GDPR"
+    assert not framework_cache_dir.exists()
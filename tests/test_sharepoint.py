@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import os
+
+import httpx
+import pytest
+
+from src.office365 import sharepoint
+
+CONTENT = os.urandom(3 * 1024 * 1024 + 17)
+
+
+def _write_part(tmp_path, content: bytes, etag: str) -> None:
+    (tmp_path / "evidence.bin.part").write_bytes(content)
+    (tmp_path / "evidence.bin.part.json").write_text(json.dumps({"eTag": etag}))
+
+
+def _file_handler(requests: list[httpx.Request], honor_range: bool = True):
+    etag = '"v1"'
+
+    async def handler(request):
+        requests.append(request)
+        if request.url.host == "download.example":
+            assert "Authorization" not in request.headers
+            if honor_range and "Range" in request.headers and request.headers.get("If-Range") == etag:
+                start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+                return httpx.Response(206, content=CONTENT[start:])
+            return httpx.Response(200, content=CONTENT)
+        return httpx.Response(200, json={
+            "name": "evidence.bin",
+            "size": len(CONTENT),
+            "eTag": etag,
+            "@microsoft.graph.downloadUrl": "https://download.example/evidence.bin",
+        })
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_download_streams_to_disk(mock_graph, tmp_path):
+    requests = []
+    mock_graph["handler"] = _file_handler(requests)
+    progress = []
+
+    target = tmp_path / "evidence.bin"
+    await sharepoint.download_file("compliance", "Evidence/evidence.bin", str(target), on_progress=lambda d, t: progress.append(d))
+
+    assert target.read_bytes() == CONTENT
+    assert not (tmp_path / "evidence.bin.part").exists()
+    assert not (tmp_path / "evidence.bin.part.json").exists()
+    assert progress[-1] == len(CONTENT) and len(progress) > 1
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_partial_file(mock_graph, tmp_path):
+    _write_part(tmp_path, CONTENT[:1000], '"v1"')
+    requests = []
+    mock_graph["handler"] = _file_handler(requests)
+
+    await sharepoint.download_file("compliance", "Evidence/evidence.bin", str(tmp_path / "evidence.bin"))
+
+    assert requests[-1].headers["Range"] == "bytes=1000-"
+    assert (tmp_path / "evidence.bin").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_restarts_when_range_is_ignored(mock_graph, tmp_path):
+    _write_part(tmp_path, b"stale", '"v1"')
+    mock_graph["handler"] = _file_handler([], honor_range=False)
+
+    await sharepoint.download_file("compliance", "Evidence/evidence.bin", str(tmp_path / "evidence.bin"))
+
+    assert (tmp_path / "evidence.bin").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_discards_part_from_another_version(mock_graph, tmp_path):
+    # A complete .part of the same size from an older version must not be installed.
+    _write_part(tmp_path, bytes(len(CONTENT)), '"v0"')
+    requests = []
+    mock_graph["handler"] = _file_handler(requests)
+
+    await sharepoint.download_file("compliance", "Evidence/evidence.bin", str(tmp_path / "evidence.bin"))
+
+    assert "Range" not in requests[-1].headers
+    assert (tmp_path / "evidence.bin").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_installs_complete_part_of_same_version(mock_graph, tmp_path):
+    _write_part(tmp_path, CONTENT, '"v1"')
+    requests = []
+    mock_graph["handler"] = _file_handler(requests)
+
+    await sharepoint.download_file("compliance", "Evidence/evidence.bin", str(tmp_path / "evidence.bin"))
+
+    assert len(requests) == 1
+    assert (tmp_path / "evidence.bin").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_listing_follows_next_link(mock_graph):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        page = int(request.url.params.get("page", 0))
+        body = {"value": [{"name": f"file-{page}-{i}"} for i in range(3)]}
+        if page < 3:
+            body["@odata.nextLink"] = f"https://graph.microsoft.com/v1.0/next?page={page + 1}"
+        return httpx.Response(200, json=body)
+
+    mock_graph["handler"] = handler
+    names = [item["name"] async for item in sharepoint.iter_files("compliance", "Evidence", page_size=3)]
+
+    assert len(names) == 12 and names[0] == "file-0-0" and names[-1] == "file-3-2"
+    assert requests[0].url.params["$top"] == "3"
+    assert await sharepoint.list_files("compliance", "Evidence") == [{"name": n} for n in names]
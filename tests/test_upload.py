@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+
+import httpx
+import pytest
+
+from src.office365 import sharepoint, upload
+
+CHUNK = upload.CHUNK_ALIGNMENT
+
+
+class FakeSession:
+    """Graph upload session that only accepts chunks in order."""
+
+    def __init__(self, fail_at_chunk: int | None = None):
+        self.received = bytearray()
+        self.chunks = []
+        self.sessions = 0
+        self.fail_at_chunk = fail_at_chunk
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(":/createUploadSession"):
+            self.sessions += 1
+            return httpx.Response(200, json={"uploadUrl": "https://upload.example/session"})
+        assert request.url.host == "upload.example"
+        assert "Authorization" not in request.headers
+        if request.method == "GET":
+            return httpx.Response(200, json={"nextExpectedRanges": [f"{len(self.received)}-"]})
+
+        span, total = request.headers["Content-Range"].removeprefix("bytes ").split("/")
+        start, end = (int(x) for x in span.split("-"))
+        if start != len(self.received):
+            return httpx.Response(416)
+        if len(self.chunks) == self.fail_at_chunk:
+            self.fail_at_chunk = None
+            return httpx.Response(500)
+        self.chunks.append(end - start + 1)
+        self.received += request.content
+        if len(self.received) == int(total):
+            return httpx.Response(201, json={"id": "item", "webUrl": "https://sp.example/report.xlsx"})
+        return httpx.Response(202, json={"nextExpectedRanges": [f"{len(self.received)}-"]})
+
+
+def test_chunk_size_is_aligned():
+    assert upload.chunk_size(CHUNK * 3 + 100) == CHUNK * 3
+    assert upload.chunk_size(1) == CHUNK
+    assert upload.chunk_size(10**9) % CHUNK == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_resumes_after_interruption(mock_graph, tmp_path):
+    path = tmp_path / "evidence.zip"
+    content = os.urandom(CHUNK * 3 + 1234)
+    path.write_bytes(content)
+    session = FakeSession(fail_at_chunk=2)
+    mock_graph["handler"] = session.handler
+    progress = []
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upload.upload_large_file(path, "/me/drive/root:/General/evidence.zip", chunk=CHUNK)
+    assert (tmp_path / "evidence.zip.upload.json").exists()
+
+    item = await upload.upload_large_file(
+        path, "/me/drive/root:/General/evidence.zip", chunk=CHUNK, on_progress=lambda d, t: progress.append(d)
+    )
+
+    assert item["webUrl"] == "https://sp.example/report.xlsx"
+    assert bytes(session.received) == content
+    assert session.sessions == 1
+    assert session.chunks == [CHUNK, CHUNK, CHUNK, 1234]
+    assert progress[0] == CHUNK * 2 and progress[-1] == len(content)
+    assert not (tmp_path / "evidence.zip.upload.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_uses_session_above_simple_limit(mock_graph, tmp_path, monkeypatch):
+    monkeypatch.setattr(sharepoint, "SIMPLE_UPLOAD_LIMIT", CHUNK)
+    path = tmp_path / "register.xlsx"
+    path.write_bytes(b"x" * (CHUNK + 1))
+    session = FakeSession()
+    mock_graph["handler"] = session.handler
+
+    url = await sharepoint.upload_file(str(path), site_name="compliance", folder="Reports")
+
+    assert url == "https://sp.example/report.xlsx"
+    assert session.sessions == 1
+    assert len(session.received) == CHUNK + 1